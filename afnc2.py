@@ -0,0 +1,493 @@
+# afnc2.py
+# fnc2의 asyncio 버전 — 스레드 대신 코루틴으로 reportCd/샤드 체인 수십 개를 겹쳐 돌린다.
+"""
+사용법:
+    async with AsyncKind() as kc:
+        inv, mw = await asyncio.gather(
+            afetch_investor_warning(f, t, client=kc),
+            afetch_market_watch(f, t, client=kc),
+        )
+
+    # 동기 코드(menu2 등)에서는 _gather와 같은 모양으로 (클라이언트 하나를 나눠 씀)
+    got = gather_sync({
+        "inv": lambda kc: afetch_investor_warning(f, t, client=kc),
+        "mw":  lambda kc: afetch_market_watch(f, t, client=kc),
+    })
+
+- HTTP 클라이언트는 httpx(AsyncClient, 커넥션 재사용)를 쓴다. httpx가 없으면 fnc2._post_kind(requests)를
+  스레드에서 돌리는 방식으로 같은 API가 그대로 동작한다.
+- 요청 간격은 fnc2._PACER를 그대로 공유하고(슬롯 예약만 하고 asyncio.sleep으로 대기),
+  레플리카 예산(fnc2.use_shared)과 저장소(fnc2.use_store)도 동기 API와 똑같이 거친다.
+- 결과(행 순서/중복 제거/컬럼)는 같은 인자의 fnc2 함수와 같다.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+try:
+    import httpx
+except ImportError:  # httpx가 없으면 requests 경로를 스레드에서 실행
+    httpx = None
+
+import fnc2 as _k
+import metrics
+from fnc2 import (
+    CODE_MAP,
+    CAT_COLS,
+    HEADERS_MENU_WARN,
+    KIND_MAIN_URL,
+    KIND_RETRIES,
+    KIND_URL,
+    MAX_INFLIGHT,
+    RETRY_STATUS,
+    TARGETS_DELIST,
+    TARGETS_MARKET_WATCH,
+    TARGETS_WARN,
+    TARGET_OVERHEAT,
+    UA,
+    WARMUP_TIMEOUT,
+    CatCodes,
+    _PACER,
+    _cat_codes,
+    _cat_frame,
+    _cat_headers,
+    _cat_payload,
+    _cursor,
+    _date_to_str,
+    _kind_page,
+    _kind_report,
+    _drop_reached,
+    _looks_like_valid_kind_table,
+    _make_df,
+    _parse_page,
+    _reached,
+    _shards,
+    _shards_after,
+    _warn_payload,
+    with_ts,
+)
+
+__all__ = [
+    "AsyncKind",
+    "akind_fetch",
+    "akind_fetch_many",
+    "afetch_investor_warning",
+    "afetch_shortterm_overheat",
+    "afetch_market_watch",
+    "afetch_delist",
+    "run_sync",
+    "gather_sync",
+]
+
+Target = Tuple[str, str, str, str]
+Page = Tuple[int, List[List[str]], bool]
+
+
+# ─────────────────────────────────────────────────────────────
+# 비동기 KIND 클라이언트
+# ─────────────────────────────────────────────────────────────
+class AsyncKind:
+    """
+    이벤트 루프 하나에 묶인 KIND 클라이언트 (httpx.AsyncClient + 동시 요청 세마포어 + 워밍업 세대).
+    async with 블록 안에서 여러 fetcher가 같은 커넥션 풀을 나눠 쓴다.
+    transport를 주면 httpx 전송 계층을 바꾼다 (테스트/리플레이 서버용).
+    """
+
+    def __init__(self, *, max_inflight: int = MAX_INFLIGHT, timeout: float = 300, transport=None):
+        self.max_inflight = max(1, int(max_inflight))
+        self.timeout = timeout
+        self.transport = transport
+        self._client = None
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._warm_lock: Optional[asyncio.Lock] = None
+        self._gen = 0
+
+    async def __aenter__(self) -> "AsyncKind":
+        self._sem = asyncio.Semaphore(self.max_inflight)
+        self._warm_lock = asyncio.Lock()
+        if httpx is not None:
+            self._client = httpx.AsyncClient(
+                headers={"User-Agent": UA, "Accept": "text/html, */*; q=0.01"},
+                limits=httpx.Limits(max_connections=self.max_inflight, max_keepalive_connections=self.max_inflight),
+                timeout=self.timeout,
+                verify=False,
+                follow_redirects=True,
+                transport=self.transport,
+            )
+            await self._warmup()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _warmup(self) -> None:
+        """메인 → 상세검색 GET으로 JSESSIONID 확보 (실패는 무시, 실제 POST가 판정)"""
+        try:
+            await metrics.acall("kind", "warmup:loadInitPage", self._client.get,
+                                KIND_MAIN_URL, params={"method": "loadInitPage"}, timeout=WARMUP_TIMEOUT)
+            await metrics.acall(
+                "kind", "warmup:searchDetailsMain", self._client.get,
+                KIND_URL, params={"method": "searchDetailsMain"},
+                headers={"Referer": f"{KIND_MAIN_URL}?method=loadInitPage"}, timeout=WARMUP_TIMEOUT,
+            )
+        except httpx.HTTPError:
+            pass
+
+    async def _rewarm(self, gen: int) -> int:
+        """세션 오염(403/비정상 테이블) 시 쿠키를 버리고 재워밍업. 같은 세대에서는 한 번만."""
+        async with self._warm_lock:
+            if gen == self._gen:
+                self._client.cookies.clear()
+                await self._warmup()
+                self._gen += 1
+            return self._gen
+
+    async def post(
+        self,
+        data: Dict[str, object],
+        *,
+        label: str,
+        headers: Optional[Dict[str, str]] = None,
+        detect_encoding: bool = False,
+    ) -> str:
+        """fnc2._post_kind와 같은 규칙(페이싱/예산/재시도/정상 테이블 판정)의 비동기 POST → HTML"""
+        if self._client is None:
+            async with self._sem:
+                return await asyncio.to_thread(
+                    _k._post_kind, data, label=label, headers=headers,
+                    timeout=self.timeout, detect_encoding=detect_encoding,
+                )
+
+        gen = self._gen
+        report, page = _kind_report(data), _kind_page(data)
+        last_err = ""
+        for _attempt in range(KIND_RETRIES):
+            w0 = time.perf_counter()
+            delay = _PACER.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            budget = _k._BUDGET
+            if budget is not None:
+                await asyncio.to_thread(budget.acquire)
+            metrics.observe_wait("kind", time.perf_counter() - w0)
+            t0 = time.perf_counter()
+            try:
+                async with self._sem:
+                    r = await self._client.post(KIND_URL, data=data, headers=headers)
+            except httpx.HTTPError as e:
+                _PACER.fail()
+                last_err = f"{type(e).__name__}: {e}"
+                metrics.observe_request("kind", report, page, "error", seconds=time.perf_counter() - t0, error=last_err)
+                continue
+
+            obs = dict(seconds=time.perf_counter() - t0, nbytes=len(r.content), server_seconds=r.elapsed.total_seconds())
+            if r.status_code in RETRY_STATUS:
+                _PACER.fail()
+                last_err = f"HTTP {r.status_code}"
+                metrics.observe_request("kind", report, page, str(r.status_code), **obs)
+                if r.status_code == 403:
+                    gen = await self._rewarm(gen)
+                continue
+            if r.status_code >= 400:
+                metrics.observe_request("kind", report, page, str(r.status_code), **obs)
+            r.raise_for_status()
+            # requests의 apparent_encoding 대신: 헤더 charset이 없으면 UTF-8 (KIND 기본)
+            html = r.content.decode(r.charset_encoding or "utf-8", errors="replace") if detect_encoding else r.text
+
+            if not _looks_like_valid_kind_table(html):
+                _PACER.fail()
+                snippet = re.sub(r"\s+", " ", html)[:300]
+                last_err = f"{label} 응답이 정상 테이블이 아님(차단/오류 가능). 응답 일부: {snippet}"
+                metrics.observe_request("kind", report, page, "blocked", **obs)
+                gen = await self._rewarm(gen)
+                continue
+
+            _PACER.ok()
+            metrics.observe_request("kind", report, page, str(r.status_code), **obs)
+            return html
+
+        raise RuntimeError(f"{label} 요청 실패(재시도 {KIND_RETRIES}회). 마지막 오류: {last_err}")
+
+
+async def _with_client(client: Optional[AsyncKind], fn: Callable[[AsyncKind], Awaitable[pd.DataFrame]]):
+    if client is not None:
+        return await fn(client)
+    async with AsyncKind() as kc:
+        return await fn(kc)
+
+
+# ─────────────────────────────────────────────────────────────
+# 페이지 체인 (fnc2._iter_cat_pages / _iter_target_pages 대응)
+# ─────────────────────────────────────────────────────────────
+def _page_result(html: str, report: str, page: int, page_size: int, max_pages: int, cur) -> Page:
+    page_rows = _parse_page(html, report, page)
+    fresh = page_rows if cur is None else [r for r in page_rows if not _reached(r, cur)]
+    added = len(page_rows)
+    last = added == 0 or added < int(page_size) or len(fresh) < added or page == max_pages
+    return page, fresh, last
+
+
+def _note_cut(info: Optional[dict], page: int, fresh: list, page_size: int, max_pages: int) -> None:
+    """fnc2._note_truncated 대응 (체인 하나의 마지막 페이지)"""
+    if info is not None and page >= max_pages and len(fresh) >= int(page_size):
+        info["truncated"] = True
+
+
+async def _cat_chain(
+    kc: AsyncKind,
+    f: str,
+    t: str,
+    code: CatCodes,
+    *,
+    page_size: int,
+    max_pages: int,
+    report_nm: Optional[str] = None,
+    report_cd: Optional[str] = None,
+    since=None,
+    info: Optional[dict] = None,
+) -> List[List[str]]:
+    """상세검색(카테고리) 체인 하나 → [페이지]+행 목록. max_pages에서 끊기면 info["truncated"]"""
+    headers = _cat_headers(code)
+    label = f"KIND [{'|'.join(_cat_codes(code))}]"
+    cur = _cursor(since)
+    rows: List[List[str]] = []
+    for page in range(1, max_pages + 1):
+        data = _cat_payload(code, f, t, page_size, page, report_nm=report_nm, report_cd=report_cd)
+        html = await kc.post(data, label=label, headers=headers, detect_encoding=True)
+        _, fresh, last = _page_result(html, _kind_report(data), page, page_size, max_pages, cur)
+        rows.extend([page] + row for row in fresh)
+        if last:
+            _note_cut(info, page, fresh, page_size, max_pages)
+            break
+    return rows
+
+
+async def _target_chain(
+    kc: AsyncKind,
+    f: str,
+    t: str,
+    target: Target,
+    *,
+    page_size: int,
+    max_pages: int,
+    since=None,
+    info: Optional[dict] = None,
+) -> List[List[str]]:
+    """reportCd 하나의 체인 → 행 목록. max_pages에서 끊기면 info["truncated"]"""
+    nm, cd = target[0], target[1]
+    label = f"KIND(warn payload) [{cd}] {nm}" if cd else f"KIND({nm})"
+    cur = _cursor(since)
+    rows: List[List[str]] = []
+    for page in range(1, max_pages + 1):
+        data = _warn_payload(target, f, t, page_size, page)
+        html = await kc.post(data, label=label, headers=HEADERS_MENU_WARN)
+        _, fresh, last = _page_result(html, _kind_report(data), page, page_size, max_pages, cur)
+        rows += fresh
+        if last:
+            _note_cut(info, page, fresh, page_size, max_pages)
+            break
+    return rows
+
+
+async def _asearch(kc: AsyncKind, f: str, t: str, code: CatCodes, *, shard: Optional[str], since=None, **kw) -> pd.DataFrame:
+    """fnc2._kind_disclosure_search 대응 (샤드는 코루틴으로 동시에)"""
+    if not shard:
+        return _cat_frame(await _cat_chain(kc, f, t, code, since=since, **kw))
+    parts = _shards_after(_shards(f, t, shard), _cursor(since))
+    chunks = await asyncio.gather(*(_cat_chain(kc, sf, st, code, since=since, **kw) for sf, st in parts))
+    frames = [_cat_frame(rows) for rows in chunks]
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame(columns=CAT_COLS)
+    df = pd.concat(frames, ignore_index=True)
+    dup = df["문서번호"].astype(str).ne("") & df.duplicated(subset=["문서번호"], keep="first")
+    return df[~dup].reset_index(drop=True)
+
+
+async def _areportcd(
+    kc: AsyncKind,
+    f: str,
+    t: str,
+    targets: Sequence[Target],
+    *,
+    page_size: int,
+    max_pages: int,
+    since=None,
+    shard: Optional[str] = None,
+    info: Optional[dict] = None,
+) -> pd.DataFrame:
+    """fnc2._fetch_reportcd_with_warn_payload 대응 (targets 순서 → 최신 샤드 순서로 이어붙임)"""
+    parts = _shards_after(_shards(f, t, shard), _cursor(since))
+    chunks = await asyncio.gather(*(
+        _target_chain(kc, sf, st, target, page_size=page_size, max_pages=max_pages, since=since, info=info)
+        for target in targets for sf, st in parts
+    ))
+    return _make_df([row for chunk in chunks for row in chunk])
+
+
+async def _athrough_store(
+    source: str, from_date: str, to_date: str, fetch, *, since=None, with_page: bool = False, force: bool = False,
+) -> pd.DataFrame:
+    """fnc2._through_store 대응. SQLite 작업은 스레드로 넘겨 이벤트 루프를 막지 않는다."""
+    f = _date_to_str(from_date)
+    t = _date_to_str(to_date)
+    store = _k._STORE
+    if store is None:
+        return with_ts(await fetch(f, t, since, {}))
+
+    started_at = time.time()
+    if force:
+        spans = [(f, t)]
+    else:
+        spans = await asyncio.to_thread(store.gaps, source, f, t, max_open_age=_k._STORE_MAX_AGE)
+    for gf, gt in spans:
+        cur = None if force else await asyncio.to_thread(store.cursor, source, gf, gt)
+        info: dict = {}
+        df = await fetch(gf, gt, cur, info)
+        await asyncio.to_thread(
+            store.put, source, df, gf, gt, started_at=started_at, replace=force, cover=not info.get("truncated"),
+        )
+    df = await asyncio.to_thread(store.read, source, f, t, with_page=with_page)
+    return with_ts(_drop_reached(df, _cursor(since)))
+
+
+# ─────────────────────────────────────────────────────────────
+# 공개 API (fnc2 공개 함수와 같은 인자 + client)
+# ─────────────────────────────────────────────────────────────
+async def akind_fetch(
+    category: str,
+    from_date: str,
+    to_date: str,
+    page_size: int = 100,
+    max_pages: int = 1000,
+    *,
+    report_nm: Optional[str] = None,
+    report_cd: Optional[str] = None,
+    since=None,
+    shard: Optional[str] = None,
+    force: bool = False,
+    client: Optional[AsyncKind] = None,
+) -> pd.DataFrame:
+    """fnc2.kind_fetch의 비동기 버전"""
+    code = CODE_MAP[category]
+    source = f"cat:{code}"
+    if report_nm or report_cd:
+        source += f":{report_nm or ''}:{report_cd or ''}"
+
+    async def _go(kc: AsyncKind) -> pd.DataFrame:
+        async def _fetch(f: str, t: str, since, info: dict) -> pd.DataFrame:
+            df = await _asearch(
+                kc, f, t, code, shard=shard, since=since, info=info,
+                page_size=page_size, max_pages=max_pages, report_nm=report_nm, report_cd=report_cd,
+            )
+            return df.reset_index(drop=True) if df is not None and not df.empty else pd.DataFrame()
+        return await _athrough_store(source, from_date, to_date, _fetch, since=since, with_page=True, force=force)
+
+    return await _with_client(client, _go)
+
+
+async def akind_fetch_many(
+    categories: Sequence[str],
+    from_date: str,
+    to_date: str,
+    page_size: int = 100,
+    max_pages: int = 1000,
+    *,
+    since=None,
+    shard: Optional[str] = None,
+    force: bool = False,
+    client: Optional[AsyncKind] = None,
+) -> pd.DataFrame:
+    """fnc2.kind_fetch_many의 비동기 버전"""
+    cats = sorted(set(categories), key=list(CODE_MAP).index)
+    codes = [CODE_MAP[c] for c in cats]
+    source = "cat:" + "|".join(sorted(codes))
+
+    async def _go(kc: AsyncKind) -> pd.DataFrame:
+        async def _fetch(f: str, t: str, since, info: dict) -> pd.DataFrame:
+            df = await _asearch(
+                kc, f, t, codes, shard=shard, since=since, info=info, page_size=page_size, max_pages=max_pages,
+            )
+            return df.reset_index(drop=True) if df is not None and not df.empty else pd.DataFrame()
+        return await _athrough_store(source, from_date, to_date, _fetch, since=since, with_page=True, force=force)
+
+    return await _with_client(client, _go)
+
+
+def _areportcd_fetcher(source: str, targets: Sequence[Target], doc: str):
+    async def _fetcher(
+        from_date: str,
+        to_date: str,
+        *,
+        page_size: int = 100,
+        max_pages: int = 1000,
+        since=None,
+        shard: Optional[str] = None,
+        force: bool = False,
+        client: Optional[AsyncKind] = None,
+    ) -> pd.DataFrame:
+        async def _go(kc: AsyncKind) -> pd.DataFrame:
+            return await _athrough_store(source, from_date, to_date, lambda f, t, since, info: _areportcd(
+                kc, f, t, targets, page_size=page_size, max_pages=max_pages, since=since, shard=shard, info=info,
+            ), since=since, force=force)
+        return await _with_client(client, _go)
+
+    _fetcher.__doc__ = doc
+    return _fetcher
+
+
+afetch_investor_warning = _areportcd_fetcher("inv", TARGETS_WARN, "fnc2.fetch_investor_warning의 비동기 버전")
+afetch_shortterm_overheat = _areportcd_fetcher("overheat", [TARGET_OVERHEAT], "fnc2.fetch_shortterm_overheat의 비동기 버전")
+afetch_market_watch = _areportcd_fetcher("mw", TARGETS_MARKET_WATCH, "fnc2.fetch_market_watch의 비동기 버전")
+afetch_delist = _areportcd_fetcher("delist", TARGETS_DELIST, "fnc2.fetch_delist의 비동기 버전")
+
+
+# ─────────────────────────────────────────────────────────────
+# 동기 래퍼
+# ─────────────────────────────────────────────────────────────
+def run_sync(coro: Awaitable):
+    """코루틴 하나를 동기로 실행. 이미 이벤트 루프가 도는 스레드에서 부르면 별도 스레드에서 돌린다."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    out: Dict[str, object] = {}
+
+    def _run():
+        try:
+            out["value"] = asyncio.run(coro)
+        except BaseException as e:
+            out["error"] = e
+
+    th = threading.Thread(target=_run, name="afnc2-sync")
+    th.start()
+    th.join()
+    if "error" in out:
+        raise out["error"]
+    return out["value"]
+
+
+def gather_sync(
+    jobs: Dict[str, Callable[[AsyncKind], Awaitable[pd.DataFrame]]],
+    **client_kw,
+) -> Dict[str, pd.DataFrame]:
+    """
+    {이름: client → 코루틴} 을 클라이언트 하나(커넥션 풀 공유)로 동시에 실행 → {이름: DataFrame}.
+    menu2._gather와 같은 모양이라 수집 함수만 바꿔 끼우면 된다. 하나라도 실패하면 예외.
+    client_kw는 AsyncKind 인자(max_inflight, timeout, transport).
+        gather_sync({"mw": lambda kc: afetch_market_watch(f, t, client=kc)})
+    """
+    async def _all() -> Dict[str, pd.DataFrame]:
+        async with AsyncKind(**client_kw) as kc:
+            values = await asyncio.gather(*(fn(kc) for fn in jobs.values()))
+        return dict(zip(jobs, values))
+
+    return run_sync(_all())
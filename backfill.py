@@ -0,0 +1,185 @@
+# backfill.py
+# 장기간 과거 공시 적재 — 페이지 단위 체크포인트로 실패/중단 지점부터 이어 받는다.
+"""
+사용법:
+    python -m backfill inv overheat delist --from 2020-01-01 --to 2025-12-31
+    python -m backfill mw --from 2024-01-01 --to 2024-12-31 --shard day
+    python -m backfill inv --from 2020-01-01 --to 2025-12-31 --restart   # 체크포인트 무시하고 처음부터
+    python -m backfill mgmt --from 2020-01-01 --to 2025-12-31 --max-pages 5000   # max_pages에서 끊긴 체인 이어 받기
+
+(소스, 파트(reportCd/카테고리), 날짜 샤드, 페이지)마다 행과 체크포인트를 같은 트랜잭션으로 저장하므로
+40페이지째에서 "정상 테이블이 아님" 오류로 죽어도 다시 실행하면 41페이지부터 받는다.
+샤드의 모든 파트가 끝나면 그 구간을 저장소 커버리지로 기록해 앱/fetcher가 바로 읽는다.
+
+페이지 번호로 이어 받을 수 있는 건 목록이 더 이상 바뀌지 않는 지난 날짜뿐이다. 오늘(KST) 이후가 끼면
+새 공시가 목록 앞에 붙어 행이 뒤 페이지로 밀리고, 체크포인트 다음 페이지부터 받으면 밀린 행을 놓친다.
+그래서 종료일은 어제까지로 줄인다 (최근 날짜는 collector/fetcher 몫).
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import logging
+import os
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from fnc2 import (
+    CODE_MAP,
+    KST,
+    MAX_INFLIGHT,
+    TARGETS_WARN,
+    TARGETS_MARKET_WATCH,
+    TARGETS_DELIST,
+    TARGET_OVERHEAT,
+    _cat_frame,
+    _date_to_str,
+    _iter_cat_pages,
+    _iter_target_pages,
+    _make_df,
+    _pmap,
+    _shards,
+    use_store,
+)
+from store import DisclosureStore, DEFAULT_STORE_PATH
+
+__all__ = ["BACKFILL_SOURCES", "backfill"]
+
+log = logging.getLogger("backfill")
+
+DEFAULT_SHARD = "week"
+PAGE_SPAN = 1_000_000     # 저장 위치 계산용 파트당 페이지 자리수 (max_pages보다 커야 함)
+
+# 이름 → (저장소 소스 키, reportCd 목록 또는 카테고리 코드). 소스 키는 fnc2 공개 fetcher와 같다.
+BACKFILL_SOURCES: Dict[str, Tuple[str, object]] = {
+    "inv":      ("inv", TARGETS_WARN),
+    "overheat": ("overheat", [TARGET_OVERHEAT]),
+    "mw":       ("mw", TARGETS_MARKET_WATCH),
+    "delist":   ("delist", TARGETS_DELIST),
+    **{cat: (f"cat:{code}", code) for cat, code in CODE_MAP.items()},
+}
+
+PageIter = Callable[[str, str, int], Iterator[Tuple[int, List[List[str]], bool]]]
+Part = Tuple[str, PageIter, Callable[[int, List[List[str]]], pd.DataFrame]]
+
+
+def _parts(spec: object, page_size: int, max_pages: int) -> List[Part]:
+    """소스 정의 → [(파트 키, 페이지 반복자(f, t, start_page), 페이지 행 → DataFrame)]"""
+    if isinstance(spec, str):
+        def _cat_iter(f: str, t: str, start: int, code: str = spec):
+            return _iter_cat_pages(f, t, code, page_size=page_size, max_pages=max_pages, start_page=start)
+        return [(spec, _cat_iter, lambda page, rows: _cat_frame([[page] + r for r in rows]))]
+
+    parts: List[Part] = []
+    for target in spec:
+        def _target_iter(f: str, t: str, start: int, target=target):
+            return _iter_target_pages(f, t, target, page_size=page_size, max_pages=max_pages, start_page=start)
+        parts.append((f"{target[1]}:{target[0]}", _target_iter, lambda page, rows: _make_df(rows)))
+    return parts
+
+
+def _last_closed_day() -> str:
+    """목록이 더 바뀌지 않는 마지막 날짜 = 어제(KST)"""
+    return (datetime.datetime.now(KST).date() - datetime.timedelta(days=1)).isoformat()
+
+
+def backfill(
+    name: str,
+    from_date: str,
+    to_date: str,
+    store: DisclosureStore,
+    *,
+    shard: Optional[str] = DEFAULT_SHARD,
+    page_size: int = 100,
+    max_pages: int = 1000,
+    max_workers: int = MAX_INFLIGHT,
+    restart: bool = False,
+) -> int:
+    """
+    소스 하나를 [from, to] 구간 적재. 이번 실행에서 새로 저장한 행 수 반환.
+    (파트, 샤드) 체인은 동시에 돌고, 각 체인은 체크포인트 다음 페이지부터 시작한다.
+    체인 하나가 실패하면 예외를 올리지만, 그때까지 저장한 페이지와 끝난 샤드의 커버리지는 남는다.
+    to_date가 오늘(KST) 이후면 어제까지로 줄인다 (열린 날짜는 페이지 재개가 안전하지 않음).
+    max_pages에서 끊긴 체인(마지막 페이지가 꽉 참)은 완료로 기록하지 않으므로 그 샤드는 커버리지에 안 들어간다.
+    체크포인트가 이미 max_pages에 닿은 체인은 받을 페이지가 없으므로 건너뛰고 경고로 알린다 (max_pages를 늘려 재실행).
+    page_size는 체크포인트 페이지 번호의 기준이라 이어 받을 때는 처음과 같은 값을 써야 한다.
+    """
+    source, spec = BACKFILL_SOURCES[name]
+    f = _date_to_str(from_date)
+    t = _date_to_str(to_date)
+    last_closed = _last_closed_day()
+    if t > last_closed:
+        log.warning(f"⚠️ {name}: 종료일 {t} → {last_closed} (오늘 이후는 적재하지 않음)")
+        t = last_closed
+    if f > t:
+        return 0
+    if restart:
+        store.clear_checkpoints(source)
+
+    parts = _parts(spec, page_size, max_pages)
+    rank = {key: i for i, (key, _, _) in enumerate(parts)}
+    shards = _shards(f, t, shard)
+    capped: List[str] = []
+
+    def _chain(job: Tuple[Part, Tuple[str, str]]) -> int:
+        (key, pages, frame), (sf, st) = job
+        page, done, _ = store.checkpoint(source, key, sf, st)
+        if done:
+            return 0
+        if page >= max_pages:
+            capped.append(f"{key} {sf}~{st}")
+            log.warning(f"⚠️ {name} [{key}] {sf}~{st}: 체크포인트 {page}페이지가 max_pages({max_pages}) 이상 — --max-pages를 늘려 다시 실행")
+            return 0
+        saved = 0
+        for pg, rows, last in pages(sf, st, page + 1):
+            cut = last and pg >= max_pages and len(rows) >= page_size
+            # 목록 위치 = (파트 순서, 페이지, 행) — fetcher가 파트를 순서대로 합친 결과와 같은 순서로 읽힌다
+            pos = (rank[key] * PAGE_SPAN + pg) * page_size
+            saved += store.save_page(source, key, sf, st, pg, frame(pg, rows), done=last and not cut, pos=pos)
+            if cut:
+                capped.append(f"{key} {sf}~{st}")
+                log.warning(f"⚠️ {name} [{key}] {sf}~{st}: max_pages({max_pages})에서 끊김 — 샤드를 줄이거나 --max-pages를 늘려 다시 실행")
+        log.info(f"✅ {name} [{key}] {sf}~{st} {saved}건 (재개 페이지 {page + 1})")
+        return saved
+
+    jobs = [(part, sh) for sh in shards for part in parts]
+    try:
+        return sum(_pmap(_chain, jobs, max_workers=max_workers, name="backfill"))
+    finally:
+        if capped:
+            log.warning(f"⚠️ {name}: max_pages({max_pages})에 막힌 체인 {len(capped)}개 미완료 — {', '.join(sorted(capped))}")
+        # 모든 파트가 끝난 샤드만 커버리지 기록 (첫 페이지를 받은 시각 기준으로 열린 날짜 판정)
+        for sf, st in shards:
+            states = [store.checkpoint(source, key, sf, st) for key, _, _ in parts]
+            if all(done for _, done, _ in states):
+                store.mark_covered(source, sf, st, started_at=min(at for _, _, at in states))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="KIND 과거 공시 적재 (체크포인트 재개)")
+    ap.add_argument("sources", nargs="+", choices=list(BACKFILL_SOURCES))
+    ap.add_argument("--from", dest="from_date", required=True, help="시작일 YYYY-MM-DD")
+    ap.add_argument("--to", dest="to_date", required=True, help="종료일 YYYY-MM-DD")
+    ap.add_argument("--shard", choices=["day", "week"], default=DEFAULT_SHARD, help="날짜 샤드 단위")
+    ap.add_argument("--store", default=os.environ.get("KIND_STORE_PATH", DEFAULT_STORE_PATH),
+                    help="저장소 경로 (기본: $KIND_STORE_PATH 또는 %(default)s)")
+    ap.add_argument("--page-size", type=int, default=100, help="페이지당 건수 (이어 받을 때는 처음과 같은 값)")
+    ap.add_argument("--max-pages", type=int, default=1000, help="체인당 최대 페이지 (끊긴 체인은 늘려서 재실행)")
+    ap.add_argument("--restart", action="store_true", help="체크포인트를 지우고 처음부터")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    store = use_store(args.store)
+    for name in args.sources:
+        t0 = time.perf_counter()
+        n = backfill(
+            name, args.from_date, args.to_date, store, shard=args.shard,
+            page_size=args.page_size, max_pages=args.max_pages, restart=args.restart,
+        )
+        log.info(f"🏁 {name} {args.from_date}~{args.to_date} 신규 {n}건 · {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
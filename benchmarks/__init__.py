@@ -0,0 +1 @@
+# benchmarks: 합성 KIND 데이터 기반 성능 측정 스크립트 모음 (python -m benchmarks.<이름>)
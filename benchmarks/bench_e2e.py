@@ -0,0 +1,113 @@
+# benchmarks/bench_e2e.py
+# 공개 fetcher 전체를 리플레이 서버(benchmarks/replay_server.py)에 붙여 요청 수/소요 시간/처리량 측정
+#   python -m benchmarks.bench_e2e [--days 5] [--latency 0.05] [--shard week] [--no-pace] [--p403 0.02] [--json out.json]
+"""
+KIND/KRX/NXT 대신 같은 프로세스에서 띄운 리플레이 서버로 보낸다 (네트워크/거래소 불필요, CI용).
+fnc2/fnc는 import 시점에 *_BASE_URL을 읽으므로 서버를 띄우고 환경변수를 설정한 뒤 import 한다.
+저장소와 소스 캐시는 끄고 매 측정마다 비우므로 항상 전 구간을 실제로 받는다.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.replay_server import ReplayServer
+
+
+def _fetchers(f: str, t: str, shard, page_size: int) -> Dict[str, Callable[[], object]]:
+    import fnc
+    import fnc2
+    import menu2
+
+    kw = dict(page_size=page_size, shard=shard)
+    ymd = t.replace("-", "")
+    return {
+        "kind_fetch(halt)":         lambda: fnc2.kind_fetch("halt", f, t, **kw),
+        "kind_fetch_many(4)":       lambda: fnc2.kind_fetch_many(menu2.MULTI_CATS, f, t, **kw),
+        "fetch_market_watch":       lambda: fnc2.fetch_market_watch(f, t, **kw),
+        "fetch_investor_warning":   lambda: fnc2.fetch_investor_warning(f, t, **kw),
+        "fetch_shortterm_overheat": lambda: fnc2.fetch_shortterm_overheat(f, t, **kw),
+        "fetch_delist":             lambda: fnc2.fetch_delist(f, t, **kw),
+        "_fetch_multi":             lambda: menu2._fetch_multi(f, t, page_size),
+        "get_krx_market_price_info": lambda: fnc.get_krx_market_price_info(ymd)[1],
+        "get_krx_index":            lambda: fnc.get_krx_index(ymd),
+        "get_nxt_listing":          lambda: fnc.get_nxt_listing(ymd, snapshot_dir="").df,
+    }
+
+
+def run(srv: ReplayServer, *, days: int, shard, page_size: int, repeat: int, pace: bool) -> List[dict]:
+    import fnc
+    import fnc2
+
+    fnc2.use_store(None)
+    if not pace:
+        fnc2._PACER.floor = 0.0
+    t = datetime.date(2025, 7, 31)
+    f = t - datetime.timedelta(days=days - 1)
+    out = []
+    for name, fn in _fetchers(f.isoformat(), t.isoformat(), shard, page_size).items():
+        best = None
+        for _ in range(repeat):
+            fnc2.clear_source_cache()
+            fnc.clear_nxt_cache()
+            fnc2.reset_session()
+            fnc2._PACER.reset()    # 앞 측정의 백오프·예약 슬롯·연속 성공을 넘기지 않음
+            srv.reset_stats()
+            t0 = time.perf_counter()
+            df = fn()
+            wall = time.perf_counter() - t0
+            stats = dict(srv.stats)
+            res = {
+                "name": name,
+                "rows": len(df),
+                "requests": stats.get("kind", 0) + stats.get("krx", 0) + stats.get("nxt", 0),
+                "retried": stats.get("kind_403", 0) + stats.get("kind_blocked", 0),
+                "wall_sec": round(wall, 4),
+                "rows_per_sec": round(len(df) / wall, 1) if wall > 0 else 0.0,
+            }
+            if best is None or res["wall_sec"] < best["wall_sec"]:
+                best = res
+        out.append(best)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="리플레이 서버 기반 end-to-end fetcher 벤치마크")
+    ap.add_argument("--days", type=int, default=5, help="조회 기간(일), 2025-07-31까지")
+    ap.add_argument("--shard", choices=["day", "week"], default=None)
+    ap.add_argument("--page-size", type=int, default=100)
+    ap.add_argument("--latency", type=float, default=0.05, help="서버 응답 지연(초)")
+    ap.add_argument("--jitter", type=float, default=0.0)
+    ap.add_argument("--p403", type=float, default=0.0, help="KIND 403 확률 (재시도 경로 측정)")
+    ap.add_argument("--pblock", type=float, default=0.0, help="KIND 200 차단 페이지 확률")
+    ap.add_argument("--density", type=int, default=6, help="키·날짜당 평균 공시 수")
+    ap.add_argument("--repeat", type=int, default=1, help="최솟값을 쓸 반복 횟수")
+    ap.add_argument("--no-pace", action="store_true", help="_Pacer 기본 간격(PACE_FLOOR) 끄기")
+    ap.add_argument("--json", default=None, help="결과를 JSON 파일로 저장")
+    args = ap.parse_args()
+
+    with ReplayServer(
+        latency=args.latency, jitter=args.jitter, p403=args.p403, pblock=args.pblock, density=args.density,
+    ) as srv:
+        os.environ.update(srv.env())
+        os.environ["KIND_STORE_PATH"] = ""    # menu2 import 시 저장소 연결 안 함
+        results = run(
+            srv, days=args.days, shard=args.shard, page_size=args.page_size,
+            repeat=args.repeat, pace=not args.no_pace,
+        )
+
+    print(f"days={args.days} shard={args.shard} latency={args.latency}s pace={'off' if args.no_pace else 'on'}")
+    print(f"{'fetcher':<28}{'rows':>8}{'requests':>10}{'retried':>9}{'wall(s)':>10}{'rows/sec':>11}")
+    for r in results:
+        print(f"{r['name']:<28}{r['rows']:>8}{r['requests']:>10}{r['retried']:>9}{r['wall_sec']:>10.3f}{r['rows_per_sec']:>11.1f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"args": vars(args), "results": results}, fh, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
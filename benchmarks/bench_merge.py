@@ -0,0 +1,71 @@
+# benchmarks/bench_merge.py
+# 소스 병합: 기존(concat → drop_duplicates → to_datetime → sort_values) vs fnc2.merge_frames
+#   python -m benchmarks.bench_merge [--sizes 10000 100000 1000000] [--sources 6]
+"""
+최신순 소스 여럿을 합치는 시간을 기존 방식(legacy_merge)과 fnc2.merge_frames로 비교한다.
+merge_frames는 시간 문자열만 있는 입력(str)과 TS_COL이 붙은 입력(ts) 두 경우를 잰다.
+결과 동일성은 exact / ties(동률 내부 순서만 다름) / DIFF로 표시한다.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import pandas as pd
+
+import fnc2
+from benchmarks.synth import synth_frames
+
+
+def legacy_merge(frames) -> pd.DataFrame:
+    """변경 전 menu2._fetch_multi / _merge_halt_and_mw / fnc2._make_df 병합 방식"""
+    dfs = [x for x in frames if x is not None and not x.empty]
+    if not dfs:
+        return pd.DataFrame()
+    merged = pd.concat(dfs, ignore_index=True, sort=False)
+    merged = merged.drop_duplicates(subset=["문서번호"], keep="first")
+    merged["__ts"] = pd.to_datetime(merged["시간"], errors="coerce")
+    merged = merged.sort_values("__ts", ascending=False).drop(columns="__ts")
+    return merged.reset_index(drop=True)
+
+
+def _best(fn, frames, repeat: int):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(frames)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def _same(a: pd.DataFrame, b: pd.DataFrame) -> str:
+    """exact: 완전 동일 / ties: 같은 행 집합+시각 순서, 동률 내부 순서만 다름 / DIFF"""
+    if a.equals(b):
+        return "exact"
+    if len(a) == len(b) and list(a["시간"]) == list(b["시간"]) and set(a["문서번호"]) == set(b["문서번호"]):
+        return "ties"
+    return "DIFF"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    ap.add_argument("--sources", type=int, default=6)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    # merge(str): 시간 문자열만 있는 입력 / merge(ts): TS_COL이 붙은 입력
+    print(f"{'rows':>9}{'legacy ms':>12}{'merge(str)':>12}{'merge(ts)':>12}{'speedup':>9}  result")
+    for n in args.sizes:
+        frames = synth_frames(n, args.sources, seed=n)
+        # fetcher는 수집 시 TS_COL을 한 번 붙여 내보낸다 (그 비용은 병합이 아니라 수집 단계 몫)
+        typed = [fnc2.with_ts(df) for df in frames]
+        t_old, old = _best(legacy_merge, frames, args.repeat)
+        t_raw, _ = _best(fnc2.merge_frames, frames, args.repeat)
+        t_new, new = _best(fnc2.merge_frames, typed, args.repeat)
+        same = _same(old, new.drop(columns=fnc2.TS_COL))
+        print(f"{n:>9}{t_old * 1e3:>12.1f}{t_raw * 1e3:>12.1f}{t_new * 1e3:>12.1f}{t_old / t_new:>8.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# benchmarks/bench_parse.py
+# _parse_rows_html: BeautifulSoup(html.parser) vs lxml 처리량 비교 + 결과 동일성 확인
+#   python -m benchmarks.bench_parse [--pages 200] [--rows 100]
+"""
+합성 KIND 목록 페이지로 _parse_rows_bs4와 _parse_rows_lxml의 처리량(pages/sec, rows/sec)을 비교한다.
+두 파서의 결과가 다른 페이지 수(mismatched_pages)도 함께 출력한다.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import fnc2
+from benchmarks.synth import synth_page, synth_rows
+
+
+def _bench(fn, pages, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for html in pages:
+            fn(html)
+        best = min(best, time.perf_counter() - t0)
+    return len(pages) / best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--pages", type=int, default=200)
+    ap.add_argument("--rows", type=int, default=100, help="페이지당 행 수 (currentPageSize)")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    rows = synth_rows(args.pages * args.rows, seed=42)
+    pages = [synth_page(rows[i:i + args.rows]) for i in range(0, len(rows), args.rows)]
+
+    mismatch = sum(fnc2._parse_rows_bs4(h) != fnc2._parse_rows_lxml(h) for h in pages)
+    bs4_pps = _bench(fnc2._parse_rows_bs4, pages, args.repeat)
+    lxml_pps = _bench(fnc2._parse_rows_lxml, pages, args.repeat)
+
+    print(f"pages={len(pages)} rows/page={args.rows} mismatched_pages={mismatch}")
+    print(f"{'parser':<8}{'pages/sec':>12}{'rows/sec':>12}")
+    for name, pps in [("bs4", bs4_pps), ("lxml", lxml_pps)]:
+        print(f"{name:<8}{pps:>12.1f}{pps * args.rows:>12.0f}")
+    print(f"speedup  x{lxml_pps / bs4_pps:.1f}")
+
+
+if __name__ == "__main__":
+    main()
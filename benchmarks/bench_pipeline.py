@@ -0,0 +1,154 @@
+# benchmarks/bench_pipeline.py
+# 화면 한 번 그리기까지의 단계별 마이크로벤치마크 (파싱 → DF → 병합 → 필터 → 표시 → 스타일 → 복사용)
+#   python -m benchmarks.bench_pipeline [--sizes 1000 10000 50000] [--repeat 3] [--json pipeline.json]
+"""
+합성 페이지/프레임으로 menu2.run()이 실제로 거치는 함수를 단계마다 따로 잰다.
+각 단계의 입력은 앞 단계의 출력(미리 한 번 계산)이라 단계끼리 시간이 섞이지 않는다.
+시간은 repeat회 중 최솟값/평균, 메모리는 tracemalloc으로 따로 한 번 돌린 peak(시간 측정과 분리).
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+os.environ.setdefault("KIND_STORE_PATH", "")    # menu2 import 시 저장소 연결 안 함
+
+import pandas as pd
+
+import fnc2
+import menu2
+from benchmarks.synth import synth_page, synth_rows
+
+REF_DATE = datetime.date(2025, 7, 31)   # synth_rows 기본 end 날짜 → 당일 하이라이트가 생김
+
+
+def _pages(n: int, page_size: int, seed: int) -> List[str]:
+    rows = synth_rows(n, seed=seed)
+    return [synth_page(rows[i:i + page_size]) for i in range(0, len(rows), page_size)]
+
+
+def _parse_all(pages: List[str]) -> List[List[str]]:
+    out: List[List[str]] = []
+    for html in pages:
+        out.extend(fnc2._parse_rows_html(html))
+    return out
+
+
+def _render(sty) -> object:
+    # st.dataframe(Styler)도 내부에서 _compute()로 셀 스타일을 계산한다 (Styler 생성 자체는 지연)
+    sty._compute()
+    return sty
+
+
+def _stages(n: int, page_size: int, keyword: str, st_tm: datetime.time, en_tm: datetime.time
+            ) -> List[Tuple[str, Callable[[], object], int]]:
+    """(단계명, 입력이 고정된 호출, 입력 행 수) 목록. 입력은 여기서 앞 단계를 한 번씩 실행해 만든다."""
+    pages = _pages(n, page_size, seed=42)
+    rows = _parse_all(pages)
+    df_halt = fnc2._make_df(rows)
+    df_mw = fnc2._make_df(_parse_all(_pages(max(1, n // 4), page_size, seed=7)))
+    merged = menu2._merge_halt_and_mw(df_halt, df_mw)
+    kw = menu2._filter_keyword(merged.copy(), keyword)
+    tm = menu2._filter_time(kw, st_tm, en_tm)
+    disp = menu2.build_display_df(tm, REF_DATE)
+    disp["비고"] = ""
+    nxt_set = set(disp["종목명"].drop_duplicates().iloc[::5])   # 종목 5개 중 1개꼴 NXT
+
+    return [
+        ("_parse_rows_html",  lambda: _parse_all(pages), n),
+        ("_make_df",          lambda: fnc2._make_df(rows), len(rows)),
+        ("_merge_halt_and_mw", lambda: menu2._merge_halt_and_mw(df_halt, df_mw), len(df_halt) + len(df_mw)),
+        ("_filter_keyword",   lambda: menu2._filter_keyword(merged.copy(), keyword), len(merged)),
+        ("_filter_time",      lambda: menu2._filter_time(kw, st_tm, en_tm), len(kw)),
+        ("build_display_df",  lambda: menu2.build_display_df(tm, REF_DATE), len(tm)),
+        ("style_today_rows",  lambda: _render(menu2.style_today_rows(disp)), len(disp)),
+        ("style_nxt_rows",    lambda: _render(menu2.style_nxt_rows(disp, nxt_set)), len(disp)),
+        ("_make_copy_df",     lambda: menu2._make_copy_df(disp), len(disp)),
+    ]
+
+
+def _rows_out(res) -> int:
+    if isinstance(res, (pd.DataFrame, list)):
+        return len(res)
+    return len(getattr(res, "data", ()))     # Styler
+
+
+def _time(fn: Callable[[], object], repeat: int) -> Tuple[float, float, object]:
+    times = []
+    res = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        res = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), sum(times) / len(times), res
+
+
+def _peak(fn: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes: List[int], *, page_size: int, repeat: int, keyword: str,
+        st_tm: datetime.time, en_tm: datetime.time, memory: bool = True) -> List[dict]:
+    out = []
+    for n in sizes:
+        for name, fn, rows_in in _stages(n, page_size, keyword, st_tm, en_tm):
+            best, mean, res = _time(fn, repeat)
+            rec: Dict[str, object] = {
+                "size": n,
+                "stage": name,
+                "rows_in": rows_in,
+                "rows_out": _rows_out(res),
+                "best_ms": round(best * 1000, 3),
+                "mean_ms": round(mean * 1000, 3),
+                "rows_per_sec": round(rows_in / best, 1) if best > 0 else 0.0,
+            }
+            if memory:
+                rec["peak_kb"] = round(_peak(fn) / 1024, 1)
+            out.append(rec)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="파싱 → 표시까지 단계별 마이크로벤치마크")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000], help="합성 공시 건수")
+    ap.add_argument("--page-size", type=int, default=100, help="페이지당 행 수 (currentPageSize)")
+    ap.add_argument("--repeat", type=int, default=3, help="최솟값/평균을 낼 반복 횟수")
+    ap.add_argument("--keyword", default="투자경고", help="_filter_keyword 키워드 (공란이면 통과)")
+    ap.add_argument("--start", default="09:00", help="_filter_time 시작 HH:MM")
+    ap.add_argument("--end", default="15:30", help="_filter_time 끝 HH:MM (시작보다 이르면 자정 넘김)")
+    ap.add_argument("--no-memory", action="store_true", help="tracemalloc peak 측정 생략")
+    ap.add_argument("--json", default=None, help="결과를 JSON 파일로 저장")
+    args = ap.parse_args()
+
+    st_tm = datetime.datetime.strptime(args.start, "%H:%M").time()
+    en_tm = datetime.datetime.strptime(args.end, "%H:%M").time()
+    results = run(
+        args.sizes, page_size=args.page_size, repeat=args.repeat, keyword=args.keyword,
+        st_tm=st_tm, en_tm=en_tm, memory=not args.no_memory,
+    )
+
+    print(f"parser={fnc2.HTML_PARSER} pandas={pd.__version__} repeat={args.repeat}")
+    print(f"{'size':>7}  {'stage':<20}{'rows_in':>9}{'rows_out':>10}{'best(ms)':>11}{'mean(ms)':>11}{'peak(KB)':>11}")
+    for r in results:
+        peak = f"{r['peak_kb']:>11.1f}" if "peak_kb" in r else f"{'-':>11}"
+        print(f"{r['size']:>7}  {r['stage']:<20}{r['rows_in']:>9}{r['rows_out']:>10}"
+              f"{r['best_ms']:>11.2f}{r['mean_ms']:>11.2f}{peak}")
+    if args.json:
+        env = {"python": platform.python_version(), "pandas": pd.__version__, "parser": fnc2.HTML_PARSER}
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"args": vars(args), "env": env, "results": results}, fh, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+# benchmarks/replay_server.py
+# KIND/KRX/NXT 대역 HTTP 서버 — 실제 거래소에 붙지 않고 fetcher 속도/회귀를 재기 위한 리플레이
+#   python -m benchmarks.replay_server [--port 8765] [--latency 0.05] [--p403 0.01] [--pblock 0.01] [--recorded DIR]
+#   KIND_BASE_URL=http://127.0.0.1:8765 KRX_BASE_URL=http://127.0.0.1:8765 NXT_BASE_URL=http://127.0.0.1:8765 streamlit run menu2.py
+"""
+엔드포인트 (경로는 실제 서비스와 같음):
+  GET  /main.do, /disclosure/details.do      워밍업 (쿠키 발급)
+  POST /disclosure/details.do                details_sub 목록 HTML (currentPageSize/pageIndex/fromDate/toDate 준수)
+  POST /comm/bldAttendant/getJsonData.cmd    KRX 시세(MDCSTAT01501)/지수 구성(MDCSTAT00601) JSON
+  POST /brdinfoTime/brdinfoTimeList.do       NXT 종목 JSON
+  GET  /__stats, POST /__reset               요청 수 통계
+
+KIND 목록은 (reportCd 또는 reportNm 또는 카테고리 코드, 날짜)마다 결정적으로 만든 합성 공시다.
+같은 날짜는 조회 구간/샤드와 무관하게 항상 같은 행이므로 샤드/비샤드 결과를 비교할 수 있다.
+--recorded DIR 에 <키>/<from>_<to>_<page>.html 파일이 있으면 합성 대신 그 응답을 그대로 돌려준다.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import random
+import re
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.synth import _MARKETS, _SUBMITTERS, _TITLES, synth_blocked_page, synth_page
+
+__all__ = ["ReplayServer", "day_rows", "kind_rows"]
+
+DEFAULT_PORT = 8765
+DEFAULT_DENSITY = 6     # 키·날짜당 평균 공시 수
+
+
+def _stable_hash(s: str) -> int:
+    """프로세스와 무관하게 같은 값 (str hash는 PYTHONHASHSEED에 따라 바뀜)"""
+    h = 0
+    for ch in s.encode():
+        h = (h * 131 + ch) % 1_000_000_007
+    return h
+
+
+@lru_cache(maxsize=65536)
+def day_rows(key: str, day: str, density: int = DEFAULT_DENSITY) -> Tuple[dict, ...]:
+    """키 하나의 하루치 합성 공시 (최신순). 같은 (키, 날짜)는 항상 같은 행."""
+    rnd = random.Random(f"{key}:{day}")
+    n = rnd.randint(0, 2 * density)
+    d = datetime.date.fromisoformat(day)
+    ymd = d.strftime("%Y%m%d")
+    # 키마다 100개씩 떨어진 번호대 → 실제 KIND처럼 문서번호 하나는 공시 하나 (키가 달라도 안 겹침, 하루 99건까지)
+    base = (_stable_hash(key) % 9000) * 100
+    out = []
+    for i in range(n):
+        minute = rnd.randrange(7 * 60, 19 * 60)
+        out.append({
+            "시간": f"{day} {minute // 60:02d}:{minute % 60:02d}",
+            "시장": rnd.choice(_MARKETS),
+            "플래그": [],
+            "회사명": f"리플레이{rnd.randint(1, 2500)}" + ("스팩" if rnd.random() < 0.01 else ""),
+            "종목코드": f"{rnd.randint(0, 99999):05d}",
+            "공시제목": rnd.choice(_TITLES),
+            "문서번호": f"{ymd}{base + i:06d}",
+            "제출인": rnd.choice(_SUBMITTERS),
+            "variant": base + i,    # 같은 공시는 어느 목록/페이지에 나와도 같은 모양
+        })
+    out.sort(key=lambda r: (r["시간"], r["문서번호"]), reverse=True)
+    return tuple(out)
+
+
+def kind_rows(keys: List[str], f: str, t: str, density: int = DEFAULT_DENSITY) -> List[dict]:
+    """[f, t] 구간의 키 여러 개 합집합 (최신순)"""
+    d0 = datetime.date.fromisoformat(f)
+    d1 = datetime.date.fromisoformat(t)
+    rows: List[dict] = []
+    for k in range((d1 - d0).days + 1):
+        day = (d1 - datetime.timedelta(days=k)).isoformat()
+        merged = [r for key in keys for r in day_rows(key, day, density)]
+        merged.sort(key=lambda r: (r["시간"], r["문서번호"]), reverse=True)
+        rows.extend(merged)
+    return rows
+
+
+def _krx_price(trdDd: str) -> dict:
+    rnd = random.Random(trdDd)
+    items = [{
+        "MKT_NM": rnd.choice(["KOSPI", "KOSDAQ", "KOSDAQ GLOBAL", "KONEX"]),
+        "ISU_CD": f"KR7{i:06d}000",
+        "ISU_SRT_CD": f"{i:06d}",
+        "ISU_ABBRV": f"리플레이{i}",
+        "MKTCAP": f"{rnd.randint(10**9, 10**13):,}",
+        "LIST_SHRS": f"{rnd.randint(10**6, 10**9):,}",
+        "TDD_CLSPRC": f"{rnd.randint(1000, 500000):,}",
+        "ACC_TRDVOL": f"{rnd.randint(0, 10**7):,}",
+    } for i in range(10, 2600, 1)]
+    return {"OutBlock_1": items, "CURRENT_DATETIME": f"{trdDd} 15:30:00"}
+
+
+def _krx_index(ind: str) -> dict:
+    rng = range(10, 2010, 10) if ind == "1" else range(15, 2265, 15)
+    return {"output": [{"ISU_SRT_CD": f"{i:06d}", "ISU_ABBRV": f"리플레이{i}"} for i in rng]}
+
+
+def _nxt(day: str) -> dict:
+    rnd = random.Random(f"nxt:{day}")
+    items = [{
+        "mktNm": "KOSPI" if i % 2 else "KOSDAQ",
+        "isuCd": f"KR7{i:06d}000",
+        "isuSrdCd": f"A{i:06d}",
+        "isuAbwdNm": f"리플레이{i}",
+        "curPrc": rnd.randint(1000, 500000),
+        "accTdQty": rnd.randint(0, 10**6),
+        "accTrval": rnd.randint(0, 10**10),
+        "cptrTrdPmsnCdNm": "KRX/NXT",
+        "trdIpsbRsn": rnd.choice(["", "", "", "투자경고/위험", "단기과열", "거래정지"]),
+    } for i in range(10, 2400, 3)]
+    return {"setTime": f"{day} 20:00", "brdinfoTimeList": items}
+
+
+class ReplayServer:
+    """
+    스레드로 도는 리플레이 서버. with 블록으로 쓰거나 start()/stop().
+    latency(초)+jitter 만큼 응답을 늦추고, p403/pblock 확률로 403 또는 200 차단 페이지를 돌려준다.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        p403: float = 0.0,
+        pblock: float = 0.0,
+        density: int = DEFAULT_DENSITY,
+        recorded: Optional[str] = None,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.p403 = p403
+        self.pblock = pblock
+        self.density = density
+        self.recorded = recorded
+        self._rnd = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> Dict[str, str]:
+        """fnc2/fnc가 이 서버를 보도록 하는 환경변수 (해당 모듈 import 전에 설정)"""
+        return {"KIND_BASE_URL": self.url, "KRX_BASE_URL": self.url, "NXT_BASE_URL": self.url}
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="replay", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats = {}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] = self.stats.get(name, 0) + 1
+
+    def _roll(self) -> float:
+        with self._lock:
+            return self._rnd.random()
+
+    def _recorded(self, key: str, f: str, t: str, page: str) -> Optional[str]:
+        if not self.recorded:
+            return None
+        path = os.path.join(self.recorded, re.sub(r"[^\w.-]", "_", key), f"{f}_{t}_{page}.html")
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as fh:
+            return fh.read()
+
+    def _kind(self, form: Dict[str, str]) -> Tuple[int, str]:
+        if self.p403 and self._roll() < self.p403:
+            self._count("kind_403")
+            return 403, "<html><body>Forbidden</body></html>"
+        if self.pblock and self._roll() < self.pblock:
+            self._count("kind_blocked")
+            return 200, synth_blocked_page()
+        key = form.get("reportCd") or form.get("reportNm") or form.get("disclosureType02", "")
+        f, t = form.get("fromDate", ""), form.get("toDate", "")
+        size, page = int(form.get("currentPageSize", "15")), int(form.get("pageIndex", "1"))
+        html = self._recorded(key, f, t, str(page))
+        if html is not None:
+            self._count("kind_recorded")
+            return 200, html
+        keys = [k for k in key.split("|") if k] or [key]
+        rows = kind_rows(keys, f, t, self.density)
+        start = (page - 1) * size
+        chunk = [{**r, "번호": str(len(rows) - start - i)} for i, r in enumerate(rows[start:start + size])]
+        return 200, synth_page(chunk, total=len(rows))
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):  # 요청 로그는 끔
+                pass
+
+            def _send(self, code: int, body: str, ctype: str = "text/html; charset=utf-8") -> None:
+                data = body.encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("Set-Cookie", "JSESSIONID=replay; Path=/")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _delay(self) -> None:
+                d = server.latency + (server.jitter * server._roll() if server.jitter else 0.0)
+                if d > 0:
+                    time.sleep(d)
+
+            def do_GET(self):
+                path = urlparse(self.path).path
+                if path == "/__stats":
+                    with server._lock:
+                        return self._send(200, json.dumps(server.stats), "application/json")
+                server._count("warmup")
+                self._send(200, "<html><body>replay</body></html>")
+
+            def do_POST(self):
+                path = urlparse(self.path).path
+                n = int(self.headers.get("Content-Length") or 0)
+                form = {k: v[0] for k, v in parse_qs(self.rfile.read(n).decode("utf-8"), keep_blank_values=True).items()}
+                if path == "/__reset":
+                    server.reset_stats()
+                    return self._send(200, "{}", "application/json")
+                self._delay()
+                if path.endswith("/disclosure/details.do"):
+                    server._count("kind")
+                    code, body = server._kind(form)
+                    return self._send(code, body)
+                if path.endswith("/getJsonData.cmd"):
+                    server._count("krx")
+                    if form.get("bld", "").endswith("MDCSTAT00601"):
+                        return self._send(200, json.dumps(_krx_index(form.get("indIdx", "1"))), "application/json")
+                    return self._send(200, json.dumps(_krx_price(form.get("trdDd", ""))), "application/json")
+                if path.endswith("/brdinfoTimeList.do"):
+                    server._count("nxt")
+                    return self._send(200, json.dumps(_nxt(form.get("scAggDd", ""))), "application/json")
+                self._send(404, "not found")
+
+        return Handler
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="KIND/KRX/NXT 리플레이 서버")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--latency", type=float, default=0.05, help="응답 지연(초)")
+    ap.add_argument("--jitter", type=float, default=0.0, help="추가 무작위 지연 상한(초)")
+    ap.add_argument("--p403", type=float, default=0.0, help="KIND 403 확률")
+    ap.add_argument("--pblock", type=float, default=0.0, help="KIND 200 차단 페이지 확률")
+    ap.add_argument("--density", type=int, default=DEFAULT_DENSITY, help="키·날짜당 평균 공시 수")
+    ap.add_argument("--recorded", default=None, help="녹화 응답 디렉터리")
+    args = ap.parse_args()
+
+    srv = ReplayServer(
+        args.host, args.port, latency=args.latency, jitter=args.jitter,
+        p403=args.p403, pblock=args.pblock, density=args.density, recorded=args.recorded,
+    )
+    print(f"replay server on {srv.url}")
+    for k, v in srv.env().items():
+        print(f"  export {k}={v}")
+    srv.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        srv.stop()
+
+
+if __name__ == "__main__":
+    main()
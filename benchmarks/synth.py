@@ -0,0 +1,143 @@
+# benchmarks/synth.py
+# KIND 상세검색 응답(details_sub) 모양의 합성 HTML/행 생성기
+from __future__ import annotations
+
+import datetime
+import random
+from html import escape
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["synth_rows", "synth_page", "synth_blocked_page", "synth_frames"]
+
+_MARKETS = ["코스피", "코스닥", "유가증권", "KONEX"]
+_FLAGS = ["관리종목", "투자주의환기종목", "불성실공시법인", "정리매매"]
+_TITLES = [
+    "투자경고종목지정",
+    "투자경고종목 지정해제 및 재지정 예고",
+    "매매거래정지 및 정지해제(투자경고종목 지정중)",
+    "(예고) 단기과열종목 지정 예고",
+    "단기과열완화장치 발동(매매거래정지 및 단일가매매 적용)",
+    "관리종목지정(감사의견 비적정)",
+    "기타시장안내 (상장폐지 관련)",
+    "투자주의환기종목 지정 & 해제",
+    "[정정] 매매거래정지 (우B)",
+]
+_SUBMITTERS = ["코스닥시장본부", "유가증권시장본부", "시장감시위원회"]
+
+
+def synth_rows(n: int, *, seed: int = 0, end: Optional[datetime.datetime] = None) -> List[dict]:
+    """최신순 합성 공시 n건. 시간/문서번호는 단조 감소."""
+    rnd = random.Random(seed)
+    end = end or datetime.datetime(2025, 7, 31, 18, 0)
+    out = []
+    ts = end
+    seq = 999999
+    for i in range(n):
+        ts -= datetime.timedelta(minutes=rnd.randint(0, 9))
+        seq -= rnd.randint(1, 5)
+        if seq < 1000:
+            seq = 999999
+        out.append({
+            "번호": str(n - i),
+            "시간": ts.strftime("%Y-%m-%d %H:%M"),
+            "시장": rnd.choice(_MARKETS),
+            "플래그": [f for f in _FLAGS if rnd.random() < 0.08],
+            "회사명": f"합성기업{rnd.randint(1, 3000)}" + ("스팩" if rnd.random() < 0.01 else ""),
+            "종목코드": f"{rnd.randint(0, 99999):05d}",
+            "공시제목": rnd.choice(_TITLES),
+            "문서번호": ts.strftime("%Y%m%d") + f"{seq:06d}",
+            "제출인": rnd.choice(_SUBMITTERS),
+        })
+    return out
+
+
+def _row_html(r: dict, *, variant: int) -> str:
+    icons = f'<img src="/images/common/icn_t_ko.gif" class="legend" alt="{escape(r["시장"])}" />'
+    icons += "".join(f'<img src="/images/common/icn_t_x.gif" class="legend" alt="{escape(f)}" />' for f in r["플래그"])
+    name = escape(r["회사명"])
+    if variant % 17 == 0:
+        # 회사 링크 없는 행
+        company = f"{icons}\n\t\t\t\t{name}&nbsp;"
+    else:
+        company = (
+            f'{icons}\n\t\t\t\t<a href="#viewer" id="companysum" '
+            f"onclick=\"companysummary_open('{r['종목코드']}');return false;\" "
+            f'title="{name}">{name}</a>'
+        )
+    title = escape(r["공시제목"])
+    extra = "<!-- 정정 표시 -->" if variant % 11 == 0 else ""
+    return (
+        "<tr>\n"
+        f'\t<td class="first txc">{r["번호"]}</td>\n'
+        f'\t<td class="txc">{r["시간"]}</td>\n'
+        f"\t<td>\n\t\t\t\t{company}\n\t\t\t</td>\n"
+        f"\t<td>\n\t\t\t\t<a href=\"#viewer\" onclick=\"openDisclsViewer('{r['문서번호']}','');return false;\" "
+        f'title="{title}">{title}</a>{extra}\n\t\t\t</td>\n'
+        f'\t<td class="txc">{escape(r["제출인"])}</td>\n'
+        "</tr>\n"
+    )
+
+
+def synth_page(rows: List[dict], *, total: Optional[int] = None) -> str:
+    """rows 로 KIND details_sub 응답 HTML 한 페이지 생성 (행에 variant가 있으면 위치 대신 그 값으로 모양을 고름)"""
+    body = "".join(_row_html(r, variant=r.get("variant", i)) for i, r in enumerate(rows))
+    return (
+        '<section class="scrarea type-00">\n'
+        '<div class="info type-00">'
+        f'<em>{total if total is not None else len(rows)}</em>건</div>\n'
+        '<table class="list type-00 mt10">\n'
+        "<colgroup><col width=\"5%\" /><col width=\"15%\" /><col /><col /><col width=\"15%\" /></colgroup>\n"
+        "<thead><tr><th>번호</th><th>시간</th><th>회사명</th><th>공시제목</th><th>제출인</th></tr></thead>\n"
+        f"<tbody>\n{body}</tbody>\n</table>\n"
+        '<script type="text/javascript">var pageIndex = 1;</script>\n'
+        "</section>\n"
+    )
+
+
+def synth_blocked_page() -> str:
+    """200 OK로 오지만 테이블이 없는 차단/점검 페이지"""
+    return "<html><head><title>KIND</title></head><body><p>일시적으로 서비스를 이용할 수 없습니다.</p></body></html>"
+
+
+def synth_frames(n: int, k: int, *, overlap: float = 0.05, seed: int = 0) -> List[pd.DataFrame]:
+    """
+    fetcher 결과 모양의 최신순 DataFrame k개 (총 약 n행). overlap 비율만큼은 다른 소스와 문서번호가 겹친다.
+    분 단위 시각이라 같은 시각(동률)이 흔한 실제 분포를 흉내 낸다. 대량 생성을 위해 numpy로 만든다.
+    """
+    rng = np.random.default_rng(seed)
+    end = np.datetime64("2025-07-31T18:00")
+    per = max(1, n // k)
+    frames = []
+    pool = []
+    for j in range(k):
+        minutes = np.sort(rng.integers(0, 60 * 24 * 365, per))
+        ts = end - minutes.astype("timedelta64[m]")
+        docno = np.char.add(
+            pd.DatetimeIndex(ts).strftime("%Y%m%d").to_numpy().astype(str),
+            np.char.zfill((rng.integers(0, 10**6, per)).astype(str), 6),
+        )
+        df = pd.DataFrame({
+            "번호": np.arange(per, 0, -1).astype(str),
+            "시간": pd.DatetimeIndex(ts).strftime("%Y-%m-%d %H:%M"),
+            "시장": rng.choice(_MARKETS, per),
+            "플래그": "",
+            "회사명": np.char.add("합성기업", rng.integers(1, 3000, per).astype(str)),
+            "종목코드": np.char.zfill(rng.integers(0, 99999, per).astype(str), 5),
+            "공시제목": rng.choice(_TITLES, per),
+            "문서번호": docno,
+            "뷰어URL": "",
+            "제출인": rng.choice(_SUBMITTERS, per),
+        })
+        if pool and overlap > 0:
+            # 앞 소스 행 일부를 그대로 복사(같은 문서번호) → 중복 제거 경로 검증
+            prev = pd.concat(pool, ignore_index=True)
+            dup = prev.sample(n=min(len(prev), int(per * overlap)), random_state=seed + j)
+            df = pd.concat([df, dup], ignore_index=True)
+            df = df.iloc[np.argsort(-pd.to_datetime(df["시간"]).to_numpy().view(np.int64), kind="stable")]
+            df = df.reset_index(drop=True)
+        pool.append(df)
+        frames.append(df)
+    return frames
@@ -0,0 +1,189 @@
+# cache.py
+# 프로세스 전역 메모리 캐시 (Streamlit 재실행과 무관하게 모듈 수준에서 유지)
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+__all__ = ["TTLCache", "ByteLRU", "SingleFlight"]
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    키별 만료 시각을 갖는 스레드 안전 캐시. ttl=None 이면 만료 없음.
+    maxsize를 주면 가장 오래 안 쓴(LRU) 항목부터 밀어낸다 (None이면 무제한).
+    menu2는 매 재실행마다 다시 실행되므로, 재실행을 넘어 살아야 하는 캐시는 이렇게 모듈에 둔다.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, maxsize: Optional[int] = None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            hit = self._data.get(key, _MISSING)
+            if hit is _MISSING:
+                return default
+            expires, value = hit
+            if expires is not None and time.monotonic() >= expires:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = _MISSING) -> None:  # type: ignore[assignment]
+        ttl = self.ttl if ttl is _MISSING else ttl
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class ByteLRU:
+    """
+    바이트 예산 LRU. 값 크기는 sizeof(value)로 넣을 때 한 번 재고, 합계가 max_bytes를 넘으면
+    가장 오래 안 쓴 항목부터 밀어낸다. 예산보다 큰 값 하나는 저장하지 않는다(rejected).
+    """
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[Any], int]):
+        self.max_bytes = int(max_bytes)
+        self.sizeof = sizeof
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, Tuple[int, Any]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = self.misses = 0
+        self.evictions = self.evicted_bytes = self.rejected = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            hit = self._data.get(key, _MISSING)
+            if hit is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._data.move_to_end(key)
+            return hit[1]
+
+    def put(self, key: Hashable, value: Any) -> bool:
+        """저장했으면 True, 예산보다 커서 버렸으면 False"""
+        size = int(self.sizeof(value))
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[0]
+            if size > self.max_bytes:
+                self.rejected += 1
+                return False
+            while self._data and self.bytes + size > self.max_bytes:
+                _, (n, _) = self._data.popitem(last=False)
+                self.bytes -= n
+                self.evictions += 1
+                self.evicted_bytes += n
+            self._data[key] = (size, value)
+            self.bytes += size
+            return True
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "items": len(self._data),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "evicted_bytes": self.evicted_bytes,
+                "rejected": self.rejected,
+            }
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    같은 키의 동시 호출을 하나로 합친다. 먼저 온 호출(리더)만 fn()을 실행하고,
+    실행 중에 들어온 같은 키 호출은 기다렸다가 같은 결과(또는 같은 예외)를 받는다.
+    끝난 호출은 기억하지 않으므로 결과 재사용은 앞단 캐시가 맡는다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.leaders = self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """(결과, 다른 호출의 결과를 공유했는지)"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.leaders += 1
+            else:
+                self.shared += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, True
+        try:
+            flight.value = fn()
+            return flight.value, False
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def inflight(self) -> int:
+        with self._lock:
+            return len(self._flights)
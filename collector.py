@@ -0,0 +1,139 @@
+# collector.py
+# KIND 공시 백그라운드 수집기 — 모든 소스를 주기적으로 받아 로컬 저장소에 쌓는다.
+"""
+사용법:
+    python -m collector                          # 60초마다 어제~오늘 수집
+    python -m collector --interval 30 --days 3
+    python -m collector --once                   # 한 번만 돌고 종료 (cron 용)
+
+앱(menu2)은 같은 저장소를 KIND_STORE_MAX_AGE 와 함께 열면, 수집기가 최근에 채운 날짜는
+저장소에서만 읽고(KIND 요청 없음) 수집기가 멈춰 오래된 경우에만 직접 받는다.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Sequence
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+import metrics
+from fnc2 import (
+    CODE_MAP,
+    kind_fetch,
+    kind_fetch_many,
+    fetch_investor_warning,
+    fetch_shortterm_overheat,
+    fetch_market_watch,
+    fetch_delist,
+    use_store,
+)
+from store import DEFAULT_STORE_PATH
+
+__all__ = ["SOURCES", "collect_once", "run"]
+
+KST = ZoneInfo("Asia/Seoul")
+log = logging.getLogger("collector")
+
+DEFAULT_INTERVAL = 60
+DEFAULT_DAYS = 2        # 오늘 + 어제 (자정 직후 한 번 더 받아 어제를 complete로 닫는다)
+
+
+def _cat(category: str) -> Callable[[str, str], pd.DataFrame]:
+    return lambda f, t: kind_fetch(category, f, t)
+
+
+# 모아보기가 한 번에 받는 cat 묶음 (menu2.MULTI_BATCH_CATS와 같아야 같은 저장소 소스 키를 채운다)
+MULTI_BATCH_CATS = ["mgmt", "alert", "misc"]
+
+# 수집 소스: 이름 → fetch(f, t). 앱 메뉴가 쓰는 저장소 소스 키를 모두 채운다.
+SOURCES: Dict[str, Callable[[str, str], pd.DataFrame]] = {
+    "cat_many": lambda f, t: kind_fetch_many(MULTI_BATCH_CATS, f, t),
+    **{f"cat_{c}": _cat(c) for c in CODE_MAP},
+    "mw":       fetch_market_watch,
+    "inv":      fetch_investor_warning,
+    "overheat": fetch_shortterm_overheat,
+    "delist":   fetch_delist,
+}
+
+
+def _window(days: int) -> tuple:
+    today = datetime.datetime.now(KST).date()
+    return (today - datetime.timedelta(days=max(1, days) - 1)).isoformat(), today.isoformat()
+
+
+def collect_once(days: int = DEFAULT_DAYS, sources: Optional[Sequence[str]] = None) -> Dict[str, object]:
+    """
+    최근 days일을 모든 소스에 대해 한 번 동기화. {소스: 행 수 또는 예외}.
+    소스 하나가 실패해도 나머지는 계속 진행한다.
+    """
+    f, t = _window(days)
+    names = list(sources or SOURCES)
+
+    def _one(name: str):
+        t0 = time.perf_counter()
+        try:
+            df = SOURCES[name](f, t)
+        except Exception as e:  # 다음 주기에 다시 시도
+            log.warning(f"🚫 {name} 수집 실패: {e}")
+            return e
+        log.info(f"✅ {name} {f}~{t} {len(df)}건 · {time.perf_counter() - t0:.1f}s")
+        return len(df)
+
+    with ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="collect") as ex:
+        return dict(zip(names, ex.map(_one, names)))
+
+
+def run(
+    interval: float = DEFAULT_INTERVAL,
+    days: int = DEFAULT_DAYS,
+    sources: Optional[Sequence[str]] = None,
+    *,
+    once: bool = False,
+    metrics_path: Optional[str] = None,
+) -> None:
+    """
+    interval(초)마다 collect_once. 한 주기가 interval보다 길면 바로 다음 주기를 시작한다.
+    metrics_path를 주면 주기마다 요청 계측을 Prometheus 텍스트로 덮어쓴다.
+    """
+    while True:
+        started = time.monotonic()
+        collect_once(days, sources)
+        if metrics_path:
+            metrics.write(metrics_path)
+        if once:
+            return
+        time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="KIND 공시 백그라운드 수집기")
+    ap.add_argument("--store", default=os.environ.get("KIND_STORE_PATH", DEFAULT_STORE_PATH),
+                    help="저장소 경로 (기본: $KIND_STORE_PATH 또는 %(default)s)")
+    ap.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="수집 주기(초)")
+    ap.add_argument("--days", type=int, default=DEFAULT_DAYS, help="매 주기 동기화할 최근 일수")
+    ap.add_argument("--source", action="append", choices=list(SOURCES),
+                    help="수집할 소스 (여러 번 지정 가능, 기본: 전체)")
+    ap.add_argument("--once", action="store_true", help="한 번만 수집하고 종료")
+    ap.add_argument("--metrics", default=None, metavar="FILE",
+                    help="주기마다 요청 계측을 Prometheus 텍스트 파일로 저장 (textfile collector)")
+    ap.add_argument("--metrics-log", action="store_true", help="요청/파싱 이벤트를 JSON 로그로 출력")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    logging.getLogger("metrics").setLevel(logging.INFO if args.metrics_log else logging.WARNING)
+    # 수집기는 열린 날짜를 항상 새로 받는다 (max_open_age=0)
+    use_store(args.store)
+    try:
+        run(args.interval, args.days, args.source, once=args.once, metrics_path=args.metrics)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,32 @@
+import datetime
+import os
+import time
 import requests
 import pandas as pd
 import logging
+from typing import Dict, NamedTuple, Optional
+from zoneinfo import ZoneInfo
+
+import metrics
+from cache import TTLCache
 
 logging.basicConfig(level=logging.WARNING, format="%(message)s")
 
+# 외부 엔드포인트. 리플레이 서버(benchmarks/replay_server.py) 등으로 돌릴 때 환경변수로 바꾼다
+KRX_BASE = os.environ.get("KRX_BASE_URL", "https://data.krx.co.kr").rstrip("/")
+NXT_BASE = os.environ.get("NXT_BASE_URL", "https://www.nextrade.co.kr").rstrip("/")
+
+
+def _post(source: str, report: str, url: str, **kw) -> requests.Response:
+    """requests.post + 요청 계측(metrics). 예외는 기록만 하고 그대로 올린다."""
+    return metrics.call(source, report, requests.post, url, **kw)
+
+
 def get_krx_market_price_info(trdDd: str):
     """KRX 전체 종목 시세 (시가총액, 거래량 등)"""
-    url = "http://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd"
+    url = f"{KRX_BASE}/comm/bldAttendant/getJsonData.cmd"
     headers = {
-        "Referer": "http://data.krx.co.kr/contents/MDC/MDI/mdiLoader/index.cmd?menuId=MDC0201020202",
+        "Referer": f"{KRX_BASE}/contents/MDC/MDI/mdiLoader/index.cmd?menuId=MDC0201020202",
         "User-Agent": "Mozilla/5.0"
     }
     payload = {
@@ -21,22 +39,24 @@ def get_krx_market_price_info(trdDd: str):
         "csvxls_isNo": "false"
     }
 
-    time = "N/A"
+    srv_time = "N/A"
     cols = ["시장구분", "표준코드", "단축코드", "종목명", "시가총액", "상장주식수", "KRX종가", "KRX거래량"]
 
     try:
-        resp = requests.post(url, headers=headers, data=payload, timeout=25)
+        # 지수 조회(get_krx_index)와 같은 호스트라 인증서 검증도 같게 (KRX_BASE 기본이 https)
+        resp = _post("krx", "MDCSTAT01501", url, headers=headers, data=payload, verify=False, timeout=25)
         resp.raise_for_status()
+        t0 = time.perf_counter()
         data = resp.json()
-        time = data.get("CURRENT_DATETIME", "N/A")
+        srv_time = data.get("CURRENT_DATETIME", "N/A")
         items = data.get("OutBlock_1", [])
     except Exception as e:
         logging.warning(f"🚫 KRX 요청 오류: {e}")
-        return time, pd.DataFrame(columns=cols)
+        return srv_time, pd.DataFrame(columns=cols)
 
     if not items:
         logging.warning("⚠️ KRX 응답 데이터 없음")
-        return time, pd.DataFrame(columns=cols)
+        return srv_time, pd.DataFrame(columns=cols)
 
     df = pd.DataFrame(items)
     df.rename(columns={
@@ -60,14 +80,15 @@ def get_krx_market_price_info(trdDd: str):
             df[col] = pd.to_numeric(df[col].astype(str).str.replace(",", "").str.strip(), errors="coerce").fillna(0)
 
     df.reset_index(drop=True, inplace=True)
-    return time, df
+    metrics.observe_parse("krx", "MDCSTAT01501", None, time.perf_counter() - t0, len(df))
+    return srv_time, df
 
 
 def get_krx_index(trdDd: str):
     """KOSPI200 / KOSDAQ150 구성종목"""
-    url = "https://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd"
+    url = f"{KRX_BASE}/comm/bldAttendant/getJsonData.cmd"
     headers = {
-        "Referer": "https://data.krx.co.kr/contents/MDC/MDI/mdiLoader/index.cmd?menuId=MDC0201010106",
+        "Referer": f"{KRX_BASE}/contents/MDC/MDI/mdiLoader/index.cmd?menuId=MDC0201010106",
         "User-Agent": "Mozilla/5.0"
     }
     payloads = [
@@ -85,14 +106,16 @@ def get_krx_index(trdDd: str):
             "csvxls_isNo": "false",
         })
         try:
-            r = requests.post(url, headers=headers, data=p, verify=False, timeout=15)
+            r = _post("krx", f"MDCSTAT00601:{p['indIdx2']}", url, headers=headers, data=p, verify=False, timeout=15)
             r.raise_for_status()
+            t0 = time.perf_counter()
             data = r.json().get("output", [])
             if data:
                 df = pd.DataFrame(data)[["ISU_SRT_CD", "ISU_ABBRV"]]
                 df.rename(columns={"ISU_SRT_CD": "단축코드", "ISU_ABBRV": "종목명"}, inplace=True)
                 df["지수구분"] = "K200" if p["indIdx"] == "1" else "Q150"
                 dfs.append(df)
+            metrics.observe_parse("krx", f"MDCSTAT00601:{p['indIdx2']}", None, time.perf_counter() - t0, len(data))
         except Exception as e:
             logging.warning(f"🚫 지수 조회 오류: {e}")
 
@@ -101,11 +124,11 @@ def get_krx_index(trdDd: str):
 
 def get_nextrade_filtered_symbols(trdDd: str):
     """넥스트레이드 등록 종목"""
-    url = "https://www.nextrade.co.kr/brdinfoTime/brdinfoTimeList.do"
+    url = f"{NXT_BASE}/brdinfoTime/brdinfoTimeList.do"
     headers = {
         "User-Agent": "Mozilla/5.0",
-        "Referer": "https://www.nextrade.co.kr/menu/transactionStatusMain/menuList.do",
-        "Origin": "https://www.nextrade.co.kr",
+        "Referer": f"{NXT_BASE}/menu/transactionStatusMain/menuList.do",
+        "Origin": NXT_BASE,
         "X-Requested-With": "XMLHttpRequest",
         "Content-Type": "application/x-www-form-urlencoded",
     }
@@ -118,19 +141,125 @@ def get_nextrade_filtered_symbols(trdDd: str):
     }
 
     try:
-        resp = requests.post(url, headers=headers, data=payload, verify=False, timeout=15)
+        resp = _post("nxt", "brdinfoTimeList", url, headers=headers, data=payload, verify=False, timeout=15)
         resp.encoding = "utf-8"
+        t0 = time.perf_counter()
         js = resp.json()
-        time = js.get("setTime", "N/A")
+        srv_time = js.get("setTime", "N/A")
         items = js.get("brdinfoTimeList", [])
         if not items:
-            return time, pd.DataFrame()
+            metrics.observe_parse("nxt", "brdinfoTimeList", None, time.perf_counter() - t0, 0)
+            return srv_time, pd.DataFrame()
         keep = ["mktNm", "isuCd", "isuSrdCd", "isuAbwdNm", "curPrc", "accTdQty", "accTrval", "cptrTrdPmsnCdNm", "trdIpsbRsn"]
         data = [{k: it.get(k, None) for k in keep} for it in items]
         df = pd.DataFrame(data)
         df.columns = ["시장구분", "표준코드", "단축코드", "종목명", "NXT현재가", "NXT거래량", "거래대금", "거래가능시장", "거래불가사유"]
         df["단축코드"] = df["단축코드"].str[1:]
-        return time, df
+        metrics.observe_parse("nxt", "brdinfoTimeList", None, time.perf_counter() - t0, len(df))
+        return srv_time, df
     except Exception as e:
         logging.warning(f"🚫 NXT 요청 오류: {e}")
         return "N/A", pd.DataFrame()
+
+
+# ─────────────────────────────────────────────────────────────
+# NXT 종목 캐시 (거래일 단위) — Streamlit 재실행마다 nextrade.co.kr에 다시 묻지 않도록
+# ─────────────────────────────────────────────────────────────
+NXT_CACHE_TTL = 300     # 당일 목록 유지 시간(초). 지난 거래일은 바뀌지 않으므로 만료 없음
+NXT_FAIL_TTL = 30       # 조회 실패(빈 목록)도 잠깐은 캐시해 재실행마다 재시도하지 않음
+NXT_SNAPSHOT_DIR = os.environ.get("NXT_SNAPSHOT_DIR", "")   # 비어 있으면 디스크 스냅샷 안 함
+NXT_CACHE_SIZE = 32     # 거래일 수. 지난 거래일은 만료가 없으므로 오래 안 본 날짜부터 밀어낸다
+
+_NXT_CACHE = TTLCache(maxsize=NXT_CACHE_SIZE)
+
+
+class NxtListing(NamedTuple):
+    """거래일 하나의 NXT 목록 + 필터/매핑에 쓰는 파생값 (한 번만 계산)"""
+    trade_date: str             # 응답의 setTime
+    df: pd.DataFrame
+    names: frozenset            # 종목명
+    codes: frozenset            # 단축코드 6자리
+    codes5: frozenset           # 단축코드 앞 5자리 (KIND 종목코드와 비교용)
+    reason_map: Dict[str, str]  # 종목명 → 비고(거래불가사유 축약)
+
+
+def _nxt_reason_short(s: pd.Series) -> pd.Series:
+    """거래불가사유 → 표 비고용 축약 (경/위, 과열, 정지)"""
+    return (
+        s.fillna("").astype(str)
+        .str.replace(r"투자\s*경고\s*/\s*위험", "경/위", regex=True)
+        .str.replace("투자경고/위험", "경/위", regex=False)
+        .str.replace("단기과열", "과열", regex=False)
+        .str.replace("거래정지", "정지", regex=False)
+    )
+
+
+def _nxt_listing(trade_date: str, df: Optional[pd.DataFrame]) -> NxtListing:
+    if df is None or df.empty or "종목명" not in df.columns:
+        return NxtListing(trade_date, pd.DataFrame(), frozenset(), frozenset(), frozenset(), {})
+    df = df.copy()
+    df["종목명"] = df["종목명"].astype(str)
+    if "거래불가사유" not in df.columns:
+        df["거래불가사유"] = ""
+    df["비고"] = _nxt_reason_short(df["거래불가사유"])
+    codes = df["단축코드"].astype(str) if "단축코드" in df.columns else pd.Series(dtype=str)
+    return NxtListing(
+        trade_date=trade_date,
+        df=df,
+        names=frozenset(df["종목명"]),
+        codes=frozenset(codes),
+        codes5=frozenset(codes.str[:5]),
+        reason_map=df.drop_duplicates("종목명").set_index("종목명")["비고"].to_dict(),
+    )
+
+
+def _nxt_snapshot_path(trdDd: str, snapshot_dir: str) -> str:
+    return os.path.join(snapshot_dir, f"nxt_{trdDd}.pkl")
+
+
+def _is_past(trdDd: str) -> bool:
+    return trdDd < datetime.datetime.now(ZoneInfo("Asia/Seoul")).strftime("%Y%m%d")
+
+
+def get_nxt_listing(trdDd: str, *, snapshot_dir: Optional[str] = None) -> NxtListing:
+    """
+    get_nextrade_filtered_symbols의 캐시 버전. 같은 거래일은 메모리(당일은 NXT_CACHE_TTL)에서,
+    snapshot_dir(기본 NXT_SNAPSHOT_DIR)이 있으면 프로세스 재시작 후에도 디스크 스냅샷에서 읽는다.
+    """
+    hit = _NXT_CACHE.get(trdDd)
+    if hit is not None:
+        return hit
+
+    past = _is_past(trdDd)
+    snapshot_dir = NXT_SNAPSHOT_DIR if snapshot_dir is None else snapshot_dir
+    path = _nxt_snapshot_path(trdDd, snapshot_dir) if snapshot_dir else ""
+    if path and os.path.exists(path) and (past or time.time() - os.path.getmtime(path) < NXT_CACHE_TTL):
+        try:
+            trade_date, df = pd.read_pickle(path)
+            listing = _nxt_listing(trade_date, df)
+            _NXT_CACHE.put(trdDd, listing, None if past else NXT_CACHE_TTL)
+            return listing
+        except Exception as e:
+            logging.warning(f"⚠️ NXT 스냅샷 읽기 실패({path}): {e}")
+
+    trade_date, df = get_nextrade_filtered_symbols(trdDd)
+    listing = _nxt_listing(trade_date, df)
+    if listing.df.empty:
+        _NXT_CACHE.put(trdDd, listing, NXT_FAIL_TTL)
+        return listing
+
+    _NXT_CACHE.put(trdDd, listing, None if past else NXT_CACHE_TTL)
+    if path:
+        try:
+            os.makedirs(snapshot_dir, exist_ok=True)
+            tmp = f"{path}.tmp"
+            pd.to_pickle((trade_date, df), tmp)
+            os.replace(tmp, path)
+        except Exception as e:
+            logging.warning(f"⚠️ NXT 스냅샷 저장 실패({path}): {e}")
+    return listing
+
+
+def clear_nxt_cache() -> None:
+    """메모리 캐시만 비움 (디스크 스냅샷은 유지)"""
+    _NXT_CACHE.clear()
@@ -2,21 +2,57 @@
 # 상장폐지 추가
 from __future__ import annotations
 
+import datetime
+import os
+import queue
 import re
 import time
-from typing import Optional, Dict, List, Tuple
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Dict, Iterator, List, NamedTuple, Sequence, Tuple, Union
+from zoneinfo import ZoneInfo
 
+import numpy as np
 import requests
 import pandas as pd
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+try:
+    from lxml import etree as _lxml_etree
+    from lxml import html as _lxml_html
+except ImportError:  # lxml이 없으면 BeautifulSoup 경로만 사용
+    _lxml_etree = _lxml_html = None
+
+import metrics
+from cache import SingleFlight, TTLCache
+from shared import SHARED_FILE, SharedCache, TokenBucket
+from store import DisclosureStore, DEFAULT_STORE_PATH
 
 __all__ = [
     "CODE_MAP",
     "kind_fetch",
+    "kind_fetch_many",
     "fetch_investor_warning",
     "fetch_shortterm_overheat",
     "fetch_market_watch",
     "fetch_delist",
+    "PageBatch",
+    "iter_kind_pages",
+    "iter_reportcd_pages",
+    "SOURCES",
+    "fetch_source",
+    "clear_source_cache",
+    "source_cache_stats",
+    "reset_session",
+    "use_store",
+    "use_shared",
+    "pacer_status",
+    "diagnose",
+    "merge_frames",
+    "TS_COL",
+    "with_ts",
 ]
 
 # ─────────────────────────────────────────────────────────────
@@ -39,7 +75,25 @@ CODE_MAP: Dict[str, str] = {
     "misc":  "0305",  # 기타 시장안내
 }
 
-KIND_URL = "https://kind.krx.co.kr/disclosure/details.do"
+# 리플레이 서버(benchmarks/replay_server.py) 등으로 돌릴 때 KIND_BASE_URL로 바꾼다 (뷰어 링크는 그대로 실제 KIND)
+KIND_BASE = os.environ.get("KIND_BASE_URL", "https://kind.krx.co.kr").rstrip("/")
+KIND_URL = f"{KIND_BASE}/disclosure/details.do"
+KIND_MAIN_URL = f"{KIND_BASE}/main.do"
+WARMUP_TIMEOUT = 20
+
+# 전역 동시 요청 상한 (스레드풀 크기와 무관하게 실제로 날아가는 POST 수)
+MAX_INFLIGHT = 6
+_INFLIGHT = threading.BoundedSemaphore(MAX_INFLIGHT)
+
+# 적응형 페이싱 (초)
+PACE_FLOOR = 0.05         # 평상시 요청 간격
+PACE_FIRST = 2.0          # 첫 저항(403/429/503/비정상 테이블) 감지 시 간격
+PACE_CEILING = 30.0       # 간격 상한
+PACE_RECOVER_AFTER = 4    # 연속 성공 N회마다 간격 절반
+
+# 재시도 (시도 횟수 기준) / 저항 신호로 보는 HTTP 상태
+KIND_RETRIES = 4
+RETRY_STATUS = frozenset({403, 429, 503})
 
 # ─────────────────────────────────────────────────────────────
 # 유틸
@@ -54,6 +108,14 @@ def _date_to_str(d: str | pd.Timestamp) -> str:
     return s
 
 
+# 파싱 경로: "lxml"(기본, 설치되어 있을 때) / "bs4"(BeautifulSoup html.parser)
+HTML_PARSER = "lxml"
+
+_MARKET_KEYWORDS = frozenset({"코스피", "코스닥", "KOSPI", "KOSDAQ", "유가증권", "KONEX"})
+_RE_COMPANY_CODE = re.compile(r"companysummary_open\('(\d+)'\)")
+_RE_DOCNO = re.compile(r"openDisclsViewer\('(\d+)'")
+
+
 def _extract_company_cell(company_td) -> Tuple[str, List[str], str, str]:
     """
     회사명 셀에서 시장/플래그/회사명/종목코드 추출
@@ -62,12 +124,11 @@ def _extract_company_cell(company_td) -> Tuple[str, List[str], str, str]:
     flags: List[str] = []
 
     icons = company_td.select("img.legend[alt]")
-    market_keywords = {"코스피", "코스닥", "KOSPI", "KOSDAQ", "유가증권", "KONEX"}
     for img in icons:
         alt = (img.get("alt") or "").strip()
         if not alt:
             continue
-        if not market and alt in market_keywords:
+        if not market and alt in _MARKET_KEYWORDS:
             market = alt
         else:
             flags.append(alt)
@@ -80,18 +141,15 @@ def _extract_company_cell(company_td) -> Tuple[str, List[str], str, str]:
 
     code_num = ""
     if comp_a and comp_a.has_attr("onclick"):
-        m = re.search(r"companysummary_open\('(\d+)'\)", comp_a["onclick"])
+        m = _RE_COMPANY_CODE.search(comp_a["onclick"])
         if m:
             code_num = m.group(1)
 
     return market, flags, company_name, code_num
 
 
-def _parse_rows_html(html: str) -> List[List[str]]:
-    """
-    상세검색 테이블 파싱 → 행 배열
-    반환: [번호, 시간, 시장, 플래그, 회사명, 종목코드, 공시제목, 문서번호, 뷰어URL, 제출인]
-    """
+def _parse_rows_bs4(html: str) -> List[List[str]]:
+    """BeautifulSoup(html.parser) 경로"""
     soup = BeautifulSoup(html, "html.parser")
     table = soup.find("table", class_="list type-00 mt10")
     if not table or not table.tbody:
@@ -118,7 +176,7 @@ def _parse_rows_html(html: str) -> List[List[str]]:
 
         docno = ""
         if a and a.has_attr("onclick"):
-            m = re.search(r"openDisclsViewer\('(\d+)'", a["onclick"])
+            m = _RE_DOCNO.search(a["onclick"])
             if m:
                 docno = m.group(1)
 
@@ -130,19 +188,171 @@ def _parse_rows_html(html: str) -> List[List[str]]:
     return out
 
 
+def _lx_text(el) -> str:
+    """BeautifulSoup get_text(strip=True)와 같은 규칙: 텍스트 조각마다 strip 후 빈 조각 제외"""
+    return "".join(p for p in (x.strip() for x in el.itertext()) if p)
+
+
+def _lx_first(el, tag: str, pred):
+    for e in el.iter(tag):
+        if pred(e):
+            return e
+    return None
+
+
+def _parse_rows_lxml(html: str) -> List[List[str]]:
+    """lxml 경로. 셀 단위 규칙은 _parse_rows_bs4와 1:1로 맞춘다."""
+    doc = _lxml_html.document_fromstring(html)
+    tables = doc.xpath('//table[normalize-space(@class)="list type-00 mt10"]')
+    if not tables:
+        return []
+    table = tables[0]
+    tbody = next(table.iter("tbody"), None)
+    if tbody is None:
+        return []
+    # get_text는 주석/스크립트/스타일 문자열을 빼므로 같은 기준으로 미리 제거
+    _lxml_etree.strip_elements(tbody, "script", "style", "template", with_tail=False)
+    out: List[List[str]] = []
+
+    for tr in tbody.iter("tr"):
+        tds = list(tr.iter("td"))
+        if len(tds) < 5:
+            continue
+
+        no = _lx_text(tds[0])
+        ts = _lx_text(tds[1])
+
+        company_td = tds[2]
+        market = ""
+        flags: List[str] = []
+        for img in company_td.iter("img"):
+            if img.get("alt") is None or "legend" not in (img.get("class") or "").split():
+                continue
+            alt = img.get("alt").strip()
+            if not alt:
+                continue
+            if not market and alt in _MARKET_KEYWORDS:
+                market = alt
+            else:
+                flags.append(alt)
+
+        comp_a = _lx_first(company_td, "a", lambda e: e.get("id") == "companysum")
+        company_name = (
+            (comp_a.get("title") or _lx_text(comp_a)).strip()
+            if comp_a is not None else _lx_text(company_td)
+        )
+        code_num = ""
+        if comp_a is not None and comp_a.get("onclick") is not None:
+            m = _RE_COMPANY_CODE.search(comp_a.get("onclick"))
+            if m:
+                code_num = m.group(1)
+
+        title_td = tds[3]
+        a = _lx_first(title_td, "a", lambda e: e.get("onclick") is not None)
+        title = (
+            (a.get("title") or _lx_text(title_td)).strip()
+            if a is not None else _lx_text(title_td)
+        )
+
+        docno = ""
+        if a is not None:
+            m = _RE_DOCNO.search(a.get("onclick"))
+            if m:
+                docno = m.group(1)
+
+        viewer = f"{VIEWER_BASE.format(docno=docno)}#{title}" if docno else ""
+        submitter = _lx_text(tds[4])
+
+        out.append([no, ts, market, ",".join(flags), company_name, code_num, title, docno, viewer, submitter])
+
+    return out
+
+
+def _parse_rows_html(html: str) -> List[List[str]]:
+    """
+    상세검색 테이블 파싱 → 행 배열
+    반환: [번호, 시간, 시장, 플래그, 회사명, 종목코드, 공시제목, 문서번호, 뷰어URL, 제출인]
+    lxml이 있으면 컴파일드 파서로, 없거나 문서를 못 읽으면 BeautifulSoup으로 파싱한다(결과 동일).
+    """
+    if HTML_PARSER == "lxml" and _lxml_html is not None:
+        try:
+            return _parse_rows_lxml(html)
+        except (ValueError, _lxml_etree.ParserError):
+            pass
+    return _parse_rows_bs4(html)
+
+
+# ─────────────────────────────────────────────────────────────
+# 병합 엔진: 최신순으로 정렬된 소스 여럿 → 문서번호 중복 제거 + 최신순 하나
+# ─────────────────────────────────────────────────────────────
+TIME_FORMAT = "%Y-%m-%d %H:%M"
+KST = ZoneInfo("Asia/Seoul")
+# fetcher가 표시용 시간 문자열 옆에 붙이는 타입 있는 시각 컬럼 (datetime64[ns, Asia/Seoul])
+TS_COL = "시간_dt"
+TS_DTYPE = pd.DatetimeTZDtype("ns", KST)
+_NAT = np.iinfo(np.int64).min
+
+
+def _parse_time(s: pd.Series) -> pd.Series:
+    """'YYYY-MM-DD HH:MM'(KST) 문자열 → datetime64[ns, Asia/Seoul]. 형식 고정 경로 우선, 못 읽으면 NaT."""
+    try:
+        ts = pd.to_datetime(s, format=TIME_FORMAT, errors="raise")
+    except (ValueError, TypeError):
+        ts = pd.to_datetime(s, errors="coerce")
+    return ts.astype("datetime64[ns]").dt.tz_localize(KST)
+
+
+def with_ts(df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """TS_COL이 없으면 시간 문자열을 한 번 파싱해 붙인다 (이미 있으면 그대로)."""
+    if df is None or df.empty or TS_COL in df.columns or "시간" not in df.columns:
+        return df
+    return df.assign(**{TS_COL: _parse_time(df["시간"])})
+
+
+def _ts_ns(df: pd.DataFrame) -> np.ndarray:
+    """행별 시각 int64 ns (못 읽으면 _NAT). TS_COL이 있으면 그대로 쓰고, 빈 칸만 시간 문자열에서 채운다."""
+    if TS_COL in df.columns:
+        ns = df[TS_COL].astype(TS_DTYPE).array.asi8.copy()
+        missing = ns == _NAT
+        if missing.any():
+            ns[missing] = _parse_time(df["시간"][missing]).array.asi8
+        return ns
+    return _parse_time(df["시간"]).array.asi8
+
+
+def merge_frames(frames: Sequence[Optional[pd.DataFrame]], *, key: str = "문서번호") -> pd.DataFrame:
+    """
+    최신순 소스 여럿을 하나로: concat → drop_duplicates(key, keep="first") → 시간 내림차순 정렬과 같은 결과.
+    - 중복 제거는 소스 순서 기준 해시 한 번 (앞 소스 우선)
+    - 정렬은 int64 시각에 대한 안정 정렬 한 번. 각 소스가 이미 최신순 run이므로 timsort가
+      run들을 선형 병합한다(사실상 k-way merge). 같은 시각은 소스 순서 → 소스 안 순서를 유지한다.
+    - 시각을 못 읽은 행은 맨 뒤 (pandas sort_values의 na_position="last"와 같음)
+    """
+    frames = [df for df in frames if df is not None and not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True, sort=False)
+    df = df.reset_index(drop=True)
+
+    keep = ~df[key].duplicated(keep="first").to_numpy() if key in df.columns else np.ones(len(df), dtype=bool)
+    if "시간" not in df.columns:
+        return df[keep].reset_index(drop=True)
+
+    ns = _ts_ns(df)
+    idx = np.flatnonzero(keep)
+    neg = np.where(ns[idx] == _NAT, np.iinfo(np.int64).max, -ns[idx])
+    order = idx[np.argsort(neg, kind="stable")]
+    if len(order) == len(df) and (order[1:] > order[:-1]).all():
+        return df   # 이미 최신순 + 중복 없음
+    return df.take(order).reset_index(drop=True)
+
+
 def _make_df(rows: List[List[str]]) -> pd.DataFrame:
     """rows → DF, 문서번호 중복 제거 + 시간 내림차순 + 스팩 제외"""
     if not rows:
         return pd.DataFrame()
-    df = pd.DataFrame(
-        rows,
-        columns=["번호","시간","시장","플래그","회사명","종목코드","공시제목","문서번호","뷰어URL","제출인"]
-    )
-    if "문서번호" in df.columns:
-        df = df.drop_duplicates(subset=["문서번호"], keep="first")
-    if "시간" in df.columns:
-        df["__ts"] = pd.to_datetime(df["시간"], errors="coerce")
-        df = df.sort_values("__ts", ascending=False).drop(columns="__ts")
+    df = pd.DataFrame(rows, columns=ROW_COLS)
+    df = merge_frames([with_ts(df)])
     if "회사명" in df.columns:
         df["회사명"] = df["회사명"].astype(str)
         df = df[~df["회사명"].str.contains("스팩", na=False)]
@@ -154,56 +364,525 @@ def _looks_like_valid_kind_table(html: str) -> bool:
     return ('table class="list type-00 mt10"' in html) or ("list type-00 mt10" in html)
 
 
+# since 마커: 문서번호(acptno, 접수 순으로 증가) 또는 시간('YYYY-MM-DD HH:MM')
+Cursor = Tuple[str, str]
+
+
+def _cursor(since) -> Optional[Cursor]:
+    """since → ('docno', '20250731000123') / ('ts', '2025-07-31 17:50') / None"""
+    if since is None or since == "":
+        return None
+    if isinstance(since, (pd.Timestamp, datetime.datetime)):
+        return ("ts", since.strftime("%Y-%m-%d %H:%M"))
+    s = str(since).strip()
+    if re.fullmatch(r"\d{10,}", s):
+        return ("docno", s)
+    return ("ts", s[:16])
+
+
+def _reached(row: List[str], cur: Cursor) -> bool:
+    """파싱된 행이 마커와 같거나 더 오래됐는지 (row: _parse_rows_html 한 행)"""
+    kind, v = cur
+    if kind == "docno":
+        d = row[7]
+        return bool(d) and (len(d), d) <= (len(v), v)
+    return row[1][:16] <= v
+
+
+def _drop_reached(df: pd.DataFrame, cur: Optional[Cursor]) -> pd.DataFrame:
+    """DataFrame에서 마커 이전(포함) 행 제거"""
+    if cur is None or df.empty:
+        return df
+    kind, v = cur
+    if kind == "docno":
+        d = df["문서번호"].astype(str)
+        keep = (d == "") | (d.str.len() > len(v)) | ((d.str.len() == len(v)) & (d > v))
+    else:
+        keep = df["시간"].astype(str).str[:16] > v
+    return df[keep].reset_index(drop=True)
+
+
+# 날짜 샤드: 긴 기간을 day/week 구간으로 나눠 구간별 페이지네이션 체인을 동시에 돌린다
+SHARD_DAYS = {"day": 1, "week": 7}
+
+
+def _shards(f: str, t: str, shard: Optional[str]) -> List[Tuple[str, str]]:
+    """[f, t] → 최신 구간부터 [(from, to), ...]. shard가 None이면 [(f, t)]"""
+    if not shard:
+        return [(f, t)]
+    if shard not in SHARD_DAYS:
+        raise ValueError(f"shard는 {list(SHARD_DAYS)} 중 하나여야 합니다: {shard!r}")
+    step = datetime.timedelta(days=SHARD_DAYS[shard])
+    one = datetime.timedelta(days=1)
+    d0 = datetime.date.fromisoformat(f)
+    end = datetime.date.fromisoformat(t)
+    out: List[Tuple[str, str]] = []
+    while end >= d0:
+        start = max(d0, end - step + one)
+        out.append((start.isoformat(), end.isoformat()))
+        end = start - one
+    return out
+
+
+def _shards_after(shards: List[Tuple[str, str]], cur: Optional[Cursor]) -> List[Tuple[str, str]]:
+    """since 마커보다 전부 오래된 샤드는 요청할 필요가 없으므로 제외"""
+    if cur is None:
+        return shards
+    kind, v = cur
+    if kind == "docno":
+        # 문서번호 앞 8자리는 접수일. 게시 시각과 하루 어긋날 수 있어 하루 여유를 둔다
+        if not re.fullmatch(r"\d{8}", v[:8]):
+            return shards
+        day = (datetime.datetime.strptime(v[:8], "%Y%m%d").date() - datetime.timedelta(days=1)).isoformat()
+    else:
+        day = v[:10]
+    return [(sf, st) for sf, st in shards if st >= day]
+
+
+def _pmap(fn, items: list, *, max_workers: int = MAX_INFLIGHT, name: str = "kind"):
+    """items를 스레드 풀로 fn 처리, 결과는 items 순서. max_workers<=1 또는 항목 1개면 직렬."""
+    workers = min(max(int(max_workers), 1), len(items))
+    if workers <= 1:
+        return [fn(it) for it in items]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name) as ex:
+        futures = [ex.submit(fn, it) for it in items]
+        try:
+            return [fu.result() for fu in futures]
+        except BaseException:
+            for fu in futures:
+                fu.cancel()
+            raise
+
+
 # ─────────────────────────────────────────────────────────────
-# 공통 상세검색 (카테고리 1~4/6)
+# 전역 세션 (커넥션 풀 + 1회 워밍업 + 세대 기반 재생성)
 # ─────────────────────────────────────────────────────────────
-def _kind_disclosure_search(
-    from_date: str,
-    to_date: str,
-    code: str,
+_SESSION: Optional[requests.Session] = None
+_SESSION_GEN = 0
+_SESSION_LOCK = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    """세션 생성 + GET 워밍업 (메인 → 상세검색 Referer 체인으로 JSESSIONID 확보)"""
+    s = requests.Session()
+    s.headers.update({"User-Agent": UA, "Accept": "text/html, */*; q=0.01"})
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=MAX_INFLIGHT)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    try:
+        metrics.call("kind", "warmup:loadInitPage", s.get,
+                     KIND_MAIN_URL, params={"method": "loadInitPage"}, timeout=WARMUP_TIMEOUT, verify=False)
+        metrics.call(
+            "kind", "warmup:searchDetailsMain", s.get,
+            KIND_URL, params={"method": "searchDetailsMain"},
+            headers={"Referer": f"{KIND_MAIN_URL}?method=loadInitPage"},
+            timeout=WARMUP_TIMEOUT, verify=False,
+        )
+    except requests.RequestException:
+        # 워밍업 실패는 여기서 올리지 않는다. 실제 POST가 재시도/판정을 맡는다.
+        pass
+    return s
+
+
+def get_session(stale_gen: Optional[int] = None) -> Tuple[requests.Session, int]:
+    """
+    (세션, 세대) 반환. stale_gen이 현재 세대와 같을 때만 새로 만든다.
+    여러 스레드가 같은 세대에서 동시에 403을 맞아도 첫 스레드만 재생성하고,
+    나머지는 이미 바뀐 세대를 보고 새 세션을 그대로 쓴다.
+    """
+    global _SESSION, _SESSION_GEN
+    with _SESSION_LOCK:
+        if _SESSION is None or (stale_gen is not None and stale_gen == _SESSION_GEN):
+            # 이전 세션은 다른 스레드가 아직 쓰고 있을 수 있어 닫지 않고 참조만 버린다
+            _SESSION = _build_session()
+            _SESSION_GEN += 1
+        return _SESSION, _SESSION_GEN
+
+
+def reset_session() -> None:
+    """전역 세션 파기 (강제 새로조회/초기화용). 다음 요청에서 워밍업부터 다시 한다."""
+    global _SESSION
+    with _SESSION_LOCK:
+        # get_session과 같은 이유로 닫지 않는다 — 다른 스레드가 진행 중인 요청을 끝낼 수 있게 참조만 버린다
+        _SESSION = None
+
+
+# ─────────────────────────────────────────────────────────────
+# 요청 페이싱 + 재시도
+# ─────────────────────────────────────────────────────────────
+class _Pacer:
+    """
+    적응형 요청 간격 조절 (스레드 안전).
+    정상일 때는 PACE_FLOOR 간격으로 거의 쉬지 않고, 저항이 감지되면 PACE_FIRST부터
+    2배씩 PACE_CEILING까지 늘린다. 연속 성공 PACE_RECOVER_AFTER회마다 절반으로 줄이며,
+    PACE_FIRST 아래로 내려가면 바로 PACE_FLOOR로 복귀한다.
+    """
+
+    def __init__(
+        self,
+        floor: float = PACE_FLOOR,
+        first: float = PACE_FIRST,
+        ceiling: float = PACE_CEILING,
+        recover_after: int = PACE_RECOVER_AFTER,
+    ):
+        self.floor = floor
+        self.first = first
+        self.ceiling = ceiling
+        self.recover_after = recover_after
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """간격·예약 슬롯·연속 성공·누적 카운터를 처음 상태로 (floor/first/ceiling 설정은 유지)"""
+        with self._lock:
+            self._next_at = 0.0
+            self.delay = self.floor
+            self.ok_streak = 0
+            self.n_ok = 0
+            self.n_fail = 0
+            self.n_backoff = 0
+            self.n_recover = 0
+            self.waited = 0.0
+
+    def reserve(self) -> float:
+        """다음 요청 슬롯을 예약하고 그때까지 남은 시간(초)을 반환 (대기는 호출 측: time.sleep / asyncio.sleep)"""
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next_at)
+            self._next_at = at + self.delay
+            if at > now:
+                self.waited += at - now
+        return at - now
+
+    def wait(self) -> None:
+        """다음 요청 슬롯까지 대기. 슬롯 예약만 락 안에서 하고 sleep은 락 밖에서 한다."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def ok(self) -> None:
+        with self._lock:
+            self.n_ok += 1
+            self.ok_streak += 1
+            if self.delay > self.floor and self.ok_streak >= self.recover_after:
+                half = self.delay / 2
+                self.delay = half if half >= self.first else self.floor
+                self.ok_streak = 0
+                self.n_recover += 1
+
+    def fail(self) -> None:
+        with self._lock:
+            self.n_fail += 1
+            self.n_backoff += 1
+            self.ok_streak = 0
+            self.delay = self.first if self.delay < self.first else min(self.ceiling, self.delay * 2)
+            # 이미 예약된 슬롯도 새 간격만큼 뒤로 민다
+            self._next_at = max(self._next_at, time.monotonic() + self.delay)
+
+    def status(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "delay": round(self.delay, 3),
+                "ok_streak": self.ok_streak,
+                "degraded": self.delay > self.floor,
+                "ok": self.n_ok,
+                "fail": self.n_fail,
+                "backoff": self.n_backoff,
+                "recover": self.n_recover,
+                "waited_sec": round(self.waited, 3),
+            }
+
+
+_PACER = _Pacer()
+
+
+def _warn_sleep(sleep: Optional[float]) -> None:
+    """예전 고정 대기(sleep) 인자는 _PACER가 대신하므로 값은 쓰지 않는다. 넘기면 DeprecationWarning."""
+    if sleep is not None:
+        warnings.warn(
+            "sleep 인자는 무시됩니다 (요청 간격은 fnc2._PACER가 조절). 다음 버전에서 제거됩니다.",
+            DeprecationWarning, stacklevel=3,
+        )
+
+
+def pacer_status() -> Dict[str, float]:
+    """현재 지연 상태 {delay, ok_streak, degraded, ok, fail, backoff, recover, waited_sec}"""
+    return _PACER.status()
+
+
+def _kind_report(data: Dict[str, object]) -> str:
+    """요청 payload → 계측용 report 라벨 (reportCd > 공시유형 코드 > 보고서명)"""
+    return str(
+        data.get("reportCd")
+        or str(data.get("disclosureType02") or "").rstrip("|")
+        or data.get("reportNm")
+        or ""
+    )
+
+
+def _kind_page(data: Dict[str, object]) -> Optional[int]:
+    try:
+        return int(data.get("pageIndex"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_page(html: str, report: str, page: int) -> List[List[str]]:
+    """_parse_rows_html + 파싱 시간/행 수 계측"""
+    t0 = time.perf_counter()
+    rows = _parse_rows_html(html)
+    metrics.observe_parse("kind", report, page, time.perf_counter() - t0, len(rows))
+    return rows
+
+
+def _post_kind(
+    data: Dict[str, object],
     *,
-    page_size: int = 100,
-    max_pages: int = 1000,
-    sleep: float = 5,
+    label: str,
+    headers: Optional[Dict[str, str]] = None,
     timeout: int = 300,
-    verify_ssl: bool = False,
+    detect_encoding: bool = False,
     session: Optional[requests.Session] = None,
-    report_nm: Optional[str] = None,
-    report_cd: Optional[str] = None,
-) -> pd.DataFrame:
+) -> str:
     """
-    KIND 상세검색(카테고리) 페이지네이션 수집.
-    반환 컬럼:
-    [페이지, 번호, 시간, 시장, 플래그, 회사명, 종목코드, 공시제목, 문서번호, 뷰어URL, 제출인]
+    세마포어 + 페이싱 + 재시도가 적용된 KIND POST → 정상 테이블 HTML.
+    403/429/503, 네트워크 오류, 비정상 테이블은 페이서에 알리고 KIND_RETRIES회까지 재시도한다.
+    403/비정상 테이블이면 세션 오염으로 보고 전역 세션을 (세대당 한 번만) 재생성한다.
+    session을 직접 넘기면 그 세션만 쓰고 재생성하지 않는다.
+    """
+    if session is not None:
+        s, gen = session, None
+    else:
+        s, gen = get_session()
+    report, page = _kind_report(data), _kind_page(data)
+
+    last_err = ""
+    for _attempt in range(KIND_RETRIES):
+        w0 = time.perf_counter()
+        _PACER.wait()
+        budget = _BUDGET    # use_shared가 도중에 바꿔도 None 확인과 같은 객체를 쓴다
+        if budget is not None:
+            budget.acquire()
+        metrics.observe_wait("kind", time.perf_counter() - w0)
+        t0 = time.perf_counter()
+        try:
+            with _INFLIGHT:
+                r = s.post(KIND_URL, data=data, headers=headers, timeout=timeout, verify=False)
+        except requests.RequestException as e:
+            _PACER.fail()
+            last_err = f"{type(e).__name__}: {e}"
+            metrics.observe_request("kind", report, page, "error", seconds=time.perf_counter() - t0, error=last_err)
+            continue
+
+        sec = time.perf_counter() - t0
+        obs = dict(seconds=sec, nbytes=len(r.content), server_seconds=r.elapsed.total_seconds())
+        if r.status_code in RETRY_STATUS:
+            _PACER.fail()
+            last_err = f"HTTP {r.status_code}"
+            metrics.observe_request("kind", report, page, str(r.status_code), **obs)
+            if r.status_code == 403 and gen is not None:
+                s, gen = get_session(stale_gen=gen)
+            continue
+        if r.status_code >= 400:
+            metrics.observe_request("kind", report, page, str(r.status_code), **obs)
+        r.raise_for_status()
+        if detect_encoding:
+            r.encoding = r.apparent_encoding
+        html = r.text
+
+        # ✅ 200 OK 차단/오류 HTML도 여기서 걸러서 "캐싱"을 방지
+        if not _looks_like_valid_kind_table(html):
+            _PACER.fail()
+            snippet = re.sub(r"\s+", " ", html)[:300]
+            last_err = f"{label} 응답이 정상 테이블이 아님(차단/오류 가능). 응답 일부: {snippet}"
+            metrics.observe_request("kind", report, page, "blocked", **obs)
+            if gen is not None:
+                s, gen = get_session(stale_gen=gen)
+            continue
+
+        _PACER.ok()
+        metrics.observe_request("kind", report, page, str(r.status_code), **obs)
+        return html
+
+    raise RuntimeError(f"{label} 요청 실패(재시도 {KIND_RETRIES}회). 마지막 오류: {last_err}")
+
+
+def diagnose(timeout: int = 15) -> Dict[str, object]:
+    """
+    어느 단계에서 차단되는지 점검. 전역 세션/페이서와 무관한 일회용 세션을 쓴다.
+    각 단계는 HTTP 상태코드(또는 예외 문자열)를 담는다. 요청은 report="diagnose:단계"로 계측된다.
     """
-    BASE = "https://kind.krx.co.kr"
-    GET_URL = f"{BASE}/disclosure/details.do"
-    POST_URL = f"{BASE}/disclosure/details.do"
+    out: Dict[str, object] = {}
+    with requests.Session() as s:
+        s.headers.update({"User-Agent": UA, "Accept": "text/html, */*; q=0.01"})
+
+        def _step(name: str, send, *args, source: str = "kind", **kw) -> Optional[requests.Response]:
+            try:
+                r = metrics.call(source, f"diagnose:{name}", send, *args, **kw)
+                out[name] = r.status_code
+                return r
+            except requests.RequestException as e:
+                out[name] = f"{type(e).__name__}: {e}"
+                return None
+
+        _step("main_get", s.get, KIND_MAIN_URL, params={"method": "loadInitPage"}, timeout=timeout, verify=False)
+        _step("details_get", s.get, KIND_URL, params={"method": "searchDetailsMain"}, timeout=timeout, verify=False)
+        today = time.strftime("%Y-%m-%d")
+        r = _step(
+            "details_post", s.post, KIND_URL, data=_warn_payload(TARGET_OVERHEAT, today, today, 15, 1),
+            headers=HEADERS_MENU_WARN, timeout=timeout, verify=False,
+        )
+        out["details_table"] = bool(r is not None and _looks_like_valid_kind_table(r.text))
+        out["cookies"] = sorted(s.cookies.keys())
+        _step(
+            "data_krx_get", s.get, "https://data.krx.co.kr/contents/MDC/MDI/mdiLoader/index.cmd",
+            source="krx", timeout=timeout, verify=False,
+        )
+    return out
+
+
+# ─────────────────────────────────────────────────────────────
+# 로컬 저장소 (선택) — 이미 동기화된 (소스, 날짜)는 디스크에서 읽는다
+# ─────────────────────────────────────────────────────────────
+_STORE: Optional[DisclosureStore] = None
+# 열린 날짜(당일 등)를 이 시간(초) 안에 누군가(collector 등) 동기화했으면 KIND를 다시 부르지 않는다
+_STORE_MAX_AGE = 0.0
+
 
+def use_store(
+    path: Optional[str] = DEFAULT_STORE_PATH,
+    *,
+    max_open_age: float = 0.0,
+) -> Optional[DisclosureStore]:
+    """
+    공시 로컬 저장소 연결. path가 None/빈 문자열이면 해제.
+    연결되어 있으면 공개 fetcher는 커버리지에 빈 구간만 KIND에서 받아 저장한 뒤 저장소에서 읽는다.
+    max_open_age(초) > 0 이면 그 안에 동기화된 열린 날짜는 저장소만 읽는다 (collector와 함께 쓸 때).
+    """
+    global _STORE, _STORE_MAX_AGE
+    if _STORE is not None and (not path or _STORE.path != path):
+        _STORE.close()
+        _STORE = None
+    if path and _STORE is None:
+        _STORE = DisclosureStore(path)
+    _STORE_MAX_AGE = max(0.0, float(max_open_age))
+    return _STORE
+
+
+def _through_store(
+    source: str,
+    from_date: str,
+    to_date: str,
+    fetch,
+    *,
+    since=None,
+    with_page: bool = False,
+    force: bool = False,
+) -> pd.DataFrame:
+    """
+    fetch(f, t, since, info) → DataFrame 를 저장소 경유로 실행 (저장소가 없으면 그대로 호출).
+    결과에는 TS_COL(타입 있는 시각)이 붙는다.
+    전에 동기화한 열린 날짜를 다시 받을 때는 store.cursor()를 since로 넘겨
+    마지막 동기화 이후 페이지만 받는다.
+    force면 커버리지와 무관하게 [from, to] 전체를 다시 받아 그 구간의 행과 커버리지를 새로 쓴다.
+    fetch가 info["truncated"]를 세우면(체인이 max_pages에서 끊김) 행만 저장하고 커버리지는 기록하지 않는다.
+    """
     f = _date_to_str(from_date)
     t = _date_to_str(to_date)
+    store = _STORE
+    if store is None:
+        return with_ts(fetch(f, t, since, {}))
+
+    started_at = time.time()
+    spans = [(f, t)] if force else store.gaps(source, f, t, max_open_age=_STORE_MAX_AGE)
+    for gf, gt in spans:
+        info: dict = {}
+        df = fetch(gf, gt, None if force else store.cursor(source, gf, gt), info)
+        store.put(source, df, gf, gt, started_at=started_at, replace=force, cover=not info.get("truncated"))
+    return with_ts(_drop_reached(store.read(source, f, t, with_page=with_page), _cursor(since)))
+
 
-    base_headers = {"User-Agent": UA, "Accept": "text/html, */*; q=0.01"}
-    ajax_headers = {
-        **base_headers,
+# ─────────────────────────────────────────────────────────────
+# 레플리카 공유 (선택) — 공유 볼륨의 SQLite 하나로 결과 캐시 + KIND 요청 예산
+# ─────────────────────────────────────────────────────────────
+SHARED_RATE = 4.0     # 모든 레플리카 합산 초당 KIND 요청 수
+SHARED_BURST = 8      # 순간 허용량
+_SHARED: Optional[SharedCache] = None
+_BUDGET: Optional[TokenBucket] = None
+
+
+def use_shared(
+    directory: Optional[str],
+    *,
+    rate: float = SHARED_RATE,
+    burst: float = SHARED_BURST,
+) -> Optional[SharedCache]:
+    """
+    공유 디렉터리 연결. directory가 None/빈 문자열이면 해제.
+    연결되어 있으면 fetch_source 결과를 레플리카끼리 SOURCE_TTL 동안 나눠 쓰고,
+    모든 KIND POST(재시도 포함)가 rate/burst 토큰 버킷을 거친다 (_PACER 간격과 별개로 추가 적용).
+    """
+    global _SHARED, _BUDGET
+    path = os.path.join(directory, SHARED_FILE) if directory else None
+    # menu2는 재실행마다 호출하므로 같은 경로면 연결을 유지한다 (속도만 바뀌면 같은 버킷을 제자리에서 조정)
+    if _SHARED is not None and _SHARED.path == path:
+        if (_BUDGET.rate, _BUDGET.burst) != (float(rate), float(burst)):
+            _BUDGET.configure(rate, burst)
+        return _SHARED
+    # 바꾸거나 해제할 때는 참조만 끊는다. _post_kind/fetch_source가 잡아 둔 객체가 있을 수 있으므로
+    # 직접 close하지 않고, 마지막 참조가 사라질 때 SQLite 연결이 함께 닫히게 둔다 (get_session과 같은 이유)
+    _SHARED = _BUDGET = None
+    if path:
+        _SHARED = SharedCache(path)
+        _BUDGET = TokenBucket(path, rate, burst)
+    return _SHARED
+
+
+# ─────────────────────────────────────────────────────────────
+# 공통 상세검색 (카테고리 1~4/6)
+# ─────────────────────────────────────────────────────────────
+CatCodes = Union[str, Sequence[str]]
+
+
+def _cat_codes(code: CatCodes) -> List[str]:
+    return [code] if isinstance(code, str) else list(code)
+
+
+def _cat_headers(code: CatCodes) -> Dict[str, str]:
+    code = _cat_codes(code)[0]
+    return {
+        "User-Agent": UA,
+        "Accept": "text/html, */*; q=0.01",
         "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-        "Origin": "https://kind.krx.co.kr",
-        "Referer": f"{GET_URL}?method=searchDetailsMain&disclosureType=02&disTypevalue={code}",
+        "Origin": KIND_BASE,
+        "Referer": f"{KIND_URL}?method=searchDetailsMain&disclosureType=02&disTypevalue={code}",
         "X-Requested-With": "XMLHttpRequest",
     }
 
-    warm_params = {"method": "searchDetailsMain", "disclosureType": "02", "disTypevalue": code}
 
-    data = {
+def _cat_payload(
+    code: CatCodes,
+    f: str,
+    t: str,
+    page_size: int,
+    page: int,
+    *,
+    report_nm: Optional[str] = None,
+    report_cd: Optional[str] = None,
+) -> Dict[str, object]:
+    """code가 여러 개면 상세검색 폼처럼 파이프 목록 + disclosureTypeArr02 반복 필드로 보낸다."""
+    codes = _cat_codes(code)
+    piped = "".join(f"{c}|" for c in codes)
+    return {
         "method": "searchDetailsSub",
         "currentPageSize": str(page_size),
-        "pageIndex": "1",
+        "pageIndex": str(page),
         "orderMode": "1",
         "orderStat": "D",
         "forward": "details_sub",
-        "disclosureType02": f"{code}|",
-        "pDisclosureType02": f"{code}|",
-        "disclosureTypeArr02": code,
+        "disclosureType02": piped,
+        "pDisclosureType02": piped,
+        "disclosureTypeArr02": codes[0] if len(codes) == 1 else codes,
         "fromDate": f,
         "toDate": t,
         "reportNm": report_nm or "",
@@ -224,52 +903,101 @@ def _kind_disclosure_search(
         "enterprise": "",
     }
 
-    cols = ["페이지","번호","시간","시장","플래그","회사명","종목코드","공시제목","문서번호","뷰어URL","제출인"]
-    rows: List[List[str]] = []
 
-    close_after = False
-    s = session
-    if s is None:
-        s = requests.Session()
-        close_after = True
-
-    try:
-        s.headers.update(base_headers)
-        s.get(GET_URL, params=warm_params, timeout=timeout, verify=False)
-
-        for page in range(1, max_pages + 1):
-            data["pageIndex"] = str(page)
-            r = s.post(POST_URL, data=data, headers=ajax_headers, timeout=timeout, verify=False)
-            r.raise_for_status()
-            r.encoding = r.apparent_encoding
-            html = r.text
-
-            # ✅ 200 OK 차단/오류 HTML도 여기서 걸러서 "캐싱"을 방지
-            if not _looks_like_valid_kind_table(html):
-                snippet = re.sub(r"\s+", " ", html)[:300]
-                raise RuntimeError(f"KIND 응답이 정상 테이블이 아님(차단/오류 가능). 응답 일부: {snippet}")
+def _kind_disclosure_search(
+    from_date: str,
+    to_date: str,
+    code: CatCodes,
+    *,
+    page_size: int = 100,
+    max_pages: int = 1000,
+    sleep: Optional[float] = None,
+    timeout: int = 300,
+    verify_ssl: bool = False,
+    session: Optional[requests.Session] = None,
+    report_nm: Optional[str] = None,
+    report_cd: Optional[str] = None,
+    since=None,
+    shard: Optional[str] = None,
+    max_workers: int = MAX_INFLIGHT,
+    info: Optional[dict] = None,
+) -> pd.DataFrame:
+    """
+    KIND 상세검색(카테고리) 페이지네이션 수집. 페이지 간 대기는 _Pacer가 전담
+    (sleep은 하위호환용, 넘기면 DeprecationWarning만 내고 무시).
+    session을 넘기지 않으면 워밍업이 끝난 전역 세션을 쓴다.
+    code에 카테고리 코드 목록을 주면 한 번의 페이지네이션으로 함께 받는다.
+    since(문서번호 또는 시간)를 주면 그 마커 이후 공시만 받고, 마커가 보이는 페이지에서 멈춘다.
+    shard("day"/"week")를 주면 기간을 나눠 구간별 체인을 동시에 돌리고 최신 구간부터 이어붙인다
+    (페이지 컬럼은 구간 안의 페이지 번호).
+    info(dict)를 넘기면 체인이 max_pages에서 끊겼을 때 info["truncated"] = True.
+    반환 컬럼:
+    [페이지, 번호, 시간, 시장, 플래그, 회사명, 종목코드, 공시제목, 문서번호, 뷰어URL, 제출인]
+    """
+    _warn_sleep(sleep)
+    batches = _collect(_iter_search_pages(
+        from_date, to_date, code,
+        page_size=page_size, max_pages=max_pages, timeout=timeout, session=session,
+        report_nm=report_nm, report_cd=report_cd, since=since, shard=shard, max_workers=max_workers,
+    ))
+    _note_truncated(info, batches, page_size, max_pages)
+    df = _cat_frame([[b.page] + row for b in batches for row in b.rows])
+    if shard:
+        # 구간 경계에 걸친 공시는 양쪽 구간에 나올 수 있다
+        dup = df["문서번호"].astype(str).ne("") & df.duplicated(subset=["문서번호"], keep="first")
+        df = df[~dup].reset_index(drop=True)
+    return df
 
-            added = 0
-            for row in _parse_rows_html(html):
-                rows.append([page] + row)
-                added += 1
 
-            if added == 0 or added < int(page_size):
-                break
-            if sleep:
-                time.sleep(sleep)
+ROW_COLS = ["번호","시간","시장","플래그","회사명","종목코드","공시제목","문서번호","뷰어URL","제출인"]
+CAT_COLS = ["페이지"] + ROW_COLS
 
-    finally:
-        if close_after:
-            s.close()
 
-    df = pd.DataFrame(rows, columns=cols)
+def _cat_frame(rows: List[List[str]]) -> pd.DataFrame:
+    """[페이지]+행 목록 → DataFrame (스팩 제외, 순서 유지)"""
+    df = pd.DataFrame(rows, columns=CAT_COLS)
     if not df.empty and "회사명" in df.columns:
         df["회사명"] = df["회사명"].astype(str)
         df = df[~df["회사명"].str.contains("스팩", na=False)]
     return df.reset_index(drop=True)
 
 
+def _iter_cat_pages(
+    f: str,
+    t: str,
+    code: CatCodes,
+    *,
+    page_size: int = 100,
+    max_pages: int = 1000,
+    timeout: int = 300,
+    session: Optional[requests.Session] = None,
+    report_nm: Optional[str] = None,
+    report_cd: Optional[str] = None,
+    since=None,
+    start_page: int = 1,
+) -> Iterator[Tuple[int, List[List[str]], bool]]:
+    """
+    상세검색(카테고리) 페이지를 하나씩 받아 (페이지, 마커 이후 행, 마지막 페이지 여부)를 낸다.
+    start_page로 중간 페이지부터 이어 받을 수 있다 (backfill 재개용).
+    """
+    headers = _cat_headers(code)
+    cur = _cursor(since)
+    for page in range(start_page, max_pages + 1):
+        data = _cat_payload(code, f, t, page_size, page, report_nm=report_nm, report_cd=report_cd)
+        html = _post_kind(
+            data, label=f"KIND [{'|'.join(_cat_codes(code))}]", headers=headers,
+            timeout=timeout, detect_encoding=True, session=session,
+        )
+
+        page_rows = _parse_page(html, _kind_report(data), page)
+        fresh = page_rows if cur is None else [r for r in page_rows if not _reached(r, cur)]
+        added = len(page_rows)
+        last = added == 0 or added < int(page_size) or len(fresh) < added or page == max_pages
+        yield page, fresh, last
+        if last:
+            return
+
+
 def kind_fetch(
     category: str,
     from_date: str,
@@ -279,15 +1007,57 @@ def kind_fetch(
     *,
     report_nm: Optional[str] = None,
     report_cd: Optional[str] = None,
+    since=None,
+    shard: Optional[str] = None,
+    force: bool = False,
 ) -> pd.DataFrame:
-    """cat 기반(기존): halt/mgmt/alert/misc"""
+    """
+    cat 기반(기존): halt/mgmt/alert/misc. since: 이 문서번호/시간 이후 공시만, shard: "day"/"week" 분할 병렬.
+    force: 저장소 커버리지를 무시하고 다시 받아 덮어씀 (저장소가 없으면 영향 없음)
+    """
     code = CODE_MAP[category]
-    df = _kind_disclosure_search(
-        from_date, to_date, code,
-        page_size=page_size, max_pages=max_pages,
-        report_nm=report_nm, report_cd=report_cd
-    )
-    return df.reset_index(drop=True) if df is not None and not df.empty else pd.DataFrame()
+    source = f"cat:{code}"
+    if report_nm or report_cd:
+        source += f":{report_nm or ''}:{report_cd or ''}"
+
+    def _fetch(f: str, t: str, since, info: dict) -> pd.DataFrame:
+        df = _kind_disclosure_search(
+            f, t, code,
+            page_size=page_size, max_pages=max_pages,
+            report_nm=report_nm, report_cd=report_cd, since=since, shard=shard, info=info,
+        )
+        return df.reset_index(drop=True) if df is not None and not df.empty else pd.DataFrame()
+
+    return _through_store(source, from_date, to_date, _fetch, since=since, with_page=True, force=force)
+
+
+def kind_fetch_many(
+    categories: Sequence[str],
+    from_date: str,
+    to_date: str,
+    page_size: int = 100,
+    max_pages: int = 1000,
+    *,
+    since=None,
+    shard: Optional[str] = None,
+    force: bool = False,
+) -> pd.DataFrame:
+    """
+    cat 여러 개(halt/mgmt/alert/misc)를 한 번의 페이지네이션으로 수집.
+    KIND 목록에는 행마다 분류가 없고 제목으로도 되돌릴 수 없으므로, 카테고리별 처리가 필요한
+    조회(예: halt의 거래정지 제목 필터)는 kind_fetch로 따로 받아야 한다.
+    """
+    cats = sorted(set(categories), key=list(CODE_MAP).index)
+    codes = [CODE_MAP[c] for c in cats]
+    source = "cat:" + "|".join(sorted(codes))
+
+    def _fetch(f: str, t: str, since, info: dict) -> pd.DataFrame:
+        df = _kind_disclosure_search(
+            f, t, codes, page_size=page_size, max_pages=max_pages, since=since, shard=shard, info=info,
+        )
+        return df.reset_index(drop=True) if df is not None and not df.empty else pd.DataFrame()
+
+    return _through_store(source, from_date, to_date, _fetch, since=since, with_page=True, force=force)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -297,8 +1067,8 @@ HEADERS_MENU_WARN = {
     "User-Agent": UA,
     "Accept": "text/html, */*; q=0.01",
     "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-    "Origin": "https://kind.krx.co.kr",
-    "Referer": "https://kind.krx.co.kr/disclosure/details.do?method=searchDetailsMain",
+    "Origin": KIND_BASE,
+    "Referer": f"{KIND_URL}?method=searchDetailsMain",
     "X-Requested-With": "XMLHttpRequest",
 }
 BASE_PAYLOAD_WARN = {
@@ -391,6 +1161,9 @@ TARGETS_MARKET_WATCH: List[Tuple[str,str,str,str]] = [
      "장애종목 매매거래재개 시장안내 (코스닥시장 / 시간외종가매매 호가접수시간대 재개)", "장애종목 매매거래재개 시장안내 (코스닥시장 / 시간외종가매매 호가접수시간대 재개)"),
 ]
 
+# 단기과열: reportCd 없이 제목(reportNm)만으로 조회
+TARGET_OVERHEAT: Tuple[str,str,str,str] = ("단기과열", "", "단기과열", "")
+
 # ─────────────────────────────────────────────────────────────
 # ✅ 상장폐지 reportCd 세트 (유가증권 68051 / 코스닥 70769)
 # ─────────────────────────────────────────────────────────────
@@ -400,117 +1173,315 @@ TARGETS_DELIST: List[Tuple[str,str,str,str]] = [
 ]
 
 
-def _fetch_reportcd_with_warn_payload(
+def _warn_payload(
+    target: Tuple[str,str,str,str],
+    f: str,
+    t: str,
+    page_size: int,
+    page: int,
+) -> Dict[str, str]:
+    nm, cd, nm_temp, nm_pop = target
+    return {
+        **BASE_PAYLOAD_WARN,
+        "currentPageSize": str(page_size),
+        "pageIndex": str(page),
+        "fromDate": f,
+        "toDate": t,
+        "reportNm": nm,
+        "reportCd": cd,
+        "reportNmTemp": nm_temp,
+        "reportNmPop": nm_pop,
+    }
+
+
+def _iter_target_pages(
+    f: str,
+    t: str,
+    target: Tuple[str,str,str,str],
+    *,
+    page_size: int = 100,
+    max_pages: int = 1000,
+    since=None,
+    start_page: int = 1,
+) -> Iterator[Tuple[int, List[List[str]], bool]]:
+    """reportCd 하나의 페이지를 하나씩 받아 (페이지, 마커 이후 행, 마지막 페이지 여부)를 낸다."""
+    nm, cd = target[0], target[1]
+    label = f"KIND(warn payload) [{cd}] {nm}" if cd else f"KIND({nm})"
+    cur = _cursor(since)
+    for page in range(start_page, max_pages + 1):
+        payload = _warn_payload(target, f, t, page_size, page)
+        html = _post_kind(payload, label=label, headers=HEADERS_MENU_WARN)
+
+        page_rows = _parse_page(html, _kind_report(payload), page)
+        fresh = page_rows if cur is None else [r for r in page_rows if not _reached(r, cur)]
+        added = len(page_rows)
+        last = added == 0 or added < int(page_size) or len(fresh) < added or page == max_pages
+        yield page, fresh, last
+        if last:
+            return
+
+
+# ─────────────────────────────────────────────────────────────
+# 페이지 스트리밍 — 체인(대상 × 날짜 구간)들의 페이지를 받는 즉시 하나씩 낸다
+# ─────────────────────────────────────────────────────────────
+class PageBatch(NamedTuple):
+    """
+    iter_kind_pages / iter_reportcd_pages가 내는 페이지 하나.
+    rows는 ROW_COLS 순서의 문자열 행이고 since 마커 이후 행만 담는다 (스팩 제외·중복 제거·정렬 전 원본).
+    """
+    chain: int          # 체인 번호: 대상 순서 → 최신 구간 순서. (chain, page)로 정렬하면 직렬 수집 순서
+    key: str            # 카테고리 코드(파이프 연결) 또는 reportCd(없으면 보고서명)
+    from_date: str      # 이 체인의 조회 구간
+    to_date: str
+    page: int
+    rows: List[List[str]]
+    last: bool          # 이 체인의 마지막 페이지
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.rows, columns=ROW_COLS)
+
+
+Chain = Tuple[str, str, str, Callable[[], Iterator[Tuple[int, List[List[str]], bool]]]]
+_CHAIN_DONE = object()
+
+
+def _iter_chains(chains: List[Chain], *, max_workers: int, name: str) -> Iterator[PageBatch]:
+    """
+    (key, f, t, 페이지 이터레이터 팩토리) 체인들을 동시에 돌리며 도착 순서대로 PageBatch를 낸다.
+    큐 크기를 워커 수의 두 배로 묶어 소비자가 느리면 수집도 따라 멈춘다 (메모리는 페이지 몇 개분).
+    소비자가 도중에 멈추면(break/close) 남은 체인은 다음 페이지 전에 그만두고, 체인 예외는 소비자에게 그대로 올라간다.
+    """
+    workers = min(max(int(max_workers), 1), len(chains))
+    if workers <= 1:
+        for i, (key, f, t, pages) in enumerate(chains):
+            for page, rows, last in pages():
+                yield PageBatch(i, key, f, t, page, rows, last)
+        return
+
+    q: "queue.Queue" = queue.Queue(maxsize=2 * workers)
+    stop = threading.Event()
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(i: int) -> None:
+        key, f, t, pages = chains[i]
+        try:
+            for page, rows, last in pages():
+                if not _put(PageBatch(i, key, f, t, page, rows, last)) or stop.is_set():
+                    return
+        except BaseException as e:
+            _put(e)
+        finally:
+            _put(_CHAIN_DONE)
+
+    ex = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+    try:
+        for i in range(len(chains)):
+            ex.submit(_run, i)
+        remaining = len(chains)
+        while remaining:
+            item = q.get()
+            if item is _CHAIN_DONE:
+                remaining -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
+        ex.shutdown(wait=True, cancel_futures=True)
+
+
+def _collect(batches: Iterator[PageBatch]) -> List[PageBatch]:
+    """도착 순서와 무관하게 직렬 수집과 같은 순서로 (체인 안 페이지는 이미 순서대로 온다)"""
+    return sorted(batches, key=lambda b: b.chain)
+
+
+def _note_truncated(info: Optional[dict], batches: Sequence[PageBatch], page_size: int, max_pages: int) -> None:
+    """체인 하나라도 꽉 찬 max_pages 페이지에서 끝났으면(뒤에 더 있을 수 있음) info["truncated"] = True"""
+    if info is not None and any(b.last and b.page >= max_pages and len(b.rows) >= int(page_size) for b in batches):
+        info["truncated"] = True
+
+
+def _iter_search_pages(
     from_date: str,
     to_date: str,
-    targets: List[Tuple[str,str,str,str]],
+    code: CatCodes,
     *,
     page_size: int = 100,
     max_pages: int = 1000,
-    sleep: float = 5,
-) -> pd.DataFrame:
+    timeout: int = 300,
+    session: Optional[requests.Session] = None,
+    report_nm: Optional[str] = None,
+    report_cd: Optional[str] = None,
+    since=None,
+    shard: Optional[str] = None,
+    max_workers: int = MAX_INFLIGHT,
+) -> Iterator[PageBatch]:
+    """상세검색(카테고리 코드) 체인들 → PageBatch. shard면 구간마다 체인 하나."""
     f = _date_to_str(from_date)
     t = _date_to_str(to_date)
+    parts = _shards_after(_shards(f, t, shard), _cursor(since)) if shard else [(f, t)]
+    key = "|".join(_cat_codes(code))
 
-    rows: List[List[str]] = []
-    with requests.Session() as s:
-        s.headers.update(HEADERS_MENU_WARN)
-
-        for nm, cd, nm_temp, nm_pop in targets:
-            for page in range(1, max_pages + 1):
-                payload = {
-                    **BASE_PAYLOAD_WARN,
-                    "currentPageSize": str(page_size),
-                    "pageIndex": str(page),
-                    "fromDate": f,
-                    "toDate": t,
-                    "reportNm": nm,
-                    "reportCd": cd,
-                    "reportNmTemp": nm_temp,
-                    "reportNmPop": nm_pop,
-                }
-                r = s.post(KIND_URL, data=payload, timeout=300, verify=False)
-                r.raise_for_status()
-                html = r.text
-
-                # ✅ 200 OK 차단/오류 HTML도 여기서 걸러서 "캐싱"을 방지
-                if not _looks_like_valid_kind_table(html):
-                    snippet = re.sub(r"\s+", " ", html)[:300]
-                    raise RuntimeError(f"KIND(warn payload) 응답이 정상 테이블이 아님(차단/오류 가능). 응답 일부: {snippet}")
-
-                before = len(rows)
-                rows += _parse_rows_html(html)
-                added = len(rows) - before
-
-                if added == 0 or added < int(page_size):
-                    break
-                if sleep:
-                    time.sleep(sleep)
-
-    return _make_df(rows)
+    def _chain(sf: str, st: str) -> Chain:
+        return key, sf, st, lambda: _iter_cat_pages(
+            sf, st, code, page_size=page_size, max_pages=max_pages, timeout=timeout, session=session,
+            report_nm=report_nm, report_cd=report_cd, since=since,
+        )
 
+    return _iter_chains([_chain(sf, st) for sf, st in parts], max_workers=max_workers, name="kind-shard")
 
-def fetch_investor_warning(
+
+def iter_kind_pages(
+    categories: Union[str, Sequence[str]],
     from_date: str,
     to_date: str,
-    *,
     page_size: int = 100,
     max_pages: int = 1000,
-    sleep: float = 5,
-) -> pd.DataFrame:
-    """투자경고·위험: 여러 reportCd × 페이지네이션 전체 수집 → 문서번호 중복 제거."""
-    return _fetch_reportcd_with_warn_payload(
-        from_date, to_date, TARGETS_WARN,
-        page_size=page_size, max_pages=max_pages, sleep=sleep
+    *,
+    report_nm: Optional[str] = None,
+    report_cd: Optional[str] = None,
+    since=None,
+    shard: Optional[str] = None,
+    max_workers: int = MAX_INFLIGHT,
+) -> Iterator[PageBatch]:
+    """
+    cat 기반(halt/mgmt/alert/misc, 여러 개면 한 번의 페이지네이션) 페이지를 받는 즉시 PageBatch로 낸다.
+    kind_fetch/kind_fetch_many와 달리 저장소·소스 캐시를 거치지 않고 KIND에서 바로 받는다.
+    """
+    cats = [categories] if isinstance(categories, str) else sorted(set(categories), key=list(CODE_MAP).index)
+    codes = [CODE_MAP[c] for c in cats]
+    return _iter_search_pages(
+        from_date, to_date, codes[0] if len(codes) == 1 else codes,
+        page_size=page_size, max_pages=max_pages,
+        report_nm=report_nm, report_cd=report_cd, since=since, shard=shard, max_workers=max_workers,
     )
 
 
-def fetch_shortterm_overheat(
+# iter_reportcd_pages에 이름으로 넘길 수 있는 reportCd 목록
+REPORTCD_TARGETS: Dict[str, List[Tuple[str,str,str,str]]] = {
+    "inv":      TARGETS_WARN,
+    "overheat": [TARGET_OVERHEAT],
+    "mw":       TARGETS_MARKET_WATCH,
+    "delist":   TARGETS_DELIST,
+}
+
+
+def iter_reportcd_pages(
+    targets: Union[str, Sequence[Tuple[str,str,str,str]]],
     from_date: str,
     to_date: str,
     *,
     page_size: int = 100,
     max_pages: int = 1000,
-    sleep: float = 5,
-) -> pd.DataFrame:
-    """단기과열: reportNm='단기과열' 단일 조건 페이지네이션 수집."""
+    since=None,
+    shard: Optional[str] = None,
+    max_workers: int = MAX_INFLIGHT,
+) -> Iterator[PageBatch]:
+    """
+    reportCd(warn 페이로드) 페이지를 받는 즉시 PageBatch로 낸다. targets는 목록 또는 REPORTCD_TARGETS 이름.
+    (reportCd, 날짜 구간)마다 체인 하나이고 체인끼리는 동시에 돈다. 저장소·소스 캐시는 거치지 않는다.
+    """
+    if isinstance(targets, str):
+        targets = REPORTCD_TARGETS[targets]
     f = _date_to_str(from_date)
     t = _date_to_str(to_date)
+    parts = _shards_after(_shards(f, t, shard), _cursor(since))
 
-    rows: List[List[str]] = []
-    with requests.Session() as s:
-        s.headers.update(HEADERS_MENU_WARN)
-
-        for page in range(1, max_pages + 1):
-            payload = {
-                **BASE_PAYLOAD_WARN,
-                "currentPageSize": str(page_size),
-                "pageIndex": str(page),
-                "fromDate": f,
-                "toDate": t,
-                "reportNm": "단기과열",
-                "reportCd": "",
-                "reportNmTemp": "단기과열",
-                "reportNmPop": "",
-            }
-            r = s.post(KIND_URL, data=payload, timeout=300, verify=False)
-            r.raise_for_status()
-            html = r.text
+    def _chain(target: Tuple[str,str,str,str], sf: str, st: str) -> Chain:
+        return target[1] or target[0], sf, st, lambda: _iter_target_pages(
+            sf, st, target, page_size=page_size, max_pages=max_pages, since=since,
+        )
+
+    return _iter_chains(
+        [_chain(target, sf, st) for target in targets for sf, st in parts],
+        max_workers=max_workers, name="kind-rcd",
+    )
 
-            if not _looks_like_valid_kind_table(html):
-                snippet = re.sub(r"\s+", " ", html)[:300]
-                raise RuntimeError(f"KIND(단기과열) 응답이 정상 테이블이 아님(차단/오류 가능). 응답 일부: {snippet}")
 
-            before = len(rows)
-            rows += _parse_rows_html(html)
-            added = len(rows) - before
+def _fetch_reportcd_with_warn_payload(
+    from_date: str,
+    to_date: str,
+    targets: List[Tuple[str,str,str,str]],
+    *,
+    page_size: int = 100,
+    max_pages: int = 1000,
+    sleep: Optional[float] = None,
+    max_workers: int = MAX_INFLIGHT,
+    since=None,
+    shard: Optional[str] = None,
+    info: Optional[dict] = None,
+) -> pd.DataFrame:
+    """
+    reportCd 목록을 병렬 수집 → _make_df.
+    (reportCd, 날짜 샤드)별 페이지네이션 체인은 각각 스레드 하나가 맡고, 결과는 targets 순서 →
+    최신 샤드 순서로 이어붙이므로 직렬 수집과 행 순서/중복 제거 결과가 같다. max_workers=1이면 직렬.
+    since(문서번호 또는 시간)를 주면 체인마다 마커가 보이는 페이지에서 멈춘다.
+    shard("day"/"week")를 주면 기간을 나눠 긴 체인 하나 대신 짧은 체인 여러 개로 받는다.
+    sleep은 하위호환용으로만 남아 있으며 넘기면 DeprecationWarning만 내고 무시한다(대기는 _Pacer 전담).
+    info(dict)를 넘기면 체인이 max_pages에서 끊겼을 때 info["truncated"] = True.
+    """
+    _warn_sleep(sleep)
+    batches = _collect(iter_reportcd_pages(
+        targets, from_date, to_date,
+        page_size=page_size, max_pages=max_pages, since=since, shard=shard, max_workers=max_workers,
+    ))
+    _note_truncated(info, batches, page_size, max_pages)
+    return _make_df([row for b in batches for row in b.rows])
+
+
+def fetch_investor_warning(
+    from_date: str,
+    to_date: str,
+    *,
+    page_size: int = 100,
+    max_pages: int = 1000,
+    sleep: Optional[float] = None,
+    since=None,
+    shard: Optional[str] = None,
+    force: bool = False,
+) -> pd.DataFrame:
+    """
+    투자경고·위험: 여러 reportCd × 페이지네이션 전체 수집 → 문서번호 중복 제거.
+    sleep: 쓰이지 않음 (간격은 _PACER). 넘기면 DeprecationWarning
+    force: 저장소 커버리지를 무시하고 다시 받아 덮어씀
+    """
+    _warn_sleep(sleep)
+    return _through_store("inv", from_date, to_date, lambda f, t, since, info: _fetch_reportcd_with_warn_payload(
+        f, t, TARGETS_WARN,
+        page_size=page_size, max_pages=max_pages, since=since, shard=shard, info=info
+    ), since=since, force=force)
 
-            if added == 0 or added < int(page_size):
-                break
-            if sleep:
-                time.sleep(sleep)
 
-    return _make_df(rows)
+def fetch_shortterm_overheat(
+    from_date: str,
+    to_date: str,
+    *,
+    page_size: int = 100,
+    max_pages: int = 1000,
+    sleep: Optional[float] = None,
+    since=None,
+    shard: Optional[str] = None,
+    force: bool = False,
+) -> pd.DataFrame:
+    """
+    단기과열: reportNm='단기과열' 단일 조건 페이지네이션 수집.
+    sleep: 쓰이지 않음 (간격은 _PACER). 넘기면 DeprecationWarning
+    force: 저장소 커버리지를 무시하고 다시 받아 덮어씀
+    """
+    _warn_sleep(sleep)
+    return _through_store("overheat", from_date, to_date, lambda f, t, since, info: _fetch_reportcd_with_warn_payload(
+        f, t, [TARGET_OVERHEAT],
+        page_size=page_size, max_pages=max_pages, since=since, shard=shard, info=info
+    ), since=since, force=force)
 
 
 def fetch_market_watch(
@@ -519,13 +1490,21 @@ def fetch_market_watch(
     *,
     page_size: int = 100,
     max_pages: int = 1000,
-    sleep: float = 5,
+    sleep: Optional[float] = None,
+    since=None,
+    shard: Optional[str] = None,
+    force: bool = False,
 ) -> pd.DataFrame:
-    """시장감시위원회(사용자 지정): 사용자가 준 reportCd 목록을 warn 페이로드 방식으로 조회."""
-    return _fetch_reportcd_with_warn_payload(
-        from_date, to_date, TARGETS_MARKET_WATCH,
-        page_size=page_size, max_pages=max_pages, sleep=sleep
-    )
+    """
+    시장감시위원회(사용자 지정): 사용자가 준 reportCd 목록을 warn 페이로드 방식으로 조회.
+    sleep: 쓰이지 않음 (간격은 _PACER). 넘기면 DeprecationWarning
+    force: 저장소 커버리지를 무시하고 다시 받아 덮어씀
+    """
+    _warn_sleep(sleep)
+    return _through_store("mw", from_date, to_date, lambda f, t, since, info: _fetch_reportcd_with_warn_payload(
+        f, t, TARGETS_MARKET_WATCH,
+        page_size=page_size, max_pages=max_pages, since=since, shard=shard, info=info
+    ), since=since, force=force)
 
 
 def fetch_delist(
@@ -534,10 +1513,115 @@ def fetch_delist(
     *,
     page_size: int = 100,
     max_pages: int = 1000,
-    sleep: float = 5,
+    sleep: Optional[float] = None,
+    since=None,
+    shard: Optional[str] = None,
+    force: bool = False,
 ) -> pd.DataFrame:
-    """상장폐지: 유가증권(68051) + 코스닥(70769) reportCd를 warn 페이로드 방식으로 조회."""
-    return _fetch_reportcd_with_warn_payload(
-        from_date, to_date, TARGETS_DELIST,
-        page_size=page_size, max_pages=max_pages, sleep=sleep
-    )
+    """
+    상장폐지: 유가증권(68051) + 코스닥(70769) reportCd를 warn 페이로드 방식으로 조회.
+    sleep: 쓰이지 않음 (간격은 _PACER). 넘기면 DeprecationWarning
+    force: 저장소 커버리지를 무시하고 다시 받아 덮어씀
+    """
+    _warn_sleep(sleep)
+    return _through_store("delist", from_date, to_date, lambda f, t, since, info: _fetch_reportcd_with_warn_payload(
+        f, t, TARGETS_DELIST,
+        page_size=page_size, max_pages=max_pages, since=since, shard=shard, info=info
+    ), since=since, force=force)
+
+
+# ─────────────────────────────────────────────────────────────
+# 소스 결과 캐시 — 메뉴가 달라도 같은 (소스, 기간, 조건)은 TTL 안에 한 번만 수집
+# ─────────────────────────────────────────────────────────────
+SOURCE_TTL = 60           # 초
+SOURCE_CACHE_SIZE = 64    # 항목 수 (넘치면 가장 오래 안 쓴 것부터 제거)
+_SOURCE_CACHE = TTLCache(ttl=SOURCE_TTL, maxsize=SOURCE_CACHE_SIZE)
+# 여러 세션이 같은 조회를 동시에 누르면 KIND 체인은 한 번만 돌고 나머지는 그 결과를 기다린다
+_SOURCE_FLIGHTS = SingleFlight()
+# 결과 출처별 호출 수: hit(메모리) / shared(다른 레플리카) / joined(진행 중인 같은 수집 합류) / miss(직접 수집)
+_SOURCE_STATS = {"hit": 0, "shared": 0, "joined": 0, "miss": 0}
+_SOURCE_STATS_LOCK = threading.Lock()
+
+
+def _count_source(status: str, info: Optional[dict]) -> None:
+    with _SOURCE_STATS_LOCK:
+        _SOURCE_STATS[status] += 1
+    if info is not None:
+        info["cache"] = status
+
+# 이름 → fetch(f, t, **조건). 조건(page_size/shard/categories 등)은 그대로 fetcher 인자로 넘어간다.
+SOURCES: Dict[str, Callable[..., pd.DataFrame]] = {
+    **{c: (lambda f, t, _c=c, **kw: kind_fetch(_c, f, t, **kw)) for c in CODE_MAP},
+    "many":     lambda f, t, *, categories, **kw: kind_fetch_many(categories, f, t, **kw),
+    "mw":       fetch_market_watch,
+    "inv":      fetch_investor_warning,
+    "overheat": fetch_shortterm_overheat,
+    "delist":   fetch_delist,
+}
+
+
+def _freeze(v):
+    return tuple(v) if isinstance(v, (list, tuple, set, frozenset)) and not isinstance(v, str) else v
+
+
+def fetch_source(
+    name: str,
+    from_date: str,
+    to_date: str,
+    *,
+    force: bool = False,
+    info: Optional[dict] = None,
+    **filters,
+) -> pd.DataFrame:
+    """
+    SOURCES[name](f, t, **filters)를 (name, f, t, filters) 키로 SOURCE_TTL초 캐시.
+    같은 키를 동시에 요청하면(세션이 달라도) 수집은 한 번만 하고 결과를 나눠 받는다.
+    use_shared로 공유 디렉터리가 연결돼 있으면 다른 레플리카가 받은 결과도 재사용한다.
+    force=True면 캐시와 저장소 커버리지를 무시하고 다시 받아 덮어쓴다 (이미 진행 중인 같은 수집이 있으면 그 결과를 쓴다).
+    info(dict)를 넘기면 결과 출처를 info["cache"]에 적는다: "hit" / "shared" / "joined" / "miss".
+    실패(예외)는 캐시하지 않고, 기다리던 호출에도 같은 예외가 전달된다.
+    반환 DataFrame은 캐시와 공유되므로 호출 측에서 제자리 수정하지 말 것 (필터/assign은 사본을 만든다).
+    """
+    fetch = SOURCES[name]
+    f = _date_to_str(from_date)
+    t = _date_to_str(to_date)
+    if name == "many":
+        filters["categories"] = sorted(set(filters["categories"]), key=list(CODE_MAP).index)
+    key = (name, f, t, tuple(sorted((k, _freeze(v)) for k, v in filters.items())))
+    if not force:
+        df = _SOURCE_CACHE.get(key)
+        if df is not None:
+            _count_source("hit", info)
+            return df
+
+    def _load() -> Tuple[pd.DataFrame, str]:
+        # 캐시 확인 직후 앞선 수집이 끝났을 수 있으므로 한 번 더 본다 (다른 레플리카 결과 포함)
+        shared = _SHARED
+        df = None if force else _SOURCE_CACHE.get(key)
+        status = "hit"
+        if df is None and shared is not None and not force:
+            df, status = shared.get(repr(key)), "shared"
+        if df is None:
+            df, status = fetch(f, t, force=force, **filters), "miss"
+            df = pd.DataFrame() if df is None else df
+            if shared is not None:
+                shared.put(repr(key), df, SOURCE_TTL)
+        _SOURCE_CACHE.put(key, df)
+        return df, status
+
+    (df, status), joined = _SOURCE_FLIGHTS.do(key, _load)
+    _count_source("joined" if joined else status, info)
+    return df
+
+
+def source_cache_stats() -> Dict[str, int]:
+    """fetch_source 결과 출처별 누적 호출 수 {hit, shared, joined, miss} + 캐시 항목 수(items)"""
+    with _SOURCE_STATS_LOCK:
+        out = dict(_SOURCE_STATS)
+    out["items"] = len(_SOURCE_CACHE)
+    return out
+
+
+def clear_source_cache() -> None:
+    """소스 결과 캐시 비우기 (강제 새로조회/초기화). 공유 캐시는 다른 레플리카도 쓰므로 건드리지 않는다."""
+    _SOURCE_CACHE.clear()
@@ -3,24 +3,52 @@ from __future__ import annotations
 
 import streamlit as st
 import pandas as pd
-import datetime, json, re
+import datetime, json, os, re, threading, time
+import cProfile, io, marshal, pstats
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from zoneinfo import ZoneInfo
 from streamlit.components.v1 import html
 from html import escape
 
 from fnc2 import (
-    kind_fetch,                 # cat 기반(1/2/3/6)
-    fetch_investor_warning,     # 4️⃣ 투자경고·위험
-    fetch_shortterm_overheat,   # 5️⃣ 단기과열
-    fetch_market_watch,         # ✅ 시장감시위원회(사용자 지정) - halt/multi에만 합침
+    fetch_source,               # 소스별 수집 + TTL/LRU 결과 캐시 (halt/mgmt/alert/misc, many, mw, inv, overheat)
+    clear_source_cache,         # 소스 결과 캐시 비우기
+    source_cache_stats,         # 소스 결과 출처별 누적 호출 수 (hit/shared/joined/miss)
+    reset_session,              # 전역 KIND 세션 파기
+    use_store,                  # 공시 로컬 저장소 연결
+    use_shared,                 # 레플리카 공유 결과 캐시 + KIND 요청 예산
+    merge_frames,               # 최신순 소스 병합 (문서번호 중복 제거)
+    with_ts,                    # 타입 있는 시각 컬럼(TS_COL) 보장
+    TS_COL,
 )
+from cache import ByteLRU
+
+# 공시 로컬 저장소 (선택): KIND_STORE_PATH를 주면 이미 동기화된 날짜는 디스크에서 읽음
+# collector를 같이 돌리면 KIND_STORE_MAX_AGE(초, 예: 120) 안에 수집된 당일 데이터도 저장소에서만 읽는다
+if os.environ.get("KIND_STORE_PATH"):
+    use_store(
+        os.environ["KIND_STORE_PATH"],
+        max_open_age=float(os.environ.get("KIND_STORE_MAX_AGE", "0") or 0),
+    )
+
+# 여러 컨테이너를 띄울 때: 공유 볼륨 경로를 KIND_SHARED_DIR로 주면 조회 결과와 KIND 요청 속도(초당 KIND_SHARED_RATE건)를 나눠 쓴다
+if os.environ.get("KIND_SHARED_DIR"):
+    use_shared(
+        os.environ["KIND_SHARED_DIR"],
+        rate=float(os.environ.get("KIND_SHARED_RATE", "4") or 4),
+        burst=float(os.environ.get("KIND_SHARED_BURST", "8") or 8),
+    )
 
 # NXT 종목 조회 (환경에 따라 없을 수 있으므로 안전 처리)
 try:
-    from fnc import get_nextrade_filtered_symbols  # (trade_date, df)
+    from fnc import get_nxt_listing      # 거래일 단위 캐시 → NxtListing(names, reason_map, ...)
+    from secmaster import get_secmaster  # 단축코드/KIND 5자리 코드 인덱스
 except Exception:
-    def get_nextrade_filtered_symbols(yyyymmdd: str):
-        return yyyymmdd, pd.DataFrame(columns=["종목명"])  # 안전 Fallback
+    def get_nxt_listing(yyyymmdd: str):
+        return None  # 안전 Fallback
+    def get_secmaster(yyyymmdd: str, **kw):
+        return None
 
 # ─────────────────────────────────────────────────────────────
 # 상수/유틸
@@ -97,21 +125,48 @@ def style_nxt_rows(df: pd.DataFrame, nxt_set: set) -> pd.io.formats.style.Styler
 
 # 화면 표시용 변환 (시간 포맷: yy/mm/dd HH:MM)
 def build_display_df(df: pd.DataFrame, ref_date: datetime.date) -> pd.DataFrame:
-    ts = pd.to_datetime(df.get("시간", ""), errors="coerce")
+    ts = with_ts(df)[TS_COL]
     time_disp = ts.dt.strftime("%y/%m/%d %H:%M").fillna("")
     is_today = ts.dt.date.eq(ref_date)
     out = (
         pd.DataFrame({
-            "당일": is_today.map(lambda x: "🟡" if x else ""),
+            "당일": is_today.map({True: "🟡", False: ""}),
             "시간": time_disp,
             "종목명": df.get("회사명", "").astype(str),
             "공시제목": df.get("뷰어URL", "").astype(str),
+            "__ts": ts,
         })
-        .sort_values("시간", ascending=False)
+        .sort_values("__ts", ascending=False, kind="stable")
+        .drop(columns="__ts")
         .reset_index(drop=True)
     )
     return out
 
+# 키워드 필터 (공시제목 | 회사명 부분 일치)
+def _filter_keyword(df: pd.DataFrame, keyword: str, case_sens: bool = False) -> pd.DataFrame:
+    if not keyword.strip():
+        return df
+    flags = 0 if case_sens else re.IGNORECASE
+    patt = re.compile(re.escape(keyword.strip()), flags)
+    mask = (
+        df.get("공시제목", "").astype(str).str.contains(patt, na=False) |
+        df.get("회사명", "").astype(str).str.contains(patt, na=False)
+    )
+    return df[mask]
+
+# 조회 시간 필터 (st_tm > en_tm 이면 자정을 넘는 구간)
+def _filter_time(df: pd.DataFrame, st_tm: datetime.time, en_tm: datetime.time) -> pd.DataFrame:
+    df = with_ts(df)
+    ts_all = df[TS_COL]
+    tt = ts_all.dt.hour * 60 + ts_all.dt.minute     # 분 단위 하루 중 시각 (NaT → NaN → 제외)
+    st_m = st_tm.hour * 60 + st_tm.minute
+    en_m = en_tm.hour * 60 + en_tm.minute
+    if st_m <= en_m:
+        mask_time = (tt >= st_m) & (tt <= en_m)
+    else:
+        mask_time = (tt >= st_m) | (tt <= en_m)
+    return df[mask_time]
+
 # 공시제목/링크 분리 복사용
 def _split_title_and_link(url_series: pd.Series) -> tuple[pd.Series, pd.Series]:
     url_series = url_series.astype(str)
@@ -206,109 +261,245 @@ def render_header_with_copy(copy_id: str, caption_text: str, df_display: pd.Data
 # ✅ halt(cat) + mw(reportCd) 병합 유틸
 # ─────────────────────────────────────────────────────────────
 def _merge_halt_and_mw(df_halt_cat: pd.DataFrame, df_mw: pd.DataFrame) -> pd.DataFrame:
-    dfs = []
-    if df_halt_cat is not None and not df_halt_cat.empty:
-        dfs.append(df_halt_cat)
-    if df_mw is not None and not df_mw.empty:
-        dfs.append(df_mw)
-    if not dfs:
-        return pd.DataFrame()
-
-    merged = pd.concat(dfs, ignore_index=True, sort=False)
-    if "문서번호" in merged.columns:
-        merged = merged.drop_duplicates(subset=["문서번호"], keep="first")
-    if "시간" in merged.columns:
-        merged["__ts"] = pd.to_datetime(merged["시간"], errors="coerce")
-        merged = merged.sort_values("__ts", ascending=False).drop(columns="__ts")
-    return merged.reset_index(drop=True)
+    return merge_frames([df_halt_cat, df_mw])
 
 # ─────────────────────────────────────────────────────────────
-# 데이터 페치
+# ✅ 성능 패널 (opt-in: ?perf=1 또는 사이드바 토글)
 # ─────────────────────────────────────────────────────────────
-@st.cache_data(show_spinner=False, ttl=60)
-def _fetch(menu_key: str, f: str, t: str, page_size: int = 100, nonce: int = 0) -> pd.DataFrame:
-    # nonce는 캐시 키를 바꾸기 위한 용도(사용 X)
-    _ = nonce
+PERF_QUERY_PARAM = "perf"
+PERF_PROFILE_TOP = 30       # cProfile 보고서에 보여줄 함수 수 (누적 시간순)
 
-    ftype, arg, patt = FETCHER_MAP[menu_key]
-    if ftype == "multi":
-        return _fetch_multi(f, t, page_size, nonce=nonce)
-
-    if ftype == "inv":
-        df_raw = fetch_investor_warning(f, t, page_size=page_size)
-        if not df_raw.empty:
-            df_raw = df_raw[~df_raw["공시제목"].astype(str).str.contains(INV_SUFFIX_EXCLUDE, na=False)]
-        return df_raw.reset_index(drop=True)
-
-    if ftype == "overheat":
-        df_raw = fetch_shortterm_overheat(f, t, page_size=page_size)
-        if not df_raw.empty:
-            df_raw = df_raw[~df_raw["공시제목"].astype(str).str.contains(INV_SUFFIX_EXCLUDE, na=False)]
-        return df_raw.reset_index(drop=True)
+class PerfTrace:
+    """
+    재실행 한 번의 단계별 소요 시간 · 소스별 캐시 출처 · DataFrame 크기.
+    enable() 전에는 아무것도 기록하지 않으므로 패널을 끈 재실행의 비용은 perf_counter 호출 몇 번뿐이다.
+    소스는 _gather 스레드에서 기록되므로 락으로 보호한다.
+    """
 
-    # cat
-    df_raw = kind_fetch(arg, f, t, page_size=page_size)
+    def __init__(self):
+        self.enabled = False
+        self.profiler: cProfile.Profile | None = None
+        self.profile_error = ""
+        self.phases: list[tuple[str, float]] = []
+        self.sources: list[dict] = []
+        self.frames: list[dict] = []
+        self._lock = threading.Lock()
+
+    def enable(self, profile: bool = False) -> None:
+        self.enabled = True
+        if profile:
+            prof = cProfile.Profile()
+            try:
+                prof.enable()
+                self.profiler = prof
+            except ValueError as e:     # 다른 세션이 이미 프로파일 중 (프로세스당 하나)
+                self.profile_error = str(e)
+
+    def stop_profile(self) -> None:
+        if self.profiler is not None:
+            self.profiler.disable()
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases.append((name, time.perf_counter() - t0))
 
-    # ✅ 거래정지/재개 메뉴: 기존 halt(cat) + 시장감시(reportCd) 합치기
-    if arg == "halt":
-        df_mw = fetch_market_watch(f, t, page_size=page_size)
-        if not df_mw.empty:
-            df_mw = df_mw[~df_mw["공시제목"].astype(str).str.contains(INV_SUFFIX_EXCLUDE, na=False)]
+    def source(self, name: str, sec: float, cache: str, df: pd.DataFrame | None) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.sources.append({"소스": name, "캐시": cache, "초": round(sec, 3),
+                                 "행": 0 if df is None else len(df)})
 
-        df_halt = df_raw
-        if df_halt is not None and not df_halt.empty and patt is not None:
-            df_halt = df_halt[df_halt["공시제목"].astype(str).str.contains(patt, na=False)]
+    def frame(self, name: str, df: pd.DataFrame | None) -> None:
+        if not self.enabled or df is None:
+            return
+        self.frames.append({"단계": name, "행": len(df), "열": df.shape[1],
+                            "KB": round(df.memory_usage(index=True, deep=True).sum() / 1024, 1)})
 
-        merged = _merge_halt_and_mw(df_halt, df_mw)
-        return merged.reset_index(drop=True) if not merged.empty else pd.DataFrame()
+    def profile_report(self) -> tuple[str, bytes]:
+        """(누적 시간순 상위 PERF_PROFILE_TOP 텍스트, pstats 덤프 바이트)"""
+        if self.profiler is None:
+            return "", b""
+        out = io.StringIO()
+        pstats.Stats(self.profiler, stream=out).sort_stats("cumulative").print_stats(PERF_PROFILE_TOP)
+        return out.getvalue(), marshal.dumps(pstats.Stats(self.profiler).stats)     # dump_stats와 같은 형식
 
-    return df_raw.reset_index(drop=True) if df_raw is not None and not df_raw.empty else pd.DataFrame()
+_NO_PERF = PerfTrace()      # 꺼진 상태 그대로 두는 기본값 (_fetch를 패널 없이 부를 때)
 
-@st.cache_data(show_spinner=False, ttl=60)
-def _fetch_multi(f: str, t: str, page_size: int = 100, nonce: int = 0) -> pd.DataFrame:
-    _ = nonce
+def _perf_requested() -> bool:
+    try:
+        return str(st.query_params.get(PERF_QUERY_PARAM, "")).lower() in ("1", "true", "on")
+    except Exception:
+        return False
 
-    # 1) halt(cat) + mw 병합 (halt 패턴은 cat에만 적용)
-    df_halt_cat = kind_fetch("halt", f, t, page_size=page_size)
-    df_halt_cat_f = df_halt_cat
-    if df_halt_cat_f is not None and not df_halt_cat_f.empty:
-        df_halt_cat_f = df_halt_cat_f[df_halt_cat_f["공시제목"].astype(str).str.contains(HALT_PATTERN, na=False)]
+def render_perf_panel(perf: PerfTrace) -> None:
+    total = sum(sec for name, sec in perf.phases if "." not in name)     # fetch.* 는 fetch 안쪽 단계
+    with st.expander(f"⏱ 성능 (이번 재실행 {total * 1000:.0f} ms)", expanded=False):
+        if perf.phases:
+            st.markdown("**단계별 소요**")
+            st.dataframe(
+                pd.DataFrame([{"단계": n, "ms": round(sec * 1000, 1)} for n, sec in perf.phases]),
+                hide_index=True, use_container_width=True,
+            )
+        if perf.sources:
+            st.markdown("**소스 (fetch_source)**")
+            st.dataframe(pd.DataFrame(perf.sources), hide_index=True, use_container_width=True)
+        sc = source_cache_stats()
+        mc = st.session_state["menu_cache"].stats() if "menu_cache" in st.session_state else {}
+        st.caption(
+            f"소스 캐시 누적: 적중 {sc['hit']} · 레플리카 {sc['shared']} · 합류 {sc['joined']} · 수집 {sc['miss']} (항목 {sc['items']})"
+            + (f" · 조회 결과 캐시 적중 {mc['hits']} / 누락 {mc['misses']}" if mc else "")
+        )
+        if perf.frames:
+            st.markdown("**DataFrame 크기**")
+            st.dataframe(pd.DataFrame(perf.frames), hide_index=True, use_container_width=True)
+        if perf.profile_error:
+            st.caption(f"cProfile 사용 불가: {perf.profile_error}")
+        text, dump = perf.profile_report()
+        if text:
+            st.caption("cProfile은 이 재실행의 메인 스레드만 잽니다 (소스 수집 스레드는 fetch.sources 대기로 보임).")
+            st.code(text, language="text")
+            st.download_button("📥 cProfile 덤프 (.prof)", data=dump, file_name="menu2_rerun.prof",
+                               mime="application/octet-stream")
 
-    df_mw = fetch_market_watch(f, t, page_size=page_size)
-    if not df_mw.empty:
-        df_mw = df_mw[~df_mw["공시제목"].astype(str).str.contains(INV_SUFFIX_EXCLUDE, na=False)]
+# ─────────────────────────────────────────────────────────────
+# 데이터 페치
+# ─────────────────────────────────────────────────────────────
+# 모아보기에서 묶음 조회할 cat 카테고리
+MULTI_CATS = ["halt", "mgmt", "alert", "misc"]
+# 그중 행별 카테고리가 필요 없는 것만 한 번의 페이지네이션으로 묶는다.
+# halt는 제목 필터(HALT_PATTERN)를 halt 행에만 걸어야 하는데, 묶음 결과에서는 행의 카테고리를 알 수 없다.
+MULTI_BATCH_CATS = ["mgmt", "alert", "misc"]
+
+# 이 일수 이상 조회하면 주 단위로 나눠 구간별 페이지네이션을 동시에 돌림 (fnc2 shard)
+SHARD_WEEK_OVER_DAYS = 14
+
+def _shard_for(f: str, t: str):
+    days = (datetime.date.fromisoformat(t) - datetime.date.fromisoformat(f)).days + 1
+    return "week" if days >= SHARD_WEEK_OVER_DAYS else None
+
+# 세션별 조회 결과(menu_cache) 메모리 예산(MB). 넘치면 가장 오래 안 본 (메뉴, 기간)부터 버린다
+MENU_CACHE_MB = float(os.environ.get("KIND_MENU_CACHE_MB", "64") or 64)
+
+def _bundle_bytes(bundle: dict) -> int:
+    df = bundle.get("raw")
+    return int(df.memory_usage(index=True, deep=True).sum()) if df is not None else 0
+
+# 소스 동시 수집 스레드 수. KIND로 실제 나가는 요청 수는 fnc2.MAX_INFLIGHT가 전역으로 제한한다.
+SOURCE_WORKERS = 8
+
+def _gather(jobs: dict) -> dict:
+    """{이름: 인자 없는 수집 함수} 를 동시에 실행 → {이름: DataFrame}. 하나라도 실패하면 예외."""
+    if len(jobs) <= 1:
+        return {name: fn() for name, fn in jobs.items()}
+    with ThreadPoolExecutor(max_workers=min(SOURCE_WORKERS, len(jobs)), thread_name_prefix="src") as ex:
+        futures = {name: ex.submit(fn) for name, fn in jobs.items()}
+        try:
+            return {name: fu.result() for name, fu in futures.items()}
+        except BaseException:
+            for fu in futures.values():
+                fu.cancel()
+            raise
+
+def _drop_pref(df: pd.DataFrame) -> pd.DataFrame:
+    """우선주 공시 제외"""
+    if df is None or df.empty:
+        return df
+    return df[~df["공시제목"].astype(str).str.contains(INV_SUFFIX_EXCLUDE, na=False)]
+
+def _only_halt(df: pd.DataFrame, patt=HALT_PATTERN) -> pd.DataFrame:
+    """halt(cat) 결과에서 거래정지 관련 공시만"""
+    if df is None or df.empty or patt is None:
+        return df
+    return df[df["공시제목"].astype(str).str.contains(patt, na=False)]
+
+def _src(name: str, f: str, t: str, page_size: int, force: bool = False,
+         perf: PerfTrace | None = None, **filters):
+    """fnc2 소스 캐시 경유 수집 함수 (메뉴/세션/레플리카 간 공유, SOURCE_TTL초). force면 캐시 무시"""
+    perf = perf or _NO_PERF
+
+    def _call() -> pd.DataFrame:
+        info: dict = {}
+        t0 = time.perf_counter()
+        df = fetch_source(name, f, t, force=force, info=info, page_size=page_size, shard=_shard_for(f, t), **filters)
+        perf.source(name, time.perf_counter() - t0, info.get("cache", ""), df)
+        return df
+    return _call
+
+def _fetch(menu_key: str, f: str, t: str, page_size: int = 100, force: bool = False,
+           perf: PerfTrace | None = None) -> pd.DataFrame:
+    # 메뉴 결과는 캐시하지 않고 매번 소스 캐시(fetch_source)에서 조립한다 → 같은 소스는 어느 메뉴가 불러도 한 번만 수집
+    perf = perf or _NO_PERF
+    ftype, arg, patt = FETCHER_MAP[menu_key]
+    if ftype == "multi":
+        return _fetch_multi(f, t, page_size, force, perf=perf)
 
-    df_halt = _merge_halt_and_mw(df_halt_cat_f, df_mw)
+    if ftype in ("inv", "overheat"):
+        df_raw = _src(ftype, f, t, page_size, force, perf)()
+        with perf.phase("fetch.drop_pref"):
+            df_raw = _drop_pref(df_raw)
+        return df_raw.reset_index(drop=True)
 
-    # 2) 나머지 기존 로직 그대로
-    df_mgmt  = kind_fetch("mgmt",  f, t, page_size=page_size)
-    df_alert = kind_fetch("alert", f, t, page_size=page_size)
-    df_misc  = kind_fetch("misc",  f, t, page_size=page_size)
+    # ✅ 거래정지/재개 메뉴: 기존 halt(cat) + 시장감시(reportCd) 동시 수집 후 합치기
+    if arg == "halt":
+        with perf.phase("fetch.sources"):
+            got = _gather({
+                "halt_cat": _src(arg, f, t, page_size, force, perf),
+                "mw":       _src("mw", f, t, page_size, force, perf),
+            })
+        with perf.phase("fetch.merge"):
+            merged = _merge_halt_and_mw(_only_halt(got["halt_cat"], patt), _drop_pref(got["mw"]))
+        return merged.reset_index(drop=True) if not merged.empty else pd.DataFrame()
 
-    df_warn  = fetch_investor_warning(f, t, page_size=page_size)
-    if not df_warn.empty:
-        df_warn = df_warn[~df_warn["공시제목"].astype(str).str.contains(INV_SUFFIX_EXCLUDE, na=False)]
+    # cat
+    df_raw = _src(arg, f, t, page_size, force, perf)()
+    return df_raw.reset_index(drop=True) if df_raw is not None and not df_raw.empty else pd.DataFrame()
 
-    df_oh    = fetch_shortterm_overheat(f, t, page_size=page_size)
-    if not df_oh.empty:
-        df_oh = df_oh[~df_oh["공시제목"].astype(str).str.contains(INV_SUFFIX_EXCLUDE, na=False)]
+def _fetch_multi(f: str, t: str, page_size: int = 100, force: bool = False,
+                 perf: PerfTrace | None = None) -> pd.DataFrame:
+    # 소스를 동시에 수집 (지연 ≈ 가장 느린 소스 하나). halt/mw/inv/overheat는 개별 메뉴와 캐시를 공유한다.
+    # mgmt/alert/misc는 한 번의 페이지네이션으로 받는다 (halt는 제목 필터 때문에 따로).
+    perf = perf or _NO_PERF
+    with perf.phase("fetch.sources"):
+        got = _gather({
+            "halt":     _src("halt", f, t, page_size, force, perf),
+            "cat":      _src("many", f, t, page_size, force, perf, categories=MULTI_BATCH_CATS),
+            "mw":       _src("mw", f, t, page_size, force, perf),
+            "inv":      _src("inv", f, t, page_size, force, perf),
+            "overheat": _src("overheat", f, t, page_size, force, perf),
+        })
 
-    dfs = [x for x in [df_halt, df_mgmt, df_alert, df_misc, df_warn, df_oh] if x is not None and not x.empty]
-    if not dfs:
-        return pd.DataFrame()
+    with perf.phase("fetch.merge"):
+        # 1) halt(cat) + mw 병합 (halt 패턴은 cat에만 적용)
+        df_halt = _merge_halt_and_mw(_only_halt(got["halt"]), _drop_pref(got["mw"]))
 
-    merged = pd.concat(dfs, ignore_index=True, sort=False)
-    if "문서번호" in merged.columns:
-        merged = merged.drop_duplicates(subset=["문서번호"], keep="first")
-    if "시간" in merged.columns:
-        merged["__ts"] = pd.to_datetime(merged["시간"], errors="coerce")
-        merged = merged.sort_values("__ts", ascending=False).drop(columns="__ts")
-    return merged.reset_index(drop=True)
+        # 2) 나머지는 기존 순서 그대로 이어붙임 (문서번호 중복 시 앞쪽 소스 우선)
+        parts = [df_halt, got["cat"], _drop_pref(got["inv"]), _drop_pref(got["overheat"])]
+        return merge_frames(parts)
 
 # ─────────────────────────────────────────────────────────────
 # App
 # ─────────────────────────────────────────────────────────────
 def run():
+    perf = PerfTrace()
+    try:
+        _run(perf)
+    except BaseException:       # st.rerun()/st.stop() 포함: 패널 없이 그대로 올린다
+        perf.stop_profile()
+        raise
+    perf.stop_profile()
+    if perf.enabled:
+        render_perf_panel(perf)
+
+def _run(perf: PerfTrace):
     st.set_page_config(
         page_title="KRX • NXT 공시 모니터",
         layout="centered",
@@ -338,10 +529,8 @@ def run():
 
     st.markdown("### 📡 KRX • NXT 공시 모니터")
 
-    if "menu_cache" not in st.session_state:
-        st.session_state["menu_cache"] = {}
-    if "force_nonce" not in st.session_state:
-        st.session_state["force_nonce"] = 0
+    if not isinstance(st.session_state.get("menu_cache"), ByteLRU):
+        st.session_state["menu_cache"] = ByteLRU(int(MENU_CACHE_MB * 2**20), _bundle_bytes)
 
     # ── 사이드바
     with st.sidebar:
@@ -435,20 +624,36 @@ def run():
             
         # 5) 조회/캐시 제어 버튼들
         go = st.button("공시 조회", type="primary", use_container_width=True)
+        force = False
 
         cA, cB = st.columns(2)
         with cA:
             if st.button("🔄 강제 새로조회", use_container_width=True):
-                st.session_state["force_nonce"] += 1
-                st.toast("캐시 무시하고 다시 조회합니다.", icon="🔄")
+                # 403 이후엔 세션이 오염됐을 가능성이 높아 캐시 무시와 세션 리셋을 함께 처리
+                reset_session()
+                go = force = True
+                st.toast("캐시/세션을 무시하고 다시 조회합니다.", icon="🔄")
         with cB:
             if st.button("🧹 초기화", use_container_width=True):
+                reset_session()
+                clear_source_cache()
                 st.cache_data.clear()
                 st.cache_resource.clear()
                 st.session_state.clear()
                 st.toast("캐시/세션을 초기화했습니다.", icon="🧹")
                 st.rerun()
 
+        mc = st.session_state["menu_cache"].stats()
+        st.caption(
+            f"조회 결과 캐시 {mc['items']}건 · {mc['bytes'] / 2**20:.1f}/{mc['max_bytes'] / 2**20:.0f} MB"
+            f" · 적중 {mc['hits']} / 누락 {mc['misses']} · 제거 {mc['evictions']}회"
+        )
+
+        # 6) ⏱ 성능 패널 (기본 꺼짐, ?perf=1 로 켠 채 열기)
+        if st.toggle("⏱ 성능 패널", value=_perf_requested(), key="perf_panel",
+                     help="이번 재실행의 단계별 소요 시간/캐시 출처/DataFrame 크기를 본문 아래에 표시"):
+            perf.enable(profile=st.checkbox("cProfile 보고서 포함", value=False, key="perf_profile"))
+
 
 
     if d_start > d_end:
@@ -464,12 +669,12 @@ def run():
 
     if go:
         try:
-            with st.spinner(f"KIND에서 [{_menu_label(menu_key).strip()}] 데이터 수집 중..."):
-                df_raw = _fetch(menu_key, f, t, page_size=100, nonce=st.session_state["force_nonce"])
+            with st.spinner(f"KIND에서 [{_menu_label(menu_key).strip()}] 데이터 수집 중..."), perf.phase("fetch"):
+                df_raw = _fetch(menu_key, f, t, page_size=100, force=force, perf=perf)
         except Exception as e:
             st.error("KIND 응답이 비정상입니다(차단/오류 가능).")
             st.code(str(e))
-            st.info("🔄 강제 새로조회 → 안 되면 🧹 초기화 → 그래도 안 되면 조회기간을 줄이거나 fnc2.py의 sleep을 늘려보세요.")
+            st.info("🔄 강제 새로조회 → 안 되면 🧹 초기화 → 그래도 안 되면 조회기간을 줄이거나 fnc2.py의 MAX_INFLIGHT를 낮추고 PACE_FIRST를 늘려보세요.")
             return
 
         # ✅ multi에서만: 단기과열 '(예고)' 공시 선택적으로 제외 (원본 단계에서)
@@ -483,11 +688,13 @@ def run():
             st.warning("해당 조건에 일치하는 데이터가 없습니다.")
             return
         ts_kst = datetime.datetime.now(ZoneInfo("Asia/Seoul")).strftime("%Y-%m-%d %H:%M:%S KST")
-        st.session_state["menu_cache"][cache_key] = {"time_kst": ts_kst, "raw": df_raw}
+        st.session_state["menu_cache"].put(cache_key, {"time_kst": ts_kst, "raw": df_raw})
     else:
-        bundle = st.session_state["menu_cache"].get(cache_key)
+        with perf.phase("menu_cache"):
+            bundle = st.session_state["menu_cache"].get(cache_key)
         if bundle:
             df_raw = bundle.get("raw")
+    perf.frame("raw", df_raw)
 
     # 수집 전이면 안내
     if df_raw is None:
@@ -498,31 +705,21 @@ def run():
         return
 
     # ── (1) 키워드 필터
-    df_view = df_raw.copy()
-    if keyword.strip():
-        flags = 0 if case_sens else re.IGNORECASE
-        patt = re.compile(re.escape(keyword.strip()), flags)
-        mask = (
-            df_view.get("공시제목", "").astype(str).str.contains(patt, na=False) |
-            df_view.get("회사명", "").astype(str).str.contains(patt, na=False)
-        )
-        df_view = df_view[mask]
+    with perf.phase("keyword_filter"):
+        df_view = _filter_keyword(df_raw.copy(), keyword, case_sens)
 
-    # 단기과열 메뉴: (예고) 제외
-    if menu_key == "overheat" and not df_view.empty and exclude_forecast_main:
-        df_view = df_view[~df_view.get("공시제목", "").astype(str).str.match(r"^\(예고\)")]
+        # 단기과열 메뉴: (예고) 제외
+        if menu_key == "overheat" and not df_view.empty and exclude_forecast_main:
+            df_view = df_view[~df_view.get("공시제목", "").astype(str).str.match(r"^\(예고\)")]
+    perf.frame("keyword_filter", df_view)
 
     # ── (2) 조회 시간 필터
     st_tm = map_start[start_time_lbl]
     en_tm = map_end[end_time_lbl]
     if not df_view.empty:
-        ts_all = pd.to_datetime(df_view["시간"], errors="coerce")
-        tt = ts_all.dt.time
-        if st_tm <= en_tm:
-            mask_time = (tt >= st_tm) & (tt <= en_tm)
-        else:
-            mask_time = (tt >= st_tm) | (tt <= en_tm)
-        df_view = df_view[mask_time]
+        with perf.phase("time_filter"):
+            df_view = _filter_time(df_view, st_tm, en_tm)
+        perf.frame("time_filter", df_view)
 
     if df_view.empty:
         st.warning("필터 조건에 해당하는 데이터가 없습니다.")
@@ -530,42 +727,41 @@ def run():
 
     # 표시용 변환(주말 보정으로 당일 하이라이트)
     ref_date = _last_weekday(d_end)
-    df_all_show = build_display_df(df_view, ref_date)
-
-    # NXT 종목셋 & 거래불가사유 매핑
-    nxt_ref_date = _last_weekday(d_end)
-    ymd = nxt_ref_date.strftime("%Y%m%d")
-    try:
-        _trade_date, nxt_df = get_nextrade_filtered_symbols(ymd)
-        if nxt_df is None or nxt_df.empty:
-            nxt_names = set()
-            reason_map = {}
-        else:
-            nxt_df = nxt_df.copy()
-            nxt_df["종목명"] = nxt_df["종목명"].astype(str)
-
-            if "거래불가사유" not in nxt_df.columns:
-                nxt_df["거래불가사유"] = ""
-
-            nxt_df["비고"] = nxt_df["거래불가사유"].fillna("").astype(str)
-            nxt_df["비고"] = (
-                nxt_df["비고"]
-                .str.replace(r"투자\s*경고\s*/\s*위험", "경/위", regex=True)
-                .str.replace("투자경고/위험", "경/위", regex=False)
-                .str.replace("단기과열", "과열", regex=False)
-                .str.replace("거래정지", "정지", regex=False)
-            )
-            reason_map = nxt_df.drop_duplicates("종목명").set_index("종목명")["비고"].to_dict()
-            nxt_names = set(nxt_df["종목명"])
-    except Exception:
-        nxt_names = set()
-        reason_map = {}
-
-    # 비고 붙이기(공통)
-    df_all_show["비고"] = df_all_show["종목명"].map(reason_map).fillna("")
+    with perf.phase("build_display"):
+        df_all_show = build_display_df(df_view, ref_date)
 
-    # 분기 데이터셋
-    df_nxt_trade = df_all_show[df_all_show["종목명"].isin(nxt_names)].copy()
+    # NXT 종목셋 & 거래불가사유 매핑 (거래일 단위 캐시 → 필터만 바뀐 재실행은 네트워크 없음)
+    with perf.phase("nxt_lookup"):
+        nxt_ref_date = _last_weekday(d_end)
+        ymd = nxt_ref_date.strftime("%Y%m%d")
+        try:
+            listing = get_nxt_listing(ymd)
+        except Exception:
+            listing = None
+        nxt_names = listing.names if listing is not None else frozenset()
+        reason_map = listing.reason_map if listing is not None else {}
+
+        # 종목명이 달라도(약칭/영문 표기) KIND 종목코드(5자리)로 NXT 종목을 찾아 이름 매칭에 합침.
+        # KRX 시세/지수는 표에 쓰지 않으므로 조회하지 않는다.
+        try:
+            sm = get_secmaster(ymd, with_krx=False)
+        except Exception:
+            sm = None
+        if sm is not None and "종목코드" in df_view.columns:
+            hit = sm.enrich(df_view[["회사명", "종목코드"]], cols=["NXT", "NXT비고"])
+            hit = hit[hit["NXT"]]
+            if not hit.empty:
+                names = hit["회사명"].astype(str)
+                nxt_names = nxt_names | frozenset(names)
+                reason_map = {**dict(zip(names, hit["NXT비고"])), **reason_map}
+
+        # 비고 붙이기(공통)
+        df_all_show["비고"] = df_all_show["종목명"].map(reason_map).fillna("")
+
+        # 분기 데이터셋
+        df_nxt_trade = df_all_show[df_all_show["종목명"].isin(nxt_names)].copy()
+    perf.frame("display_all", df_all_show)
+    perf.frame("display_nxt", df_nxt_trade)
 
     # 캡션
     caption_head = f"\n선택: {_menu_label(menu_key).strip()} · 기간: {f} ~ {t} · 총 {len(df_all_show)}건"
@@ -584,31 +780,37 @@ def run():
     # ── 탭 2개만: 1) 넥스트레이드 종목  2) KRX 전체
     tab1, tab2 = st.tabs(["1) 넥스트레이드 종목", "2) KRX 전체"])
 
+    # 복사 버튼(copy_*)은 클립보드 TSV 직렬화, 표(table_*)는 스타일 계산 + 전송까지 포함
     with tab1:
         if df_nxt_trade.empty:
-            render_header_with_copy("copy_tab1", caption_head, df_nxt_trade)
+            with perf.phase("copy_tab1"):
+                render_header_with_copy("copy_tab1", caption_head, df_nxt_trade)
             st.info("넥스트레이드 종목명과 일치하는 공시가 없습니다.")
         else:
-            render_header_with_copy("copy_tab1", caption_head, df_nxt_trade)
-            styled = style_today_rows(df_nxt_trade)
+            with perf.phase("copy_tab1"):
+                render_header_with_copy("copy_tab1", caption_head, df_nxt_trade)
+            with perf.phase("table_tab1"):
+                styled = style_today_rows(df_nxt_trade)
+                st.dataframe(
+                    styled,
+                    use_container_width=True,
+                    hide_index=True,
+                    height=_df_height(df_nxt_trade),
+                    column_config=colcfg,
+                )
+
+    with tab2:
+        with perf.phase("copy_tab2"):
+            render_header_with_copy("copy_tab2", caption_head, df_all_show)
+        with perf.phase("table_tab2"):
+            styled = style_nxt_rows(df_all_show, nxt_names)
             st.dataframe(
                 styled,
                 use_container_width=True,
                 hide_index=True,
-                height=_df_height(df_nxt_trade),
+                height=_df_height(df_all_show),
                 column_config=colcfg,
             )
 
-    with tab2:
-        render_header_with_copy("copy_tab2", caption_head, df_all_show)
-        styled = style_nxt_rows(df_all_show, nxt_names)
-        st.dataframe(
-            styled,
-            use_container_width=True,
-            hide_index=True,
-            height=_df_height(df_all_show),
-            column_config=colcfg,
-        )
-
 if __name__ == "__main__":
     run()
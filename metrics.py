@@ -0,0 +1,221 @@
+# metrics.py
+# HTTP 요청 단위 계측: 프로세스 내 카운터/히스토그램 + Prometheus 텍스트 + 구조화 로그(JSON 한 줄)
+"""
+fnc2/afnc2(KIND)와 fnc(KRX/NXT)의 모든 HTTP 호출이 여기로 기록한다.
+  - observe_wait:    페이서/예산 대기 (재시도 사이 백오프 포함)
+  - observe_request: 시도 한 번 = source, report, page, status, bytes, 소요/서버 시간
+  - observe_parse:   응답 하나의 파싱 시간과 행 수
+  - call / acall:    HTTP 호출 하나를 감싸 observe_request로 기록 (워밍업/진단/KRX·NXT처럼 재시도 루프 밖의 호출)
+Prometheus 라벨은 source/report/status만 쓴다(페이지는 카디널리티가 커서 로그 이벤트에만 남김).
+구조화 로그는 "metrics" 로거의 INFO 레벨이라 기본 설정(WARNING)에서는 만들지도 않는다.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+__all__ = [
+    "observe_wait",
+    "observe_request",
+    "observe_parse",
+    "call",
+    "acall",
+    "render",
+    "write",
+    "snapshot",
+    "reset",
+]
+
+log = logging.getLogger("metrics")
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+PARSE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(v: float) -> str:
+    if v == math.inf:
+        return "+Inf"
+    return repr(float(v)) if v != int(v) else str(int(v))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str]):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, key: Labels, v: float = 1.0) -> None:
+        self._values[key] = self._values.get(key, 0.0) + v
+
+    def _lines(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for key, v in sorted(self._values.items()):
+            yield f"{self.name}{_labelstr(self.labels, key)} {_fmt(v)}"
+
+    def _snapshot(self) -> dict:
+        return {key: v for key, v in self._values.items()}
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Sequence[str], buckets: Sequence[float]):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._values: Dict[Labels, list] = {}   # key → [버킷별 개수..., 합, 개수]
+
+    def observe(self, key: Labels, v: float) -> None:
+        cur = self._values.get(key)
+        if cur is None:
+            cur = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+        for i, b in enumerate(self.buckets):
+            if v <= b:
+                cur[i] += 1
+                break
+        cur[-2] += v
+        cur[-1] += 1
+
+    def _lines(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for key, cur in sorted(self._values.items()):
+            acc = 0
+            for b, n in zip(self.buckets, cur):
+                acc += n
+                yield f"{self.name}_bucket{_labelstr(self.labels + ('le',), key + (_fmt(b),))} {acc}"
+            yield f"{self.name}_sum{_labelstr(self.labels, key)} {_fmt(cur[-2])}"
+            yield f"{self.name}_count{_labelstr(self.labels, key)} {cur[-1]}"
+
+    def _snapshot(self) -> dict:
+        return {key: {"count": cur[-1], "sum": cur[-2]} for key, cur in self._values.items()}
+
+
+def _labelstr(names: Labels, values: Labels) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)) + "}"
+
+
+# ─────────────────────────────────────────────────────────────
+# 레지스트리 (모듈 전역, 락 하나)
+# ─────────────────────────────────────────────────────────────
+_LOCK = threading.Lock()
+
+REQUESTS = Counter("fetch_requests_total", "HTTP 시도 수 (재시도 포함)", ["source", "report", "status"])
+REQUEST_SECONDS = Histogram("fetch_request_seconds", "HTTP 시도 한 번의 소요 시간(본문 수신까지)", ["source", "report"], LATENCY_BUCKETS)
+RESPONSE_BYTES = Counter("fetch_response_bytes_total", "응답 본문 바이트", ["source", "report"])
+WAIT_SECONDS = Histogram("fetch_wait_seconds", "요청 전 페이서/예산 대기", ["source"], LATENCY_BUCKETS)
+PARSE_SECONDS = Histogram("fetch_parse_seconds", "응답 하나의 파싱 시간", ["source", "report"], PARSE_BUCKETS)
+ROWS = Counter("fetch_rows_total", "파싱된 행 수", ["source", "report"])
+
+_METRICS = (REQUESTS, REQUEST_SECONDS, RESPONSE_BYTES, WAIT_SECONDS, PARSE_SECONDS, ROWS)
+
+
+def _event(kind: str, **fields) -> None:
+    if log.isEnabledFor(logging.INFO):
+        log.info(json.dumps({"event": kind, "ts": round(time.time(), 3), **fields}, ensure_ascii=False))
+
+
+def observe_wait(source: str, seconds: float) -> None:
+    with _LOCK:
+        WAIT_SECONDS.observe((source,), seconds)
+
+
+def observe_request(
+    source: str,
+    report: str,
+    page: Optional[int],
+    status: str,
+    *,
+    seconds: float,
+    nbytes: int = 0,
+    server_seconds: Optional[float] = None,
+    error: str = "",
+) -> None:
+    """
+    HTTP 시도 한 번. status: HTTP 상태코드 문자열, "blocked"(200인데 정상 테이블 아님), "error"(예외).
+    server_seconds: 응답 헤더까지 걸린 시간(requests/httpx의 elapsed). 본문 수신 포함 소요는 seconds.
+    """
+    with _LOCK:
+        REQUESTS.inc((source, report, status))
+        REQUEST_SECONDS.observe((source, report), seconds)
+        if nbytes:
+            RESPONSE_BYTES.inc((source, report), nbytes)
+    _event(
+        "request", source=source, report=report, page=page, status=status, bytes=nbytes,
+        sec=round(seconds, 4), server_sec=None if server_seconds is None else round(server_seconds, 4),
+        **({"error": error[:200]} if error else {}),
+    )
+
+
+def observe_parse(source: str, report: str, page: Optional[int], seconds: float, rows: int) -> None:
+    with _LOCK:
+        PARSE_SECONDS.observe((source, report), seconds)
+        ROWS.inc((source, report), rows)
+    _event("parse", source=source, report=report, page=page, sec=round(seconds, 4), rows=rows)
+
+
+def _observe_response(source: str, report: str, r: Any, t0: float) -> None:
+    # requests.Response / httpx.Response 둘 다 status_code, content, elapsed가 있다
+    observe_request(source, report, None, str(r.status_code), seconds=time.perf_counter() - t0,
+                    nbytes=len(r.content), server_seconds=r.elapsed.total_seconds())
+
+
+def call(source: str, report: str, send: Callable[..., Any], *args, **kw) -> Any:
+    """send(*args, **kw)(requests 등 HTTP 호출) 한 번을 기록하고 응답을 그대로 반환. 예외는 "error"로 기록 후 올린다."""
+    t0 = time.perf_counter()
+    try:
+        r = send(*args, **kw)
+    except Exception as e:
+        observe_request(source, report, None, "error", seconds=time.perf_counter() - t0, error=f"{type(e).__name__}: {e}")
+        raise
+    _observe_response(source, report, r, t0)
+    return r
+
+
+async def acall(source: str, report: str, send: Callable[..., Awaitable[Any]], *args, **kw) -> Any:
+    """call의 비동기 버전 (httpx.AsyncClient 메서드 등)"""
+    t0 = time.perf_counter()
+    try:
+        r = await send(*args, **kw)
+    except Exception as e:
+        observe_request(source, report, None, "error", seconds=time.perf_counter() - t0, error=f"{type(e).__name__}: {e}")
+        raise
+    _observe_response(source, report, r, t0)
+    return r
+
+
+def render() -> str:
+    """Prometheus text exposition format (0.0.4)"""
+    with _LOCK:
+        lines = [line for m in _METRICS for line in m._lines()]
+    return "\n".join(lines) + "\n"
+
+
+def write(path: str) -> None:
+    """render()를 파일로 (node_exporter textfile collector용). 임시 파일 → 교체라 읽는 쪽이 반쪽 파일을 보지 않는다."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        fh.write(render())
+    os.replace(tmp, path)
+
+
+def snapshot() -> Dict[str, dict]:
+    """{메트릭명: {라벨 튜플: 값 | {"count", "sum"}}} — 화면 표시/테스트용"""
+    with _LOCK:
+        return {m.name: m._snapshot() for m in _METRICS}
+
+
+def reset() -> None:
+    with _LOCK:
+        for m in _METRICS:
+            m._values.clear()
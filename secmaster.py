@@ -0,0 +1,185 @@
+# secmaster.py
+# 종목 마스터: KRX 시세 + KOSPI200/KOSDAQ150 편입 + NXT 거래 가능 여부를 단축코드 하나로 묶는다.
+from __future__ import annotations
+
+import datetime
+import threading
+from typing import Dict, Optional, Sequence
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from cache import TTLCache
+from fnc import (
+    get_krx_market_price_info,
+    get_krx_index,
+    get_nxt_listing,
+    NXT_CACHE_TTL,
+    NXT_FAIL_TTL,
+)
+
+__all__ = [
+    "SecurityMaster",
+    "MASTER_COLS",
+    "build_secmaster",
+    "get_secmaster",
+]
+
+KST = ZoneInfo("Asia/Seoul")
+
+# 마스터 컬럼 (인덱스: 단축코드 6자리)
+MASTER_COLS = ["종목명", "시장구분", "시가총액", "상장주식수", "K200", "Q150", "NXT", "NXT비고"]
+
+_FLAG_COLS = ("K200", "Q150", "NXT")
+_TEXT_COLS = ("종목명", "시장구분", "NXT비고")
+
+# (거래일, with_krx) 단위. 마스터 하나가 전 종목 표라서 몇 개만 남기고 오래 안 본 것부터 밀어낸다
+MASTER_CACHE_SIZE = 8
+_MASTERS = TTLCache(maxsize=MASTER_CACHE_SIZE)
+_BUILD_LOCK = threading.Lock()
+
+
+def _code6(s: pd.Series) -> pd.Series:
+    return s.astype(str).str.strip().str.zfill(6)
+
+
+class SecurityMaster:
+    """
+    단축코드(6자리) 인덱스 테이블 + KIND 종목코드(앞 5자리) 인덱스.
+    5자리가 겹치면(보통주 005930 / 우선주 005935) 끝자리가 0인 보통주를 고른다.
+    """
+
+    def __init__(self, trade_date: str, table: pd.DataFrame, *, complete: bool = True):
+        self.trade_date = trade_date
+        self.table = table
+        self.complete = complete    # KRX/NXT 둘 다 받았는지 (아니면 캐시를 짧게)
+        codes = table.index.to_series().astype(str)    # 빈 표는 인덱스가 정수형이라 .str이 안 됨
+        order = pd.DataFrame({
+            "code5": codes.str[:5],
+            "pref": codes.str[-1] != "0",
+            "code": codes,
+        }).sort_values(["code5", "pref", "code"])
+        first = order.drop_duplicates("code5", keep="first")
+        # 5자리 → 6자리 (O(1) dict 조회 + 벡터 map 겸용)
+        self.code5_to_code6: Dict[str, str] = dict(zip(first["code5"], first["code"]))
+        # 단건 조회용 행 사전 (table.loc 보다 수백 배 빠름)
+        self._rows: Dict[str, dict] = dict(zip(table.index, table.to_dict("records")))
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def resolve(self, code: str) -> Optional[str]:
+        """6자리/5자리(KIND) 종목코드 → 마스터 단축코드. 없으면 None."""
+        code = str(code or "").strip()
+        if len(code) == 6 and code in self._rows:
+            return code
+        return self.code5_to_code6.get(code[:5]) if len(code) >= 5 else None
+
+    def lookup(self, code: str) -> Optional[dict]:
+        """종목코드 하나 조회 → {단축코드, 종목명, ...} 또는 None"""
+        c6 = self.resolve(code)
+        if c6 is None:
+            return None
+        return {"단축코드": c6, **self._rows[c6]}
+
+    def resolve_series(self, codes: pd.Series) -> pd.Series:
+        """resolve의 벡터 버전 (못 찾으면 NaN)"""
+        key = codes.astype(str).str.strip()
+        exact = key.where(key.str.len().eq(6) & key.isin(self.table.index))
+        return exact.fillna(key.str[:5].map(self.code5_to_code6))
+
+    def enrich(
+        self,
+        df: pd.DataFrame,
+        code_col: str = "종목코드",
+        cols: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        df[code_col] 기준으로 마스터 컬럼을 붙인 사본. 행 단위 루프 없이 reindex 한 번으로 조인한다.
+        못 찾은 행: 불리언 컬럼은 False, 문자열은 "", 숫자는 NaN.
+        """
+        cols = list(cols or MASTER_COLS)
+        if df is None or df.empty or code_col not in df.columns:
+            return df
+        joined = self.table.reindex(self.resolve_series(df[code_col]))[cols]
+        joined.index = df.index
+        for c in cols:
+            if c in _FLAG_COLS:
+                joined[c] = joined[c].fillna(False).astype(bool)
+            elif c in _TEXT_COLS:
+                joined[c] = joined[c].astype(object).fillna("")
+        return df.drop(columns=[c for c in cols if c in df.columns]).join(joined)
+
+
+def build_secmaster(
+    trdDd: str,
+    *,
+    krx: Optional[pd.DataFrame] = None,
+    index: Optional[pd.DataFrame] = None,
+    nxt: Optional[pd.DataFrame] = None,
+    with_krx: bool = True,
+) -> SecurityMaster:
+    """
+    거래일 trdDd('YYYYMMDD')의 마스터 생성. krx/index/nxt를 주지 않으면 fnc로 조회한다.
+    with_krx=False면 KRX 시세/지수는 조회하지 않는다 (NXT 여부만 필요할 때).
+    어느 한쪽이 실패(빈 DataFrame)해도 나머지로 만든다.
+    """
+    if krx is None:
+        krx = get_krx_market_price_info(trdDd)[1] if with_krx else pd.DataFrame()
+    if index is None:
+        index = get_krx_index(trdDd) if with_krx else pd.DataFrame()
+    if nxt is None:
+        nxt = get_nxt_listing(trdDd).df
+
+    base = pd.DataFrame(columns=["단축코드", "종목명", "시장구분", "시가총액", "상장주식수"])
+    if krx is not None and not krx.empty:
+        base = krx[["단축코드", "종목명", "시장구분", "시가총액", "상장주식수"]].assign(단축코드=lambda d: _code6(d["단축코드"]))
+    base = base.drop_duplicates("단축코드").set_index("단축코드")
+
+    nx = pd.DataFrame(columns=["종목명", "시장구분", "NXT비고"])
+    if nxt is not None and not nxt.empty and "단축코드" in nxt.columns:
+        nx = nxt.assign(단축코드=_code6(nxt["단축코드"]))
+        nx = nx.assign(NXT비고=nx["비고"] if "비고" in nx.columns else "")
+        nx = nx.drop_duplicates("단축코드").set_index("단축코드")[["종목명", "시장구분", "NXT비고"]]
+
+    # 양쪽 다 비면 합집합이 정수 RangeIndex가 되므로 문자열로 고정
+    table = base.reindex(base.index.union(nx.index).astype(str))
+    # KRX에 없는 NXT 종목은 NXT 쪽 이름/시장으로 채움
+    table["종목명"] = table["종목명"].fillna(nx["종목명"].reindex(table.index)).fillna("").astype(str)
+    table["시장구분"] = table["시장구분"].fillna(nx["시장구분"].reindex(table.index)).fillna("").astype("category")
+    table["시가총액"] = pd.to_numeric(table["시가총액"], errors="coerce")
+    table["상장주식수"] = pd.to_numeric(table["상장주식수"], errors="coerce")
+
+    k200 = q150 = pd.Series(dtype=str)
+    if index is not None and not index.empty:
+        idx_codes = _code6(index["단축코드"])
+        k200 = idx_codes[index["지수구분"].eq("K200")]
+        q150 = idx_codes[index["지수구분"].eq("Q150")]
+    table["K200"] = table.index.isin(k200)
+    table["Q150"] = table.index.isin(q150)
+    table["NXT"] = table.index.isin(nx.index)
+    table["NXT비고"] = nx["NXT비고"].reindex(table.index).fillna("").astype(str)
+    table.index.name = "단축코드"
+    return SecurityMaster(trdDd, table[MASTER_COLS], complete=(not base.empty or not with_krx) and not nx.empty)
+
+
+def get_secmaster(trdDd: str, *, with_krx: bool = True) -> SecurityMaster:
+    """
+    거래일 단위 캐시 (당일은 NXT_CACHE_TTL초, 지난 거래일은 만료 없음, 일부 조회 실패 시 NXT_FAIL_TTL초).
+    최대 MASTER_CACHE_SIZE개, 넘치면 오래 안 본 거래일부터 제거.
+    """
+    key = (trdDd, with_krx)
+    sm = _MASTERS.get(key)
+    if sm is not None:
+        return sm
+    with _BUILD_LOCK:
+        sm = _MASTERS.get(key)
+        if sm is None:
+            sm = build_secmaster(trdDd, with_krx=with_krx)
+            past = trdDd < datetime.datetime.now(KST).strftime("%Y%m%d")
+            if not sm.complete:
+                ttl = NXT_FAIL_TTL
+            else:
+                ttl = None if past else NXT_CACHE_TTL
+            _MASTERS.put(key, sm, ttl)
+    return sm
@@ -0,0 +1,167 @@
+# shared.py
+# 레플리카 간 공유 상태 (공유 볼륨의 SQLite 파일 하나, 외부 서비스 없음)
+"""
+같은 호스트의 여러 컨테이너가 공유 볼륨(KIND_SHARED_DIR)에 있는 파일 하나로
+  - 소스 조회 결과(SharedCache): 한 레플리카가 받은 결과를 TTL 동안 다른 레플리카가 그대로 읽고
+  - KIND 요청 예산(TokenBucket): 모든 레플리카를 합쳐 초당 rate건(순간 burst건)만 KIND로 나가게 한다.
+둘 다 WAL 모드 SQLite 트랜잭션으로 프로세스 간 원자성을 보장한다.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+__all__ = [
+    "SharedCache",
+    "TokenBucket",
+    "SHARED_FILE",
+]
+
+SHARED_FILE = "kind_shared.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key     TEXT PRIMARY KEY,
+    expires REAL NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_results_expires ON results (expires);
+CREATE TABLE IF NOT EXISTS buckets (
+    name    TEXT PRIMARY KEY,
+    tokens  REAL NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    # isolation_level=None: BEGIN IMMEDIATE로 쓰기 잠금을 직접 잡는다
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+class SharedCache:
+    """
+    문자열 키 → 피클 값 (만료 시각 포함). 벽시계(time.time) 기준이라 프로세스가 달라도 만료가 맞는다.
+    공유 볼륨은 같은 배포의 레플리카끼리만 쓰는 신뢰 구간이라고 가정한다(피클).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = _connect(path)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM results WHERE key = ? AND expires > ?", (key, time.time())
+            ).fetchone()
+        return default if row is None else pickle.loads(row[0])
+
+    def put(self, key: str, value: Any, ttl: float) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM results WHERE expires <= ?", (now,))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results (key, expires, payload) VALUES (?, ?, ?)",
+                    (key, now + ttl, sqlite3.Binary(blob)),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+
+
+class TokenBucket:
+    """
+    프로세스 간 토큰 버킷. 초당 rate개씩 최대 burst개까지 채워지고, 요청 하나가 토큰 하나를 쓴다.
+    잔량 계산과 차감은 BEGIN IMMEDIATE 트랜잭션 안에서, 부족할 때의 sleep은 트랜잭션 밖에서 한다.
+    """
+
+    def __init__(self, path: str, rate: float, burst: float, *, name: str = "kind"):
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"rate > 0, burst >= 1 이어야 함: rate={rate}, burst={burst}")
+        self.path = path
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.name = name
+        self._lock = threading.Lock()
+        self._conn = _connect(path)
+        self.n_acquired = 0
+        self.waited = 0.0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def configure(self, rate: float, burst: float) -> None:
+        """rate/burst를 제자리에서 변경. 대기 중인 요청이 같은 객체를 계속 쓸 수 있게 연결은 그대로 둔다."""
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"rate > 0, burst >= 1 이어야 함: rate={rate}, burst={burst}")
+        with self._lock:
+            self.rate = float(rate)
+            self.burst = float(burst)
+
+    def _take(self, n: float) -> float:
+        """토큰 n개를 가져가면 0, 부족하면 채워질 때까지 남은 시간(초)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._conn.execute(
+                    "SELECT tokens, updated FROM buckets WHERE name = ?", (self.name,)
+                ).fetchone()
+                tokens = self.burst if row is None else min(self.burst, row[0] + max(0.0, now - row[1]) * self.rate)
+                wait = 0.0
+                if tokens >= n:
+                    tokens -= n
+                else:
+                    wait = (n - tokens) / self.rate
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                    (self.name, tokens, now),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            if wait == 0.0:
+                self.n_acquired += 1
+            return wait
+
+    def acquire(self, n: float = 1.0, *, timeout: Optional[float] = None) -> float:
+        """토큰을 얻을 때까지 대기. 기다린 시간(초) 반환, timeout을 넘기면 TimeoutError."""
+        waited = 0.0
+        while True:
+            wait = self._take(n)
+            if wait <= 0.0:
+                self.waited += waited
+                return waited
+            if timeout is not None and waited + wait > timeout:
+                raise TimeoutError(f"KIND 요청 예산 대기 {timeout}s 초과 ({self.name})")
+            time.sleep(wait)
+            waited += wait
+
+    def status(self) -> dict:
+        return {"rate": self.rate, "burst": self.burst, "acquired": self.n_acquired, "waited_sec": round(self.waited, 3)}
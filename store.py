@@ -0,0 +1,343 @@
+# store.py
+# KIND 공시 로컬 저장소 (SQLite)
+from __future__ import annotations
+
+import datetime
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+__all__ = [
+    "DisclosureStore",
+    "ROW_COLS",
+    "DEFAULT_STORE_PATH",
+]
+
+KST = ZoneInfo("Asia/Seoul")
+DEFAULT_STORE_PATH = os.path.join(".kind_store", "kind.sqlite3")
+
+# 재동기화 마커를 마지막 동기화 시각보다 이만큼(초) 앞당긴다 (KIND 게시 지연 대비)
+CURSOR_MARGIN = 600
+
+# fnc2 결과 컬럼 (페이지는 cat 소스에만 존재)
+ROW_COLS = ["페이지","번호","시간","시장","플래그","회사명","종목코드","공시제목","문서번호","뷰어URL","제출인"]
+_DB_COLS = ["page","no","ts","market","flags","company","code","title","docno","viewer","submitter"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS disclosures (
+    source    TEXT NOT NULL,
+    uid       TEXT NOT NULL,
+    docno     TEXT NOT NULL,
+    day       TEXT NOT NULL,
+    ts        TEXT NOT NULL,
+    page      INTEGER,
+    no        TEXT,
+    market    TEXT,
+    flags     TEXT,
+    company   TEXT,
+    code      TEXT,
+    title     TEXT,
+    viewer    TEXT,
+    submitter TEXT,
+    batch     REAL NOT NULL DEFAULT 0,
+    pos       INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (source, uid)
+);
+CREATE INDEX IF NOT EXISTS ix_disclosures_source_day ON disclosures (source, day);
+CREATE TABLE IF NOT EXISTS coverage (
+    source    TEXT NOT NULL,
+    day       TEXT NOT NULL,
+    complete  INTEGER NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (source, day)
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    source     TEXT NOT NULL,
+    part       TEXT NOT NULL,
+    f          TEXT NOT NULL,
+    t          TEXT NOT NULL,
+    page       INTEGER NOT NULL,
+    done       INTEGER NOT NULL,
+    nrows      INTEGER NOT NULL,
+    started_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (source, part, f, t)
+);
+"""
+
+
+# 예전 파일에 없던 컬럼 (열 때 ALTER TABLE로 추가, 기존 행은 기본값)
+_ADDED_COLS = {
+    "batch": "REAL NOT NULL DEFAULT 0",
+    "pos": "INTEGER NOT NULL DEFAULT 0",
+}
+
+
+def _days(f: str, t: str) -> List[str]:
+    d0 = datetime.date.fromisoformat(f)
+    d1 = datetime.date.fromisoformat(t)
+    return [(d0 + datetime.timedelta(days=i)).isoformat() for i in range((d1 - d0).days + 1)]
+
+
+def _collapse(days: Iterable[str]) -> List[Tuple[str, str]]:
+    """정렬된 'YYYY-MM-DD' 목록 → 연속 구간 [(from, to), ...]"""
+    spans: List[Tuple[str, str]] = []
+    prev: Optional[datetime.date] = None
+    for s in days:
+        d = datetime.date.fromisoformat(s)
+        if prev is not None and d == prev + datetime.timedelta(days=1):
+            spans[-1] = (spans[-1][0], s)
+        else:
+            spans.append((s, s))
+        prev = d
+    return spans
+
+
+class DisclosureStore:
+    """
+    공시 로컬 저장소. 공시는 게시 후 바뀌지 않으므로 (소스, 문서번호)를 키로 한 번만 저장한다.
+    여러 스레드/프로세스가 같은 파일을 쓸 수 있도록 WAL 모드로 연다.
+    커버리지는 (소스, 날짜) 단위로 기록하며, 수집 시작 시점(KST) 기준으로 이미 지난 날짜만
+    complete로 본다. 당일처럼 열려 있는 날짜는 synced_at만 남기고 다음 조회 때 다시 받는다.
+    같은 분(ts)에 올라온 공시는 네트워크 결과와 같은 순서로 읽히도록 저장 단위(batch)와
+    그 안의 목록 위치(pos)를 함께 저장한다.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            have = {r[1] for r in self._conn.execute("PRAGMA table_info(disclosures)")}
+            for col, decl in _ADDED_COLS.items():
+                if col not in have:
+                    self._conn.execute(f"ALTER TABLE disclosures ADD COLUMN {col} {decl}")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ── 커버리지
+    def gaps(self, source: str, f: str, t: str, *, max_open_age: float = 0.0) -> List[Tuple[str, str]]:
+        """
+        [f, t] 중 네트워크로 받아야 하는 구간. complete가 아닌 날짜가 대상이며,
+        열린 날짜라도 max_open_age(초) 안에 동기화됐으면 제외한다.
+        """
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT day, complete, synced_at FROM coverage WHERE source=? AND day BETWEEN ? AND ?",
+                (source, f, t),
+            )
+            known = {day: (complete, synced_at) for day, complete, synced_at in cur}
+        now = time.time()
+        missing = []
+        for day in _days(f, t):
+            state = known.get(day)
+            if state is None:
+                missing.append(day)
+                continue
+            complete, synced_at = state
+            if complete:
+                continue
+            if max_open_age <= 0 or now - synced_at > max_open_age:
+                missing.append(day)
+        return _collapse(missing)
+
+    def coverage(self, source: str) -> List[Tuple[str, str]]:
+        """complete 날짜를 이어붙인 구간 목록"""
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT day FROM coverage WHERE source=? AND complete=1 ORDER BY day", (source,)
+            )
+            days = [r[0] for r in cur]
+        return _collapse(days)
+
+    def synced_at(self, source: str, day: str) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_at FROM coverage WHERE source=? AND day=?", (source, day)
+            ).fetchone()
+        return row[0] if row else None
+
+    def cursor(self, source: str, f: str, t: str) -> Optional[str]:
+        """
+        [f, t]를 다시 받을 때 쓸 since 마커('YYYY-MM-DD HH:MM', KST).
+        모든 날짜가 한 번 이상 동기화됐을 때만, 가장 오래된 동기화 시각 - CURSOR_MARGIN을 돌려준다.
+        그 이전 공시는 이미 저장되어 있으므로 새 페이지만 받으면 된다.
+        """
+        with self._lock:
+            n, oldest = self._conn.execute(
+                "SELECT COUNT(*), MIN(synced_at) FROM coverage WHERE source=? AND day BETWEEN ? AND ?",
+                (source, f, t),
+            ).fetchone()
+        if not n or n < len(_days(f, t)):
+            return None
+        at = datetime.datetime.fromtimestamp(oldest - CURSOR_MARGIN, KST)
+        return at.strftime("%Y-%m-%d %H:%M")
+
+    # ── 쓰기/읽기
+    @staticmethod
+    def _records(source: str, df: Optional[pd.DataFrame], batch: float = 0.0, pos0: int = 0) -> list:
+        """df 행 → INSERT 레코드. pos는 df 안 순서 (pos0부터)"""
+        records = []
+        if df is None or df.empty:
+            return records
+        page = df["페이지"] if "페이지" in df.columns else pd.Series([None] * len(df), index=df.index)
+        for i, (pg, no, ts, market, flags, company, code, title, docno, viewer, submitter) in enumerate(zip(
+            page, df["번호"], df["시간"], df["시장"], df["플래그"], df["회사명"], df["종목코드"],
+            df["공시제목"], df["문서번호"], df["뷰어URL"], df["제출인"],
+        )):
+            ts, docno = str(ts), str(docno)
+            # 문서번호가 없는 행(뷰어 링크 없음)은 시간/회사/제목으로 대신 식별
+            uid = docno or f"{ts}|{company}|{title}"
+            records.append((
+                source, uid, docno, ts[:10], ts,
+                None if pd.isna(pg) else int(pg),
+                no, market, flags, company, code, title, viewer, submitter,
+                batch, pos0 + i,
+            ))
+        return records
+
+    def _insert(self, records: list) -> None:
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO disclosures "
+            "(source, uid, docno, day, ts, page, no, market, flags, company, code, title, "
+            "viewer, submitter, batch, pos) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+            records,
+        )
+
+    def _cover(self, source: str, f: str, t: str, started_at: float) -> None:
+        today = datetime.datetime.fromtimestamp(started_at, KST).date().isoformat()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO coverage (source, day, complete, synced_at) VALUES (?,?,?,?)",
+            [(source, day, int(day < today), started_at) for day in _days(f, t)],
+        )
+
+    def put(
+        self,
+        source: str,
+        df: Optional[pd.DataFrame],
+        f: str,
+        t: str,
+        *,
+        started_at: Optional[float] = None,
+        replace: bool = False,
+        cover: bool = True,
+    ) -> int:
+        """
+        [f, t] 구간을 수집한 결과 저장 + 커버리지 기록. 저장한 행 수 반환.
+        replace: 구간 전체를 다시 받은 결과로 보고 그 구간의 기존 행을 지운 뒤 저장 (강제 새로조회)
+        cover=False: 행만 저장하고 커버리지는 그대로 (max_pages에서 끊겨 구간을 다 못 받은 경우).
+        구간을 다 받지 못했으면 replace여도 기존 행은 지우지 않는다.
+        df는 네트워크 결과 순서 그대로 넘긴다 (같은 시각 행의 읽기 순서가 된다).
+        """
+        started_at = time.time() if started_at is None else started_at
+        records = self._records(source, df, started_at)
+        with self._lock:
+            with self._conn:
+                if replace and cover:
+                    self._conn.execute(
+                        "DELETE FROM disclosures WHERE source=? AND day BETWEEN ? AND ?", (source, f, t)
+                    )
+                self._insert(records)
+                if cover:
+                    self._cover(source, f, t, started_at)
+        return len(records)
+
+    def mark_covered(self, source: str, f: str, t: str, *, started_at: float) -> None:
+        """행은 이미 저장된 [f, t] 구간의 커버리지만 기록 (backfill 샤드 완료 시)"""
+        with self._lock:
+            with self._conn:
+                self._cover(source, f, t, started_at)
+
+    # ── backfill 체크포인트: (소스, 파트(reportCd 등), 샤드 구간)별 마지막으로 저장한 페이지
+    def checkpoint(self, source: str, part: str, f: str, t: str) -> Tuple[int, bool, Optional[float]]:
+        """(마지막 저장 페이지, 완료 여부, 첫 페이지 수집 시각). 기록이 없으면 (0, False, None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT page, done, started_at FROM checkpoints WHERE source=? AND part=? AND f=? AND t=?",
+                (source, part, f, t),
+            ).fetchone()
+        return (row[0], bool(row[1]), row[2]) if row else (0, False, None)
+
+    def save_page(
+        self,
+        source: str,
+        part: str,
+        f: str,
+        t: str,
+        page: int,
+        df: Optional[pd.DataFrame],
+        *,
+        done: bool,
+        pos: int = 0,
+    ) -> int:
+        """
+        페이지 하나의 행과 체크포인트를 한 트랜잭션으로 기록 (중간에 죽어도 둘이 어긋나지 않음).
+        pos: 이 페이지 첫 행의 목록 위치. 파트/페이지 순서대로 커지게 넘기면 read가 네트워크 결과와 같은 순서가 된다.
+        """
+        now = time.time()
+        records = self._records(source, df, 0.0, pos)
+        with self._lock:
+            with self._conn:
+                self._insert(records)
+                self._conn.execute(
+                    "INSERT INTO checkpoints (source, part, f, t, page, done, nrows, started_at, updated_at) "
+                    "VALUES (?,?,?,?,?,?,?,?,?) "
+                    "ON CONFLICT (source, part, f, t) DO UPDATE SET "
+                    "page=excluded.page, done=excluded.done, nrows=nrows + excluded.nrows, "
+                    "updated_at=excluded.updated_at",
+                    (source, part, f, t, page, int(done), len(records), now, now),
+                )
+        return len(records)
+
+    def clear_checkpoints(self, source: Optional[str] = None) -> None:
+        with self._lock:
+            with self._conn:
+                if source is None:
+                    self._conn.execute("DELETE FROM checkpoints")
+                else:
+                    self._conn.execute("DELETE FROM checkpoints WHERE source=?", (source,))
+
+    def read(self, source: str, f: str, t: str, *, with_page: bool = False) -> pd.DataFrame:
+        """
+        [f, t] 구간 공시. 시간 내림차순, 같은 시간은 나중에 저장한 것 먼저 → 저장 당시 목록 순서
+        (merge_frames와 같은 순서). 위치가 없는 예전 행끼리는 문서번호 내림차순. 없으면 빈 DataFrame.
+        """
+        with self._lock:
+            cur = self._conn.execute(
+                f"SELECT {', '.join(_DB_COLS)} FROM disclosures "
+                "WHERE source=? AND day BETWEEN ? AND ? ORDER BY ts DESC, batch DESC, pos, docno DESC",
+                (source, f, t),
+            )
+            rows = cur.fetchall()
+        if not rows:
+            return pd.DataFrame()
+        df = pd.DataFrame(rows, columns=ROW_COLS)
+        if not with_page:
+            df = df.drop(columns="페이지")
+        return df
+
+    def clear(self, source: Optional[str] = None) -> None:
+        with self._lock:
+            with self._conn:
+                if source is None:
+                    self._conn.execute("DELETE FROM disclosures")
+                    self._conn.execute("DELETE FROM coverage")
+                    self._conn.execute("DELETE FROM checkpoints")
+                else:
+                    self._conn.execute("DELETE FROM disclosures WHERE source=?", (source,))
+                    self._conn.execute("DELETE FROM coverage WHERE source=?", (source,))
+                    self._conn.execute("DELETE FROM checkpoints WHERE source=?", (source,))
@@ -0,0 +1,46 @@
+# tests/conftest.py
+# 리플레이 서버(benchmarks/replay_server.py)를 세션 동안 띄우고, fnc2/fnc/menu2가 그쪽을 보게 한다.
+#   python -m pytest -q
+"""
+KIND_BASE_URL 등은 fnc2/fnc import 시점에 읽으므로 서버 시작과 환경변수 설정을 이 파일 import 때 한다.
+저장소(KIND_STORE_PATH)는 끄고, 페이서 지연은 0으로 둔다 — 테스트는 요청 간격이 아니라 결과를 본다.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.replay_server import ReplayServer  # noqa: E402
+
+_SERVER = ReplayServer().start()
+os.environ.update(_SERVER.env())
+os.environ["KIND_STORE_PATH"] = ""
+os.environ.pop("KIND_SHARED_DIR", None)
+
+import fnc2  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def replay() -> ReplayServer:
+    return _SERVER
+
+
+@pytest.fixture(autouse=True)
+def _isolated():
+    """테스트마다 소스 캐시/저장소/페이서를 비운 상태로 시작"""
+    fnc2.use_store(None)
+    fnc2._SOURCE_CACHE.clear()
+    fnc2._PACER.floor = fnc2._PACER.first = 0.0
+    fnc2._PACER.reset()
+    _SERVER.p403 = _SERVER.pblock = 0.0
+    _SERVER.reset_stats()
+    yield
+    fnc2.use_store(None)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    _SERVER.stop()
@@ -0,0 +1,86 @@
+# tests/test_backfill.py
+# backfill: 중간 실패 후 재실행하면 빠짐없이 이어 받는지, 열린 날짜/ max_pages 처리
+import datetime
+
+import pytest
+
+import backfill
+import fnc2
+from store import DisclosureStore
+
+F, T = "2025-07-01", "2025-07-10"
+
+
+@pytest.fixture
+def store(tmp_path):
+    st = DisclosureStore(str(tmp_path / "kind.sqlite3"))
+    yield st
+    st.close()
+
+
+def test_resume_after_failure_matches_full_fetch(replay, store, monkeypatch):
+    expected = fnc2.kind_fetch("mgmt", F, T, page_size=10)
+    pages = replay.stats["kind"]
+    real = fnc2._post_kind
+    calls = []
+
+    def flaky(*args, **kw):
+        calls.append(1)
+        if len(calls) == 3:
+            raise RuntimeError("KIND 응답이 정상 테이블이 아님")
+        return real(*args, **kw)
+
+    monkeypatch.setattr(fnc2, "_post_kind", flaky)
+    with pytest.raises(RuntimeError):
+        backfill.backfill("mgmt", F, T, store, shard=None, page_size=10)
+    assert store.checkpoint("cat:0350", "0350", F, T)[:2] == (2, False)
+    assert store.coverage("cat:0350") == []
+
+    monkeypatch.setattr(fnc2, "_post_kind", real)
+    replay.reset_stats()
+    backfill.backfill("mgmt", F, T, store, shard=None, page_size=10)
+    assert replay.stats.get("kind", 0) == pages - 2     # 3페이지부터 재개
+    assert store.coverage("cat:0350") == [(F, T)]
+    assert set(store.read("cat:0350", F, T)["문서번호"]) == set(expected["문서번호"])
+
+
+def test_open_days_are_clamped(replay, store):
+    today = datetime.datetime.now(fnc2.KST).date()
+    f = (today - datetime.timedelta(days=3)).isoformat()
+    yesterday = (today - datetime.timedelta(days=1)).isoformat()
+
+    backfill.backfill("overheat", f, today.isoformat(), store, shard=None)
+    assert store.coverage("overheat") == [(f, yesterday)]
+    assert store.gaps("overheat", today.isoformat(), today.isoformat()) == [(today.isoformat(),) * 2]
+    assert backfill.backfill("overheat", today.isoformat(), today.isoformat(), store) == 0
+
+
+def test_max_pages_cut_is_not_done(replay, store):
+    backfill.backfill("mgmt", F, T, store, shard=None, page_size=10, max_pages=2)
+    assert store.checkpoint("cat:0350", "0350", F, T)[:2] == (2, False)
+    assert store.coverage("cat:0350") == []
+
+    # max_pages를 늘려 다시 돌리면 3페이지부터 이어 받아 끝낸다
+    backfill.backfill("mgmt", F, T, store, shard=None, page_size=10)
+    assert store.coverage("cat:0350") == [(F, T)]
+
+
+def test_capped_checkpoint_is_reported_and_resumes_from_cli(replay, store, tmp_path, caplog):
+    kw = dict(shard="week", page_size=5, max_pages=1)
+    backfill.backfill("mgmt", F, T, store, **kw)
+    assert store.coverage("cat:0350") == []
+
+    # 같은 한도로 다시 돌리면 KIND에 안 가고 막힌 체인을 알린다
+    replay.reset_stats()
+    with caplog.at_level("WARNING", logger="backfill"):
+        assert backfill.backfill("mgmt", F, T, store, **kw) == 0
+    assert replay.stats.get("kind", 0) == 0
+    assert "미완료" in caplog.text and "0350" in caplog.text
+
+    # CLI에서 --max-pages를 늘리면 끊긴 다음 페이지부터 이어 받아 끝낸다
+    backfill.main(["mgmt", "--from", F, "--to", T, "--shard", "week", "--store", str(tmp_path / "kind.sqlite3"),
+                   "--page-size", "5", "--max-pages", "50"])
+    assert replay.stats.get("kind", 0) > 0
+    assert store.coverage("cat:0350") == [(F, T)]
+    expected = fnc2.kind_fetch("mgmt", F, T, page_size=100)
+    assert set(store.read("cat:0350", F, T)["문서번호"]) == set(expected["문서번호"])
@@ -0,0 +1,71 @@
+# tests/test_metrics.py
+# metrics: 기록한 시도/대기/파싱이 snapshot과 Prometheus 텍스트에 그대로 나오는지, 워밍업/진단도 계측되는지
+import datetime
+
+import pytest
+
+import afnc2
+import fnc2
+import metrics
+
+
+class _Resp:
+    def __init__(self, status: int, body: bytes, server: float):
+        self.status_code, self.content = status, body
+        self.elapsed = datetime.timedelta(seconds=server)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_snapshot_and_render():
+    metrics.observe_wait("kind", 0.2)
+    metrics.observe_request("kind", "01", 1, "200", seconds=0.3, nbytes=100)
+    metrics.observe_request("kind", "01", 2, "403", seconds=0.1)
+    metrics.call("krx", "MDCSTAT01501", lambda: _Resp(200, b"x" * 7, 0.05))
+    with pytest.raises(OSError):
+        metrics.call("nxt", "brdinfoTimeList", lambda: (_ for _ in ()).throw(OSError("down")))
+    metrics.observe_parse("kind", "01", 1, 0.004, 15)
+
+    snap = metrics.snapshot()
+    assert snap["fetch_requests_total"] == {
+        ("kind", "01", "200"): 1, ("kind", "01", "403"): 1,
+        ("krx", "MDCSTAT01501", "200"): 1, ("nxt", "brdinfoTimeList", "error"): 1,
+    }
+    assert snap["fetch_request_seconds"][("kind", "01")]["count"] == 2
+    assert snap["fetch_request_seconds"][("kind", "01")]["sum"] == pytest.approx(0.4)
+    assert snap["fetch_response_bytes_total"] == {("kind", "01"): 100, ("krx", "MDCSTAT01501"): 7}
+    assert snap["fetch_wait_seconds"][("kind",)]["count"] == 1
+    assert snap["fetch_rows_total"] == {("kind", "01"): 15}
+
+    text = metrics.render()
+    assert "# TYPE fetch_requests_total counter" in text
+    assert 'fetch_requests_total{source="kind",report="01",status="403"} 1' in text
+    assert 'fetch_request_seconds_bucket{source="kind",report="01",le="0.25"} 1' in text
+    assert 'fetch_request_seconds_bucket{source="kind",report="01",le="+Inf"} 2' in text
+    assert 'fetch_request_seconds_count{source="kind",report="01"} 2' in text
+    assert 'fetch_response_bytes_total{source="krx",report="MDCSTAT01501"} 7' in text
+
+    metrics.reset()
+    assert all(v == {} for v in metrics.snapshot().values())
+
+
+def test_warmup_is_recorded(replay):
+    fnc2.reset_session()
+    fnc2.get_session()
+    got = {k[1] for k in metrics.snapshot()["fetch_requests_total"]}
+    assert {"warmup:loadInitPage", "warmup:searchDetailsMain"} <= got
+
+    metrics.reset()
+
+    async def _open():
+        async with afnc2.AsyncKind():
+            pass
+
+    afnc2.run_sync(_open())
+    got = {k[1] for k in metrics.snapshot()["fetch_requests_total"]}
+    assert {"warmup:loadInitPage", "warmup:searchDetailsMain"} <= got
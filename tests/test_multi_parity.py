@@ -0,0 +1,51 @@
+# tests/test_multi_parity.py
+# 모아보기(menu2._fetch_multi) = 예전 카테고리별 수집 경로와 같은 행
+import fnc2
+import menu2
+
+F, T = "2025-07-01", "2025-07-31"
+
+
+def _old_multi(f: str, t: str, page_size: int = 100):
+    """묶음 조회 이전: cat 4종을 각각 받고 halt에만 HALT_PATTERN"""
+    src = {name: fnc2.fetch_source(name, f, t, page_size=page_size)
+           for name in ("halt", "mgmt", "alert", "misc", "mw", "inv", "overheat")}
+    df_halt = menu2._merge_halt_and_mw(menu2._only_halt(src["halt"]), menu2._drop_pref(src["mw"]))
+    return fnc2.merge_frames([df_halt, src["mgmt"], src["alert"], src["misc"],
+                              menu2._drop_pref(src["inv"]), menu2._drop_pref(src["overheat"])])
+
+
+def _canon(df):
+    # 목록 안 위치(번호/페이지)와 같은 시각 행의 순서는 묶음 여부에 따라 달라진다
+    cols = [c for c in df.columns if c not in ("번호", "페이지")]
+    return df[cols].sort_values("문서번호").reset_index(drop=True)
+
+
+def test_multi_matches_per_category_path(replay):
+    new = menu2._fetch_multi(F, T)
+    fnc2.clear_source_cache()
+    old = _old_multi(F, T)
+
+    assert len(new) == len(old)
+    assert set(new["문서번호"]) == set(old["문서번호"])
+    assert _canon(new).equals(_canon(old))
+    # 최신순은 그대로
+    assert new[fnc2.TS_COL].is_monotonic_decreasing
+
+
+def test_halt_rows_are_title_filtered(replay):
+    new = menu2._fetch_multi(F, T)
+    halt = fnc2.fetch_source("halt", F, T, page_size=100)
+    dropped = set(halt["문서번호"]) - set(menu2._only_halt(halt)["문서번호"])
+    assert dropped, "리플레이 데이터에 HALT_PATTERN에 안 맞는 halt 행이 있어야 의미 있는 테스트"
+    assert not dropped & set(new["문서번호"])
+
+
+def test_multi_batches_non_halt_categories(replay):
+    menu2._fetch_multi(F, T)
+    assert "카테고리" not in fnc2.fetch_source("many", F, T, page_size=100, categories=menu2.MULTI_BATCH_CATS).columns
+
+
+def test_collector_fills_the_batch_source_key():
+    import collector
+    assert collector.MULTI_BATCH_CATS == menu2.MULTI_BATCH_CATS
@@ -0,0 +1,19 @@
+# tests/test_nxt_cache.py
+# get_nxt_listing 거래일 캐시는 NXT_CACHE_SIZE를 넘지 않는다
+import datetime
+
+import fnc
+
+
+def test_nxt_cache_is_bounded(replay, monkeypatch):
+    monkeypatch.setattr(fnc, "_NXT_CACHE", fnc.TTLCache(maxsize=3))
+    days = [(datetime.date(2025, 7, 1) + datetime.timedelta(days=i)).strftime("%Y%m%d") for i in range(5)]
+    for d in days:
+        fnc.get_nxt_listing(d, snapshot_dir="")
+    assert len(fnc._NXT_CACHE) == 3
+
+    replay.reset_stats()
+    fnc.get_nxt_listing(days[-1], snapshot_dir="")     # 최근 날짜는 남아 있음
+    assert replay.stats.get("nxt", 0) == 0
+    fnc.get_nxt_listing(days[0], snapshot_dir="")      # 가장 오래 안 본 날짜는 밀려남
+    assert replay.stats.get("nxt", 0) == 1
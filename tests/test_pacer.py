@@ -0,0 +1,22 @@
+# tests/test_pacer.py
+# _Pacer: 백오프/복귀와 reset
+import fnc2
+
+
+def test_backoff_recover_and_reset():
+    p = fnc2._Pacer(floor=0.0, first=0.5, ceiling=2.0, recover_after=2)
+    p.fail()
+    p.fail()
+    assert p.delay == 1.0 and p._next_at > 0
+    p.ok()
+    p.ok()
+    assert p.delay == 0.5 and p.n_recover == 1
+    p.ok()
+    assert p.ok_streak == 1
+
+    p.reset()
+    assert p.delay == p.floor == 0.0
+    assert p._next_at == 0.0 and p.ok_streak == 0
+    assert p.status() == {"delay": 0.0, "ok_streak": 0, "degraded": False, "ok": 0, "fail": 0,
+                          "backoff": 0, "recover": 0, "waited_sec": 0.0}
+    assert p.reserve() == 0.0
@@ -0,0 +1,32 @@
+# tests/test_parse.py
+# 목록 파서: lxml 경로와 BeautifulSoup 경로가 같은 행을 내는지
+import pytest
+
+import fnc2
+from benchmarks.synth import synth_blocked_page, synth_page, synth_rows
+
+pytest.importorskip("lxml")
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_lxml_matches_bs4(seed):
+    rows = synth_rows(500, seed=seed)
+    for i in range(0, len(rows), 100):
+        html = synth_page(rows[i:i + 100])
+        got = fnc2._parse_rows_lxml(html)
+        assert got == fnc2._parse_rows_bs4(html)
+        assert len(got) == len(rows[i:i + 100])
+
+
+def test_parsed_fields():
+    r = synth_rows(1, seed=3)[0]
+    row = fnc2._parse_rows_lxml(synth_page([dict(r, 번호="7", variant=1)]))[0]
+    cols = dict(zip(fnc2.ROW_COLS, row))
+    assert cols["번호"] == "7"
+    assert (cols["시간"], cols["회사명"], cols["종목코드"]) == (r["시간"], r["회사명"], r["종목코드"])
+    assert (cols["공시제목"], cols["문서번호"], cols["제출인"]) == (r["공시제목"], r["문서번호"], r["제출인"])
+
+
+def test_empty_and_blocked_pages():
+    for html in (synth_page([]), synth_blocked_page()):
+        assert fnc2._parse_rows_lxml(html) == fnc2._parse_rows_bs4(html) == []
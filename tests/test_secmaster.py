@@ -0,0 +1,41 @@
+# tests/test_secmaster.py
+# 종목 마스터: 리플레이 KRX/NXT로 만든 표의 조회·조인, 거래일 캐시 크기
+import pandas as pd
+
+import fnc
+import secmaster
+
+DAY = "20250731"
+
+
+def test_master_lookup_and_enrich(replay):
+    sm = secmaster.get_secmaster(DAY)
+    assert sm.complete and not sm.table.empty
+    code6 = sm.table.index[0]
+    assert sm.lookup(code6)["종목명"] == sm.table.iloc[0]["종목명"]
+
+    df = pd.DataFrame({"종목코드": [code6, "999999"]})
+    out = sm.enrich(df, "종목코드", ["종목명", "NXT"])
+    assert out.loc[0, "종목명"] == sm.table.iloc[0]["종목명"]
+    assert out.loc[1, "종목명"] == "" and not out.loc[1, "NXT"]     # 못 찾은 행
+
+
+def test_master_cache_is_bounded(replay, monkeypatch):
+    monkeypatch.setattr(secmaster, "_MASTERS", secmaster.TTLCache(maxsize=2))
+    for d in ("20250728", "20250729", "20250730"):
+        secmaster.get_secmaster(d, with_krx=False)
+    assert len(secmaster._MASTERS) == 2
+
+    fnc.clear_nxt_cache()
+    replay.reset_stats()
+    secmaster.get_secmaster("20250730", with_krx=False)
+    assert replay.stats.get("nxt", 0) == 0
+
+
+def test_master_builds_empty_when_every_source_fails():
+    # with_krx=False 경로에서 NXT까지 실패한 경우: 예외 대신 빈 마스터
+    sm = secmaster.build_secmaster(DAY, krx=pd.DataFrame(), index=pd.DataFrame(), nxt=pd.DataFrame(), with_krx=False)
+    assert len(sm) == 0 and not sm.complete
+    assert sm.code5_to_code6 == {} and sm.lookup("005930") is None
+    df = pd.DataFrame({"종목코드": ["005930"]})
+    assert sm.enrich(df, "종목코드", ["종목명", "NXT"]).loc[0, "종목명"] == ""
@@ -0,0 +1,18 @@
+# tests/test_session.py
+# reset_session: 다른 스레드가 쥔 세션을 닫지 않고 교체만 하는지
+import fnc2
+
+
+def test_reset_keeps_held_session_usable(replay, monkeypatch):
+    held, gen = fnc2.get_session()
+    closed = []
+    monkeypatch.setattr(held, "close", lambda: closed.append(1))
+    fnc2.reset_session()
+    assert not closed
+    fresh, new_gen = fnc2.get_session()
+    assert fresh is not held and new_gen == gen + 1
+
+    # 진행 중이던 요청은 예전 세션으로 끝까지 받을 수 있어야 한다
+    data = fnc2._warn_payload(fnc2.TARGET_OVERHEAT, "2025-07-01", "2025-07-31", 15, 1)
+    html = fnc2._post_kind(data, label="held", headers=fnc2.HEADERS_MENU_WARN, session=held)
+    assert fnc2._looks_like_valid_kind_table(html)
@@ -0,0 +1,83 @@
+# tests/test_shared.py
+# use_shared: 다시 연결/속도 변경/해제 시 잡혀 있는 객체를 깨뜨리지 않고, 버려진 연결은 정리되는지
+import gc
+import sqlite3
+import threading
+import weakref
+
+import pytest
+
+import fnc2
+
+
+def _closed(obj) -> bool:
+    try:
+        obj._conn.execute("SELECT 1")
+    except sqlite3.ProgrammingError:
+        return True
+    return False
+
+
+@pytest.fixture
+def shared_dir(tmp_path):
+    yield str(tmp_path)
+    fnc2.use_shared(None)
+
+
+def test_same_settings_keep_connection(shared_dir):
+    shared = fnc2.use_shared(shared_dir, rate=4, burst=8)
+    budget = fnc2._BUDGET
+    assert fnc2.use_shared(shared_dir, rate=4, burst=8) is shared
+    assert fnc2._BUDGET is budget and not _closed(budget)
+
+
+def test_rate_change_updates_bucket_in_place(shared_dir):
+    shared = fnc2.use_shared(shared_dir, rate=4, burst=8)
+    budget = fnc2._BUDGET
+    assert fnc2.use_shared(shared_dir, rate=2, burst=8) is shared
+    assert fnc2._BUDGET is budget and (budget.rate, budget.burst) == (2.0, 8.0)
+    assert not _closed(shared) and not _closed(budget)
+
+
+def test_rate_change_while_thread_holds_bucket(shared_dir):
+    # _post_kind처럼 버킷을 잡아 둔 채 acquire를 계속하는 스레드가 있어도 속도 변경이 끼어들 수 있어야 한다
+    fnc2.use_shared(shared_dir, rate=1000, burst=1)
+    held = fnc2._BUDGET
+    errors, stop = [], threading.Event()
+
+    def worker():
+        try:
+            while not stop.is_set():
+                held.acquire(timeout=5)
+        except Exception as e:     # noqa: BLE001 — 스레드 안 예외를 본 스레드로 넘긴다
+            errors.append(e)
+
+    th = threading.Thread(target=worker)
+    th.start()
+    try:
+        for rate in (500, 2000, 800, 1000):
+            fnc2.use_shared(shared_dir, rate=rate, burst=1)
+    finally:
+        stop.set()
+        th.join(10)
+    assert not errors and held.n_acquired > 0
+    assert fnc2._BUDGET is held and held.rate == 1000.0
+
+
+def test_switch_and_reset_release_old_connections(shared_dir, tmp_path):
+    fnc2.use_shared(shared_dir)
+    held = fnc2._BUDGET                     # 진행 중인 요청이 잡고 있는 버킷
+    shared_ref = weakref.ref(fnc2._SHARED)
+    other = tmp_path / "other"
+    other.mkdir()
+    fnc2.use_shared(str(other))
+    assert fnc2._BUDGET is not held
+    held.acquire()                          # 잡고 있던 쪽은 닫히지 않고 끝까지 쓸 수 있다
+    gc.collect()
+    assert shared_ref() is None             # 아무도 안 잡은 쪽은 참조가 끊기면서 정리된다
+
+    budget_ref = weakref.ref(fnc2._BUDGET)
+    assert fnc2.use_shared(None) is None
+    assert fnc2._SHARED is None and fnc2._BUDGET is None
+    gc.collect()
+    assert budget_ref() is None
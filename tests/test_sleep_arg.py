@@ -0,0 +1,21 @@
+# tests/test_sleep_arg.py
+# 공개 fetcher의 sleep 인자: 값은 무시하고, 넘기면 DeprecationWarning
+import warnings
+
+import pytest
+
+import fnc2
+
+F, T = "2025-07-01", "2025-07-03"
+
+
+@pytest.mark.parametrize("fetch", [
+    fnc2.fetch_investor_warning, fnc2.fetch_shortterm_overheat, fnc2.fetch_market_watch, fnc2.fetch_delist,
+])
+def test_sleep_is_deprecated(replay, fetch):
+    with pytest.warns(DeprecationWarning, match="sleep"):
+        with_sleep = fetch(F, T, sleep=5)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        without = fetch(F, T)
+    assert with_sleep.equals(without)
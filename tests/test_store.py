@@ -0,0 +1,144 @@
+# tests/test_store.py
+# 공시 로컬 저장소: 커버리지(gaps/coverage), fetcher 경유(_through_store), force, max_pages 끊김
+import datetime
+import time
+
+import pandas as pd
+import pytest
+
+import fnc2
+from store import DisclosureStore, KST
+
+F, T = "2025-07-01", "2025-07-10"
+
+
+def _row(ts: str, docno: str, title: str = "공시") -> dict:
+    return {"번호": "1", "시간": ts, "시장": "유", "플래그": "", "회사명": "회사", "종목코드": "00001",
+            "공시제목": title, "문서번호": docno, "뷰어URL": "", "제출인": "제출인"}
+
+
+@pytest.fixture
+def store(tmp_path):
+    st = fnc2.use_store(str(tmp_path / "kind.sqlite3"))
+    yield st
+    fnc2.use_store(None)
+
+
+def _kind_requests(replay) -> int:
+    return replay.stats.get("kind", 0)
+
+
+def test_coverage_and_gaps(tmp_path):
+    st = DisclosureStore(str(tmp_path / "s.sqlite3"))
+    try:
+        assert st.gaps("inv", F, T) == [(F, T)]
+        st.put("inv", pd.DataFrame([_row("2025-07-03 09:00", "20250703000001")]), "2025-07-02", "2025-07-04")
+        assert st.coverage("inv") == [("2025-07-02", "2025-07-04")]
+        assert st.gaps("inv", F, T) == [(F, F), ("2025-07-05", T)]
+        assert st.gaps("mw", F, T) == [(F, T)]   # 소스별
+
+        # 당일(열린 날짜)은 complete가 아니라 다시 받되, max_open_age 안이면 건너뛴다
+        today = datetime.datetime.now(KST).date().isoformat()
+        st.put("inv", None, today, today)
+        assert st.gaps("inv", today, today) == [(today, today)]
+        assert st.gaps("inv", today, today, max_open_age=60) == []
+    finally:
+        st.close()
+
+
+def test_put_without_cover_keeps_gap(tmp_path):
+    st = DisclosureStore(str(tmp_path / "s.sqlite3"))
+    try:
+        st.put("inv", pd.DataFrame([_row("2025-07-03 09:00", "20250703000001")]), F, T, cover=False)
+        assert len(st.read("inv", F, T)) == 1
+        assert st.coverage("inv") == []
+        assert st.gaps("inv", F, T) == [(F, T)]
+    finally:
+        st.close()
+
+
+def test_fetcher_reads_covered_range_from_store(replay, store):
+    first = fnc2.fetch_investor_warning(F, T)
+    assert _kind_requests(replay) > 0
+    assert store.coverage("inv") == [(F, T)]
+
+    replay.reset_stats()
+    again = fnc2.fetch_investor_warning("2025-07-03", "2025-07-05")
+    assert _kind_requests(replay) == 0
+    assert set(again["문서번호"]) == set(first.loc[first["시간"].str[:10].between("2025-07-03", "2025-07-05"), "문서번호"])
+
+
+def test_max_pages_truncation_is_not_covered(replay, store):
+    cut = fnc2.kind_fetch("mgmt", F, T, page_size=10, max_pages=2)
+    assert 0 < len(cut) <= 20
+    assert store.coverage("cat:0350") == []
+
+    # 다음 조회는 구간 전체를 다시 받아 빠진 행까지 채우고 그때 커버리지를 기록한다
+    full = fnc2.kind_fetch("mgmt", F, T, page_size=10)
+    assert len(full) > len(cut)
+    assert store.coverage("cat:0350") == [(F, T)]
+
+    replay.reset_stats()
+    fnc2.kind_fetch("mgmt", F, T, page_size=10, max_pages=2)
+    assert _kind_requests(replay) == 0
+
+
+def test_force_rewrites_range(replay, store):
+    fnc2.fetch_shortterm_overheat(F, T)
+    # 저장소에만 있는 (KIND에서 사라진) 행과 오래된 동기화 시각
+    store.put("overheat", pd.DataFrame([_row("2025-07-05 10:00", "20250705999999", "유령")]), F, T,
+              started_at=time.time() - 86400)
+    assert "20250705999999" in set(fnc2.fetch_shortterm_overheat(F, T)["문서번호"])
+    before = store.synced_at("overheat", F)
+
+    replay.reset_stats()
+    df = fnc2.fetch_source("overheat", F, T, force=True)
+    assert _kind_requests(replay) > 0
+    assert "20250705999999" not in set(df["문서번호"])
+    assert store.synced_at("overheat", F) > before
+    assert store.coverage("overheat") == [(F, T)]
+
+
+def test_store_read_keeps_network_order(replay, store):
+    # 같은 분에 올라온 공시가 많은 소스: 저장소를 거쳐도 네트워크 결과와 행 순서까지 같아야 한다
+    fnc2.use_store(None)
+    live = fnc2.fetch_market_watch(F, T, page_size=100)
+    assert live["시간"].duplicated().any()
+    fnc2.use_store(store.path)
+    first = fnc2.fetch_market_watch(F, T, page_size=100)      # KIND → 저장 → 읽기
+    again = fnc2.fetch_market_watch(F, T, page_size=100)      # 저장소만
+    assert list(first["문서번호"]) == list(live["문서번호"])
+    assert list(again["문서번호"]) == list(live["문서번호"])
+
+
+def test_backfill_rows_read_in_network_order(replay, tmp_path):
+    import backfill
+
+    live = fnc2.fetch_investor_warning(F, T, page_size=10)
+    st = DisclosureStore(str(tmp_path / "s.sqlite3"))
+    try:
+        backfill.backfill("inv", F, T, st, page_size=10)
+        assert list(st.read("inv", F, T)["문서번호"]) == list(live["문서번호"])
+    finally:
+        st.close()
+
+
+def test_old_store_file_gets_position_columns(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "old.sqlite3")
+    con = sqlite3.connect(path)
+    con.execute("CREATE TABLE disclosures (source TEXT NOT NULL, uid TEXT NOT NULL, docno TEXT NOT NULL, "
+                "day TEXT NOT NULL, ts TEXT NOT NULL, page INTEGER, no TEXT, market TEXT, flags TEXT, "
+                "company TEXT, code TEXT, title TEXT, viewer TEXT, submitter TEXT, PRIMARY KEY (source, uid))")
+    con.execute("INSERT INTO disclosures VALUES ('inv','d1','d1','2025-07-03','2025-07-03 09:00',"
+                "NULL,'1','유','','회사','00001','공시','','제출인')")
+    con.commit()
+    con.close()
+
+    st = DisclosureStore(path)
+    try:
+        st.put("inv", pd.DataFrame([_row("2025-07-03 09:00", "d2")]), "2025-07-03", "2025-07-03")
+        assert list(st.read("inv", F, T)["문서번호"]) == ["d2", "d1"]    # 새로 저장한 쪽이 먼저
+    finally:
+        st.close()